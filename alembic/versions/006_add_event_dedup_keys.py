@@ -0,0 +1,30 @@
+"""Add dedup keys to event tables
+
+Revision ID: 006_add_event_dedup_keys
+Revises: 005_add_google_settings
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "006_add_event_dedup_keys"
+down_revision: Union[str, None] = "005_add_google_settings"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("member_events", sa.Column("dedup_key", sa.String(255), nullable=True))
+    op.create_index("ix_member_events_dedup", "member_events", ["dedup_key"], unique=True)
+    op.add_column("message_events", sa.Column("dedup_key", sa.String(255), nullable=True))
+    op.create_index("ix_message_events_dedup", "message_events", ["dedup_key"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_message_events_dedup", table_name="message_events")
+    op.drop_column("message_events", "dedup_key")
+    op.drop_index("ix_member_events_dedup", table_name="member_events")
+    op.drop_column("member_events", "dedup_key")
@@ -0,0 +1,59 @@
+"""Add per-channel member counters
+
+Revision ID: 007_add_member_counters
+Revises: 006_add_event_dedup_keys
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "007_add_member_counters"
+down_revision: Union[str, None] = "006_add_event_dedup_keys"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "channel_member_counters",
+        sa.Column("channel_id", sa.BigInteger(), nullable=False),
+        sa.Column("member_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("left_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("kicked_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("banned_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["channel_id"], ["channels.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("channel_id"),
+    )
+    # Seed counters from existing members
+    op.execute(
+        """
+        INSERT INTO channel_member_counters
+            (channel_id, member_count, left_count, kicked_count, banned_count)
+        SELECT channel_id,
+               count(*) FILTER (WHERE status = 'member'),
+               count(*) FILTER (WHERE status = 'left'),
+               count(*) FILTER (WHERE status = 'kicked'),
+               count(*) FILTER (WHERE status = 'banned')
+        FROM members
+        GROUP BY channel_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("channel_member_counters")
@@ -0,0 +1,26 @@
+"""Add per-channel digest delivery time
+
+Revision ID: 009_add_digest_schedule
+Revises: 008_add_outbox
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "009_add_digest_schedule"
+down_revision: Union[str, None] = "008_add_outbox"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("alert_settings", sa.Column("digest_hour", sa.Integer(), server_default="9", nullable=False))
+    op.add_column("alert_settings", sa.Column("digest_timezone", sa.String(length=64), server_default="UTC", nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column("alert_settings", "digest_timezone")
+    op.drop_column("alert_settings", "digest_hour")
@@ -0,0 +1,36 @@
+"""Add last member event time to channels
+
+Revision ID: 010_add_channel_last_event
+Revises: 009_add_digest_schedule
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "010_add_channel_last_event"
+down_revision: Union[str, None] = "009_add_digest_schedule"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("channels", sa.Column("last_event_at", sa.DateTime(timezone=True), nullable=True))
+    op.execute(
+        """
+        UPDATE channels
+        SET last_event_at = latest.created_at
+        FROM (
+            SELECT channel_id, max(created_at) AS created_at
+            FROM member_events
+            GROUP BY channel_id
+        ) AS latest
+        WHERE channels.id = latest.channel_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("channels", "last_event_at")
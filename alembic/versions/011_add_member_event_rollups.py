@@ -0,0 +1,57 @@
+"""Add minute, hour and day member event rollups
+
+Revision ID: 011_add_member_event_rollups
+Revises: 010_add_channel_last_event
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "011_add_member_event_rollups"
+down_revision: Union[str, None] = "010_add_channel_last_event"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ROLLUP_TABLES = ("member_events_minute", "member_events_hour", "member_events_day")
+COUNT_COLUMNS = ("joins", "leaves", "kicks", "bans", "unbans", "others")
+TRACKED_TYPES = ("join", "leave", "kick", "ban", "unban")
+
+
+def upgrade() -> None:
+    for table in ROLLUP_TABLES:
+        op.create_table(
+            table,
+            sa.Column("channel_id", sa.BigInteger(), nullable=False),
+            sa.Column("bucket", sa.DateTime(timezone=True), nullable=False),
+            *(
+                sa.Column(column, sa.Integer(), nullable=False, server_default="0")
+                for column in COUNT_COLUMNS
+            ),
+            sa.ForeignKeyConstraint(["channel_id"], ["channels.id"], ondelete="CASCADE"),
+            sa.PrimaryKeyConstraint("channel_id", "bucket"),
+        )
+
+    # Backfill hours and days from the existing events (minutes fill up from now on)
+    counts = ", ".join(
+        f"count(*) FILTER (WHERE event_type = '{event_type}')" for event_type in TRACKED_TYPES
+    )
+    others = "count(*) FILTER (WHERE event_type NOT IN ({}))".format(
+        ", ".join(f"'{event_type}'" for event_type in TRACKED_TYPES)
+    )
+    for table, unit in (("member_events_hour", "hour"), ("member_events_day", "day")):
+        op.execute(
+            f"""
+            INSERT INTO {table} (channel_id, bucket, {", ".join(COUNT_COLUMNS)})
+            SELECT channel_id, date_trunc('{unit}', created_at, 'UTC'), {counts}, {others}
+            FROM member_events
+            GROUP BY 1, 2
+            """
+        )
+
+
+def downgrade() -> None:
+    for table in reversed(ROLLUP_TABLES):
+        op.drop_table(table)
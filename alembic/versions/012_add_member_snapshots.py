@@ -0,0 +1,34 @@
+"""Add daily channel member snapshots
+
+Revision ID: 012_add_member_snapshots
+Revises: 011_add_member_event_rollups
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "012_add_member_snapshots"
+down_revision: Union[str, None] = "011_add_member_event_rollups"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "channel_member_snapshots",
+        sa.Column("channel_id", sa.BigInteger(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("member_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("left_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("kicked_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("banned_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.ForeignKeyConstraint(["channel_id"], ["channels.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("channel_id", "day"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("channel_member_snapshots")
@@ -0,0 +1,139 @@
+"""Partition member and message events by month
+
+Revision ID: 013_partition_event_tables
+Revises: 012_add_member_snapshots
+Create Date: 2026-10-17
+"""
+
+from datetime import date, datetime, timezone
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "013_partition_event_tables"
+down_revision: Union[str, None] = "012_add_member_snapshots"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Partitions created past the current month (EVENT_PARTITIONS_AHEAD keeps them coming)
+MONTHS_AHEAD = 2
+
+
+def _member_columns() -> list[sa.Column]:
+    return [
+        sa.Column("channel_id", sa.BigInteger(), nullable=False),
+        sa.Column("user_id", sa.BigInteger(), nullable=False),
+        sa.Column("username", sa.String(255), nullable=True),
+        sa.Column("first_name", sa.String(255), nullable=True),
+        sa.Column("last_name", sa.String(255), nullable=True),
+        sa.Column("event_type", sa.String(50), nullable=False),
+        sa.Column("old_status", sa.String(50), nullable=True),
+        sa.Column("new_status", sa.String(50), nullable=False),
+        sa.Column("inviter_id", sa.BigInteger(), nullable=True),
+        sa.Column("dedup_key", sa.String(255), nullable=True),
+    ]
+
+
+def _message_columns() -> list[sa.Column]:
+    return [
+        sa.Column("channel_id", sa.BigInteger(), nullable=False),
+        sa.Column("user_id", sa.BigInteger(), nullable=False),
+        sa.Column("username", sa.String(255), nullable=True),
+        sa.Column("first_name", sa.String(255), nullable=True),
+        sa.Column("last_name", sa.String(255), nullable=True),
+        sa.Column("message_id", sa.BigInteger(), nullable=False),
+        sa.Column("event_type", sa.String(50), nullable=False),
+        sa.Column("content_preview", sa.Text(), nullable=True),
+        sa.Column("dedup_key", sa.String(255), nullable=True),
+    ]
+
+
+TABLES = {"member_events": _member_columns, "message_events": _message_columns}
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.month - 1 + months
+    return date(month.year + index // 12, index % 12 + 1, 1)
+
+
+def _bound(month: date) -> str:
+    return f"{month.isoformat()} 00:00:00+00"
+
+
+def _replace(table: str, partitioned: bool) -> None:
+    """Rebuild ``table`` (partitioned or plain), keeping rows, ids and the id sequence."""
+    old = f"{table}_old"
+    op.rename_table(table, old)
+    op.execute(f"ALTER INDEX {table}_pkey RENAME TO {old}_pkey")
+    for index in ("channel", "channel_created", "user", "type", "created", "dedup"):
+        op.execute(f"DROP INDEX IF EXISTS ix_{table}_{index}")
+
+    columns = TABLES[table]()
+    op.create_table(
+        table,
+        sa.Column(
+            "id",
+            sa.Integer(),
+            server_default=sa.text(f"nextval('{table}_id_seq'::regclass)"),
+            nullable=False,
+        ),
+        *columns,
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint(*(("id", "created_at") if partitioned else ("id",))),
+        sa.ForeignKeyConstraint(["channel_id"], ["channels.id"], ondelete="CASCADE"),
+        **({"postgresql_partition_by": "RANGE (created_at)"} if partitioned else {}),
+    )
+
+    if partitioned:
+        first = op.get_bind().execute(sa.text(f"SELECT min(created_at) FROM {old}")).scalar()
+        now = datetime.now(timezone.utc)
+        first = first.astimezone(timezone.utc) if first else now
+        month = date(first.year, first.month, 1)
+        last = _add_months(date(now.year, now.month, 1), MONTHS_AHEAD)
+        while month <= last:
+            op.execute(
+                f"CREATE TABLE {table}_p{month:%Y_%m} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{_bound(month)}') TO ('{_bound(_add_months(month, 1))}')"
+            )
+            month = _add_months(month, 1)
+        op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+
+    names = ", ".join(["id", *(column.name for column in columns), "created_at", "updated_at"])
+    op.execute(f"INSERT INTO {table} ({names}) SELECT {names} FROM {old}")
+    # The sequence would otherwise be dropped with the old table
+    op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+    op.drop_table(old)
+
+    if partitioned:
+        op.create_index(f"ix_{table}_channel_created", table, ["channel_id", "created_at"])
+        op.create_index(
+            f"ix_{table}_dedup", table, ["dedup_key", "created_at"], unique=True
+        )
+    else:
+        op.create_index(f"ix_{table}_channel", table, ["channel_id"])
+        op.create_index(f"ix_{table}_dedup", table, ["dedup_key"], unique=True)
+    op.create_index(f"ix_{table}_user", table, ["user_id"])
+    op.create_index(f"ix_{table}_type", table, ["event_type"])
+    op.create_index(f"ix_{table}_created", table, ["created_at"])
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        _replace(table, partitioned=True)
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        _replace(table, partitioned=False)
@@ -0,0 +1,24 @@
+"""Add the status a member had before its last transition
+
+Revision ID: 014_add_member_previous_status
+Revises: 013_partition_event_tables
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "014_add_member_previous_status"
+down_revision: Union[str, None] = "013_partition_event_tables"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("members", sa.Column("previous_status", sa.String(50), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("members", "previous_status")
@@ -0,0 +1,28 @@
+"""Record the stored status each member event replaced
+
+Revision ID: 015_add_event_previous_status
+Revises: 014_add_member_previous_status
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "015_add_event_previous_status"
+down_revision: Union[str, None] = "014_add_member_previous_status"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "member_events", sa.Column("previous_status", sa.String(50), nullable=True)
+    )
+    # Older events only know Telegram's old status; it is the best estimate left
+    op.execute("UPDATE member_events SET previous_status = old_status")
+
+
+def downgrade() -> None:
+    op.drop_column("member_events", "previous_status")
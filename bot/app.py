@@ -0,0 +1,202 @@
+"""Bot process lifecycle: logging, startup and shutdown."""
+
+import asyncio
+import sys
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta, timezone
+
+from loguru import logger
+
+from bot.config import settings
+from bot.handlers import setup_routers
+from bot.loader import bot, dp
+from bot.middlewares import (
+    ChannelLaneMiddleware,
+    DatabaseMiddleware,
+    HandlerContextMiddleware,
+    UpdateLanes,
+)
+from bot.partitioning import local_partition
+from bot.services.alert_engine import alert_engine
+from bot.services.digest_scheduler import digest_scheduler
+from bot.services.event_window import event_window
+from bot.services.ingest import ingest_buffer
+from bot.services.outbound import outbound
+from bot.services.outbox import outbox_worker
+from bot.services.partitions import ensure_event_partitions, run_partition_maintenance
+from bot.services.rollups import run_rollup_maintenance
+from bot.services.snapshots import run_snapshot_worker
+from database import async_session_maker, engine, init_db
+from database.cache import channel_registry, language_cache
+from database.cache_bus import cache_bus
+from database.leader import LeaderElection
+from database.repositories import ChannelRepository, EventRepository
+
+# Update types requested from Telegram in both polling and webhook mode
+ALLOWED_UPDATES = [
+    "message",
+    "callback_query",
+    "chat_member",
+    "my_chat_member",
+    "channel_post",
+]
+
+# Background tasks
+background_tasks: list[asyncio.Task] = []
+
+# Singleton jobs that run on one replica at a time
+leader_elections: list[LeaderElection] = []
+
+# Per-chat ordered update processing
+update_lanes = UpdateLanes(
+    settings.update_lanes,
+    settings.update_lanes_report_seconds,
+    settings.update_lane_queue_size,
+)
+
+
+def setup_logging(name: str = "bot") -> None:
+    """Configure loguru logging; ``name`` separates log files of worker processes."""
+    logger.remove()
+    logger.add(
+        sys.stderr,
+        format=(
+            "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | "
+            "<level>{level: <8}</level> | "
+            "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> | "
+            "<level>{message}</level>"
+        ),
+        level=settings.log_level,
+        colorize=True,
+    )
+    logger.add(
+        f"logs/{name}_{{time:YYYY-MM-DD}}.log",
+        rotation="1 day",
+        retention="30 days",
+        level="DEBUG",
+        format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} | {message}",
+    )
+
+
+async def setup_database() -> None:
+    """Create missing tables and the event partitions inserts need."""
+    await init_db()
+    # Event inserts need the current month's partition
+    await ensure_event_partitions()
+    logger.info("Database initialized")
+
+
+async def on_startup(schema_ready: bool = False) -> None:
+    """Actions on bot startup; ``schema_ready`` skips schema setup done by the supervisor."""
+    logger.info("Starting bot...")
+
+    if not schema_ready:
+        await setup_database()
+
+    # Worker processes and replicas sharing the database keep each other's caches coherent
+    if settings.workers > 1 or settings.replicas > 1:
+        dsn = engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+        await cache_bus.start(dsn, reload=load_channel_registry)
+        logger.info("Cache bus started")
+
+    # Load channel registry and rehydrate the event window
+    await load_channel_registry()
+    now = datetime.now(timezone.utc)
+    async with async_session_maker() as session:
+        event_window.load(
+            [
+                row
+                for row in await EventRepository(session).count_member_events_by_minute(
+                    now - timedelta(minutes=event_window.capacity)
+                )
+                if local_partition.owns(row[0])
+            ],
+            now,
+        )
+    logger.info(f"Event window rehydrated: {len(event_window)} channels")
+
+    # Setup routers
+    main_router = setup_routers()
+    dp.include_router(main_router)
+
+    # Setup middlewares
+    dp.update.outer_middleware(ChannelLaneMiddleware(update_lanes))
+    dp.update.middleware(DatabaseMiddleware())
+    # Handler-level, so it can see which repositories the matched handler takes
+    handler_context = HandlerContextMiddleware()
+    for name, observer in dp.observers.items():
+        if name not in ("update", "error"):
+            observer.middleware(handler_context)
+    update_lanes.start()
+
+    # Start outbound message dispatcher
+    outbound.start()
+    logger.info("Outbound dispatcher started")
+
+    # Start outbox worker
+    outbox_worker.start(bot)
+    logger.info("Outbox worker started")
+
+    # Start event ingest buffer
+    ingest_buffer.start()
+    logger.info("Event ingest buffer started")
+
+    # Start alert engine
+    alert_engine.start(bot)
+    logger.info("Alert engine started")
+
+    # Digest scheduler runs on one replica; in supervisor mode one per partition
+    digest_job = "digest-scheduler"
+    if not local_partition.is_whole:
+        digest_job += f":{local_partition.index}/{local_partition.count}"
+    start_leader_job(digest_job, dsn, lambda: digest_scheduler.run(bot))
+
+    # Jobs covering all channels run in one process
+    start_leader_job("rollup-maintenance", dsn, run_rollup_maintenance)
+    start_leader_job("member-snapshots", dsn, run_snapshot_worker)
+    start_leader_job("event-partitions", dsn, run_partition_maintenance)
+
+    logger.info("Bot started successfully!")
+
+
+async def load_channel_registry() -> None:
+    """Fill the channel registry with every registered channel."""
+    async with async_session_maker() as session:
+        channel_registry.load(await ChannelRepository(session).get_all_info())
+    logger.info(f"Channel registry loaded: {len(channel_registry)} channels")
+
+
+def start_leader_job(name: str, dsn: str, job_factory: Callable[[], Awaitable[None]]) -> None:
+    """Run a background job in whichever replica holds its leadership lock."""
+    election = LeaderElection(
+        name,
+        renew_interval=settings.leader_renew_seconds,
+        retry_interval=settings.leader_retry_seconds,
+        lease_seconds=settings.leader_lease_seconds,
+    )
+    election.start(dsn, job_factory)
+    leader_elections.append(election)
+    logger.info(f"Waiting for leadership of '{name}'")
+
+
+async def on_shutdown() -> None:
+    """Actions on bot shutdown."""
+    logger.info("Shutting down bot...")
+    for task in background_tasks:
+        task.cancel()
+    for election in leader_elections:
+        await election.stop()
+    await update_lanes.stop()
+    await ingest_buffer.stop()
+    await alert_engine.stop()
+    await outbox_worker.stop()
+    await outbound.stop()
+    await cache_bus.stop()
+    await bot.session.close()
+    logger.info(
+        f"Language cache: {language_cache.hits} hits, {language_cache.misses} misses "
+        f"({language_cache.hit_ratio:.0%} hit ratio)"
+    )
+    logger.info("Bot stopped")
+
+
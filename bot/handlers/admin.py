@@ -16,6 +16,7 @@ from bot.keyboards import (
     get_stats_period_keyboard,
 )
 from bot.services.analytics import AnalyticsService
+from bot.services.digest_scheduler import digest_scheduler
 from bot.services.reports import ReportsService
 from bot.utils.alerts import format_alerts_summary
 from database.repositories import (
@@ -382,6 +383,10 @@ async def on_alerts_update(
         await alert_repo.update(channel_id, digest_weekly=(value == "on"))
     elif action == "md":
         await alert_repo.update(channel_id, digest_monthly=(value == "on"))
+    elif action == "dh":
+        await alert_repo.update(channel_id, digest_hour=int(value) % 24)
+    elif action == "tz":
+        await alert_repo.update(channel_id, digest_timezone=value)
     elif action == "qh":
         start_str, end_str = value.split("-")
         await alert_repo.update(
@@ -392,6 +397,9 @@ async def on_alerts_update(
     elif action == "vipclear":
         await alert_repo.set_vips(channel_id, [])
 
+    if action in ("dd", "wd", "md", "dh", "tz"):
+        digest_scheduler.replan(channel_id)
+
     # Refresh summary
     settings = await alert_repo.get_or_create(channel_id)
     summary = format_alerts_summary(channel, settings, local_i18n)
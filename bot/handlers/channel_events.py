@@ -4,15 +4,21 @@ from loguru import logger
 
 from aiogram import Bot, Router
 from aiogram.types import ChatMemberUpdated
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from bot.i18n import I18n
-from bot.services.alerts import AlertService
+from bot.services.alert_engine import alert_engine
+from bot.services.alerts import MemberEventAlert
+from bot.services.event_window import event_window
+from bot.services.ingest import member_event_key
 from bot.services.notifications import NotificationService
+from bot.services.outbox import member_event_message, outbox_worker
+from database import unit_of_work
 from database.repositories import (
-    AlertSettingsRepository,
     ChannelRepository,
     EventRepository,
     MemberRepository,
+    OutboxRepository,
     UserRepository,
 )
 
@@ -45,14 +51,15 @@ def get_event_type(old_status: str, new_status: str) -> str:
 @router.chat_member()
 async def on_chat_member_update(
     event: ChatMemberUpdated,
-    bot: Bot,
-    alert_repo: AlertSettingsRepository,
+    session: AsyncSession,
     channel_repo: ChannelRepository,
     member_repo: MemberRepository,
     event_repo: EventRepository,
-    user_repo: UserRepository,
 ) -> None:
-    """Handle channel member status updates."""
+    """Handle channel member status updates.
+
+    The admin notification is delivered from the outbox once the event is stored.
+    """
     chat = event.chat
     user = event.new_chat_member.user
 
@@ -79,22 +86,12 @@ async def on_chat_member_update(
         f"({old_status} -> {new_status})"
     )
 
-    # Get or create channel
-    channel = await channel_repo.get_by_id(chat.id)
+    # Lean lookup: registration check plus notification fields
+    channel = await channel_repo.get_info(chat.id)
     if not channel:
         logger.warning(f"Channel {chat.id} not registered, skipping event")
         return
 
-    # Update member status
-    await member_repo.upsert(
-        channel_id=chat.id,
-        user_id=user.id,
-        username=user.username,
-        first_name=user.first_name,
-        last_name=user.last_name,
-        status=new_status,
-    )
-
     # Get inviter if available
     inviter_id = None
     if event.invite_link and event.invite_link.creator:
@@ -102,35 +99,49 @@ async def on_chat_member_update(
     elif event.from_user and event.from_user.id != user.id:
         inviter_id = event.from_user.id
 
-    # Create event record
-    member_event = await event_repo.create_member_event(
-        channel_id=chat.id,
-        user_id=user.id,
-        username=user.username,
-        first_name=user.first_name,
-        last_name=user.last_name,
-        event_type=event_type,
-        old_status=old_status,
-        new_status=new_status,
-        inviter_id=inviter_id,
-    )
+    # All writes below are staged and committed once at the end of the update
+    async with unit_of_work(session):
+        # Update member status
+        member, _ = await member_repo.upsert(
+            channel_id=chat.id,
+            user_id=user.id,
+            username=user.username,
+            first_name=user.first_name,
+            last_name=user.last_name,
+            status=new_status,
+        )
 
-    # Send notification with admin's language preference
-    admin_lang = await user_repo.get_language(channel.admin_user_id)
-    i18n = I18n(admin_lang)
-    notification_service = NotificationService(bot, i18n)
-    await notification_service.notify_member_event(member_event, channel)
-
-    # Alerts
-    settings = await alert_repo.get_or_create(chat.id)
-    alert_service = AlertService(bot, event_repo, member_repo, alert_repo, user_repo)
-    await alert_service.handle_member_event_alerts(
-        channel,
-        settings,
-        event_type,
-        user.id,
-        member_event.created_at,
-    )
+        # The event and its notification commit with the member change
+        member_event = await event_repo.add_member_event(
+            channel_id=chat.id,
+            user_id=user.id,
+            username=user.username,
+            first_name=user.first_name,
+            last_name=user.last_name,
+            event_type=event_type,
+            old_status=old_status,
+            new_status=new_status,
+            # The transition the member counters applied, for snapshots
+            previous_status=member.previous_status,
+            inviter_id=inviter_id,
+            created_at=event.date,
+            dedup_key=member_event_key(chat.id, user.id, event.date, new_status),
+        )
+        if member_event:
+            await OutboxRepository(session).enqueue([member_event_message(member_event)])
+
+    if not member_event:
+        # Replays must not notify, count or alert twice
+        logger.debug(f"Replayed member update for {user.id} in {chat.id} ignored")
+        return
+
+    outbox_worker.wake()
+    event_at = member_event["created_at"]
+    # Only stored events count towards alert windows
+    event_window.record(chat.id, event_type, event_at)
+
+    # Alerts are evaluated in the background once the member update is committed
+    alert_engine.submit(chat.id, MemberEventAlert(event_type, user.id, event_at))
 
 
 @router.my_chat_member()
@@ -0,0 +1,78 @@
+"""Operator-only maintenance commands."""
+
+from loguru import logger
+
+from aiogram import Router
+from aiogram.filters import Command, CommandObject
+from aiogram.types import Message
+
+from bot.filters import AdminFilter
+from bot.i18n import I18n
+from database.repositories import EventRepository, MemberRepository
+
+router = Router(name="maintenance")
+router.message.filter(AdminFilter())
+
+
+@router.message(Command("reconcile_counters"))
+async def cmd_reconcile_counters(
+    message: Message,
+    command: CommandObject,
+    member_repo: MemberRepository,
+    i18n: I18n,
+) -> None:
+    """Recompute member counters from the members table.
+
+    ``/reconcile_counters`` covers every channel, ``/reconcile_counters <id>`` one channel.
+    """
+    channel_id = None
+    if command.args and command.args.strip().lstrip("-").isdigit():
+        channel_id = int(command.args.strip())
+
+    await message.answer(i18n("maintenance.reconcile_started"))
+    count = await member_repo.reconcile_counters(channel_id)
+    logger.info(f"Member counters reconciled for {count} channel(s) (scope: {channel_id or 'all'})")
+    await message.answer(i18n("maintenance.reconcile_done", count=count))
+
+
+@router.message(Command("rebuild_rollups"))
+async def cmd_rebuild_rollups(
+    message: Message,
+    command: CommandObject,
+    event_repo: EventRepository,
+    i18n: I18n,
+) -> None:
+    """Recompute member event rollups from the raw events.
+
+    ``/rebuild_rollups`` covers every channel, ``/rebuild_rollups <id>`` one channel.
+    Runs one channel and month at a time; only that channel's event inserts wait for it.
+    """
+    channel_id = None
+    if command.args and command.args.strip().lstrip("-").isdigit():
+        channel_id = int(command.args.strip())
+
+    await message.answer(i18n("maintenance.rollups_started"))
+    rows = await event_repo.rollups.rebuild(channel_id)
+    logger.info(f"Member event rollups rebuilt: {rows} rows (scope: {channel_id or 'all'})")
+    await message.answer(i18n("maintenance.rollups_done", count=rows))
+
+
+@router.message(Command("backfill_snapshots"))
+async def cmd_backfill_snapshots(
+    message: Message,
+    command: CommandObject,
+    member_repo: MemberRepository,
+    i18n: I18n,
+) -> None:
+    """Reconstruct past daily member snapshots from the recorded events.
+
+    ``/backfill_snapshots`` covers every channel, ``/backfill_snapshots <id>`` one channel.
+    """
+    channel_id = None
+    if command.args and command.args.strip().lstrip("-").isdigit():
+        channel_id = int(command.args.strip())
+
+    await message.answer(i18n("maintenance.snapshots_started"))
+    written = await member_repo.snapshots.backfill(channel_id)
+    logger.info(f"Member snapshots backfilled: {written} rows (scope: {channel_id or 'all'})")
+    await message.answer(i18n("maintenance.snapshots_done", count=written))
@@ -5,7 +5,8 @@ from loguru import logger
 from aiogram import Router
 from aiogram.types import Message
 
-from database.repositories import ChannelRepository, EventRepository
+from bot.services.ingest import ingest_buffer, message_event_key
+from database.repositories import ChannelRepository
 
 router = Router(name="messages")
 
@@ -18,7 +19,7 @@ async def on_channel_post(
     """Track channel posts (optional logging)."""
     chat = message.chat
 
-    channel = await channel_repo.get_by_id(chat.id)
+    channel = await channel_repo.get_info(chat.id)
     if not channel:
         return
 
@@ -31,7 +32,6 @@ async def on_channel_post(
 async def on_group_message(
     message: Message,
     channel_repo: ChannelRepository,
-    event_repo: EventRepository,
 ) -> None:
     """Track comments in linked discussion groups."""
     chat = message.chat
@@ -57,14 +57,14 @@ async def on_group_message(
     if not channel_id:
         return
 
-    channel = await channel_repo.get_by_id(channel_id)
+    channel = await channel_repo.get_info(channel_id)
     if not channel:
         return
 
     # Log the comment
     content_preview = message.text[:100] if message.text else None
 
-    await event_repo.create_message_event(
+    await ingest_buffer.add_message_event(
         channel_id=channel_id,
         user_id=user.id,
         username=user.username,
@@ -73,6 +73,8 @@ async def on_group_message(
         message_id=message.message_id,
         event_type="comment",
         content_preview=content_preview,
+        created_at=message.date,
+        dedup_key=message_event_key(chat.id, message.message_id),
     )
 
     logger.debug(
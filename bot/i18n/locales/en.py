@@ -140,6 +140,13 @@ LOCALE = {
         "unban": "was unbanned in",
         "status_change": "status changed in",
         "user_id": "User ID:",
+        "burst_title": "\U0001F4E3 <b>{title}</b>: {summary}",
+        "burst_join": "+{count} joined",
+        "burst_leave": "-{count} left",
+        "burst_kick": "{count} removed",
+        "burst_ban": "{count} banned",
+        "burst_other": "{count} other changes",
+        "burst_more": "...and {count} more",
     },
     "buttons": {
         "24_hours": "24 hours",
@@ -164,6 +171,7 @@ LOCALE = {
             "churn_retention": "Churn: {churn}, Retention: {retention}",
             "forecast": "Forecast 7d net: {forecast} (avg/day {avg})",
             "trend_header": "Trend by day (last 10):",
+            "subscribers": "Subscribers: {start} → {end} ({change}) {curve}",
         },
         "activity": {
             "title": "<b>Activity for {title}</b>",
@@ -204,6 +212,7 @@ LOCALE = {
             "daily": "Daily digest: {state}",
             "weekly": "Weekly digest: {state}",
             "monthly": "Monthly digest: {state}",
+            "digest_time": "Digest time: {time} ({timezone})",
             "quiet": "Quiet hours: {quiet}",
             "quiet_off": "off",
             "vips": "VIP IDs: {vips}",
@@ -220,4 +229,12 @@ LOCALE = {
             "off": "OFF",
         },
     },
+    "maintenance": {
+        "reconcile_started": "Reconciling member counters...",
+        "reconcile_done": "Member counters reconciled for {count} channel(s).",
+        "rollups_started": "Rebuilding member event rollups...",
+        "rollups_done": "Member event rollups rebuilt ({count} row(s)).",
+        "snapshots_started": "Reconstructing member snapshots...",
+        "snapshots_done": "Member snapshots written: {count} day(s).",
+    },
 }
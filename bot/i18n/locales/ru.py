@@ -140,6 +140,13 @@ LOCALE = {
         "unban": "был разбанен в",
         "status_change": "статус изменился в",
         "user_id": "ID пользователя:",
+        "burst_title": "\U0001F4E3 <b>{title}</b>: {summary}",
+        "burst_join": "+{count} подписались",
+        "burst_leave": "-{count} отписались",
+        "burst_kick": "{count} удалено",
+        "burst_ban": "{count} забанено",
+        "burst_other": "{count} других изменений",
+        "burst_more": "...и ещё {count}",
     },
     "buttons": {
         "24_hours": "24 часа",
@@ -164,6 +171,7 @@ LOCALE = {
             "churn_retention": "Отток: {churn}, Удержание: {retention}",
             "forecast": "Прогноз на 7 дн.: {forecast} (среднее/день {avg})",
             "trend_header": "Динамика по дням (последние 10):",
+            "subscribers": "Подписчики: {start} → {end} ({change}) {curve}",
         },
         "activity": {
             "title": "<b>Активность для {title}</b>",
@@ -204,6 +212,7 @@ LOCALE = {
             "daily": "Дневной дайджест: {state}",
             "weekly": "Недельный дайджест: {state}",
             "monthly": "Месячный дайджест: {state}",
+            "digest_time": "Время дайджеста: {time} ({timezone})",
             "quiet": "Тихий режим: {quiet}",
             "quiet_off": "выключен",
             "vips": "VIP ID: {vips}",
@@ -220,4 +229,12 @@ LOCALE = {
             "off": "ВЫКЛ",
         },
     },
+    "maintenance": {
+        "reconcile_started": "Пересчёт счётчиков подписчиков...",
+        "reconcile_done": "Счётчики подписчиков пересчитаны для {count} канал(ов).",
+        "rollups_started": "Пересборка агрегатов событий...",
+        "rollups_done": "Агрегаты событий пересобраны ({count} записей).",
+        "snapshots_started": "Восстановление истории подписчиков...",
+        "snapshots_done": "Записано дневных снимков: {count}.",
+    },
 }
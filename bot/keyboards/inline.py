@@ -1,7 +1,10 @@
 """Inline keyboards for the bot."""
 
+from collections.abc import Iterable
+
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 
+from bot.config import settings as app_settings
 from bot.i18n import I18n
 from database.models import AlertSettings, Channel
 
@@ -100,6 +103,12 @@ def get_language_keyboard() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+def _rows(buttons: Iterable[InlineKeyboardButton], width: int = 3) -> list[list[InlineKeyboardButton]]:
+    """Split buttons into rows of ``width``."""
+    buttons = list(buttons)
+    return [buttons[i : i + width] for i in range(0, len(buttons), width)]
+
+
 def get_alerts_keyboard(
     channel_id: int,
     settings: AlertSettings,
@@ -146,6 +155,14 @@ def get_alerts_keyboard(
                 callback_data=f"alert:md:{channel_id}:{'off' if settings.digest_monthly else 'on'}",
             ),
         ],
+        *_rows(
+            InlineKeyboardButton(text=f"Digest {hour:02d}:00", callback_data=f"alert:dh:{channel_id}:{hour}")
+            for hour in app_settings.digest_hour_list
+        ),
+        *_rows(
+            InlineKeyboardButton(text=zone, callback_data=f"alert:tz:{channel_id}:{zone}")
+            for zone in app_settings.digest_timezone_list
+        ),
         [
             InlineKeyboardButton(text="Quiet off", callback_data=f"alert:qh:{channel_id}:0-0"),
             InlineKeyboardButton(text="Quiet 22-7", callback_data=f"alert:qh:{channel_id}:22-7"),
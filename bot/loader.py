@@ -3,13 +3,21 @@
 from aiogram import Bot, Dispatcher
 from aiogram.client.default import DefaultBotProperties
 from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import PRODUCTION, TelegramAPIServer
 from aiogram.enums import ParseMode
 
 from bot.config import settings
 
 # aiogram expects session.timeout to be numeric (seconds) for polling math.
 # Use float timeout to avoid TypeError when adding polling_timeout.
-session = AiohttpSession(timeout=60)
+session = AiohttpSession(
+    timeout=60,
+    api=(
+        TelegramAPIServer.from_base(settings.telegram_api_url)
+        if settings.telegram_api_url
+        else PRODUCTION
+    ),
+)
 
 bot = Bot(
     token=settings.bot_token.get_secret_value(),
@@ -1,5 +1,6 @@
 """Bot middlewares."""
 
-from bot.middlewares.database import DatabaseMiddleware
+from bot.middlewares.database import DatabaseMiddleware, HandlerContextMiddleware
+from bot.middlewares.lanes import ChannelLaneMiddleware, UpdateLanes
 
-__all__ = ["DatabaseMiddleware"]
+__all__ = ["DatabaseMiddleware", "HandlerContextMiddleware", "ChannelLaneMiddleware", "UpdateLanes"]
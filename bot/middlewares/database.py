@@ -4,10 +4,12 @@ from collections.abc import Awaitable, Callable
 from typing import Any
 
 from aiogram import BaseMiddleware
-from aiogram.types import TelegramObject
+from aiogram.dispatcher.event.bases import UNHANDLED
+from aiogram.types import TelegramObject, Update
 
 from bot.i18n import I18n
-from database import async_session_maker
+from database.cache import channel_registry
+from database.engine import LazySession
 from database.repositories import (
     AlertSettingsRepository,
     ChannelRepository,
@@ -18,8 +20,38 @@ from database.repositories import (
 )
 
 
+_REPOSITORIES = {
+    "channel_repo": ChannelRepository,
+    "member_repo": MemberRepository,
+    "event_repo": EventRepository,
+    "user_repo": UserRepository,
+    "alert_repo": AlertSettingsRepository,
+    "google_repo": GoogleSettingsRepository,
+}
+
+
+def should_skip(event: TelegramObject) -> bool:
+    """Cheap pre-filter for updates no handler would act on."""
+    if not isinstance(event, Update):
+        return False
+    if event.chat_member:
+        member_update = event.chat_member
+        return (
+            member_update.chat.type != "channel"
+            or member_update.new_chat_member.user.is_bot
+            or channel_registry.is_known_absent(member_update.chat.id)
+        )
+    if event.channel_post:
+        return channel_registry.is_known_absent(event.channel_post.chat.id)
+    return False
+
+
 class DatabaseMiddleware(BaseMiddleware):
-    """Middleware that provides database session, repositories, and i18n to handlers."""
+    """Update middleware that opens a database session for the handlers.
+
+    The session is lazy: it is only created when a handler or repository first
+    uses it, and updates rejected by ``should_skip`` never reach a handler.
+    """
 
     async def __call__(
         self,
@@ -27,27 +59,41 @@ class DatabaseMiddleware(BaseMiddleware):
         event: TelegramObject,
         data: dict[str, Any],
     ) -> Any:
-        async with async_session_maker() as session:
+        if should_skip(event):
+            return UNHANDLED
+
+        async with LazySession() as session:
             data["session"] = session
-            data["channel_repo"] = ChannelRepository(session)
-            data["member_repo"] = MemberRepository(session)
-            data["event_repo"] = EventRepository(session)
-            data["user_repo"] = UserRepository(session)
-            data["alert_repo"] = AlertSettingsRepository(session)
-            data["google_repo"] = GoogleSettingsRepository(session)
-
-            # Get user language for i18n
-            user_id = None
-            if hasattr(event, "from_user") and event.from_user:
-                user_id = event.from_user.id
-            elif hasattr(event, "message") and event.message and event.message.from_user:
-                user_id = event.message.from_user.id
+            return await handler(event, data)
 
-            language = "en"
-            if user_id:
-                language = await data["user_repo"].get_language(user_id)
 
+class HandlerContextMiddleware(BaseMiddleware):
+    """Handler middleware that provides repositories and i18n.
+
+    Only what the matched handler declares is built, so a handler that
+    renders no text never looks up the user's language.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        target = data["handler"]
+        params = None if target.varkw else target.params
+        session = data["session"]
+        for name, repository in _REPOSITORIES.items():
+            if params is None or name in params:
+                data[name] = repository(session)
+
+        if params is None or "i18n" in params or "_" in params:
+            # Served from the shared language cache on repeat lookups
+            language = "en"
+            user = data.get("event_from_user")
+            if user:
+                language = await UserRepository(session).get_language(user.id)
             data["i18n"] = I18n(language)
             data["_"] = data["i18n"]  # Shortcut
 
-            return await handler(event, data)
+        return await handler(event, data)
@@ -0,0 +1,155 @@
+"""Per-chat ordered update lanes."""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from contextlib import suppress
+from typing import Any
+
+from loguru import logger
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject, Update
+
+from bot.partitioning import partition_for
+
+Handler = Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]]
+
+
+def get_update_chat_id(update: Update) -> int | None:
+    """Chat an update belongs to, if any."""
+    event = update.event
+    chat = getattr(event, "chat", None)
+    if chat is None and update.callback_query and update.callback_query.message:
+        chat = update.callback_query.message.chat
+    return chat.id if chat else None
+
+
+def get_lane_chat_id(update: Update) -> int | None:
+    """Chat whose ordering an update depends on, if it needs a lane.
+
+    Only membership changes, channel posts and discussion-group messages are
+    laned; commands, callbacks and other updates run directly so that slow
+    maintenance work never queues behind (or blocks) channel traffic.
+    """
+    if update.chat_member:
+        return update.chat_member.chat.id
+    if update.channel_post:
+        return update.channel_post.chat.id
+    if update.message and update.message.chat.type in ("group", "supergroup"):
+        return update.message.chat.id
+    return None
+
+
+class UpdateLanes:
+    """N asyncio worker lanes; each lane processes its updates strictly in order.
+
+    Updates of one chat always hash to the same lane, so member status
+    transitions of a channel are applied in arrival order while different
+    channels are handled in parallel. Lane depths are logged every
+    ``report_interval`` seconds (at INFO while any lane has a backlog).
+    Each lane holds at most ``queue_size`` updates; submitting to a full
+    lane waits for room.
+    """
+
+    def __init__(
+        self,
+        lanes: int = 8,
+        report_interval: float = 60.0,
+        queue_size: int = 1000,
+    ) -> None:
+        self.size = max(1, lanes)
+        self.report_interval = report_interval
+        self._queues: list[asyncio.Queue] = [
+            asyncio.Queue(maxsize=max(1, queue_size)) for _ in range(self.size)
+        ]
+        self._workers: list[asyncio.Task] = []
+        self._reporter: asyncio.Task | None = None
+
+    def depths(self) -> list[int]:
+        """Number of updates waiting in each lane."""
+        return [queue.qsize() for queue in self._queues]
+
+    def start(self) -> None:
+        if not self._workers:
+            self._workers = [
+                asyncio.create_task(self._work(queue)) for queue in self._queues
+            ]
+        if self._reporter is None and self.report_interval > 0:
+            self._reporter = asyncio.create_task(self._report())
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Let queued updates finish (up to ``timeout``), then stop workers."""
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(queue.join() for queue in self._queues)),
+                timeout,
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"Update lanes stopped with pending updates: {self.depths()}")
+        if self._reporter:
+            self._reporter.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._reporter
+            self._reporter = None
+        for worker in self._workers:
+            worker.cancel()
+        for worker in self._workers:
+            with suppress(asyncio.CancelledError):
+                await worker
+        self._workers = []
+
+    async def submit(
+        self,
+        chat_id: int,
+        handler: Handler,
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> asyncio.Future:
+        """Queue an update on its chat's lane, waiting while the lane is full.
+
+        The returned future resolves with the handler result.
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._queues[partition_for(chat_id, self.size)].put(
+            (handler, event, data, future)
+        )
+        return future
+
+    async def _report(self) -> None:
+        while True:
+            await asyncio.sleep(self.report_interval)
+            depths = self.depths()
+            logger.log(
+                "INFO" if any(depths) else "DEBUG",
+                f"Update lanes: {sum(depths)} queued, deepest {max(depths)} ({depths})",
+            )
+
+    async def _work(self, queue: asyncio.Queue) -> None:
+        while True:
+            handler, event, data, future = await queue.get()
+            try:
+                if not future.cancelled():
+                    future.set_result(await handler(event, data))
+            except Exception as e:
+                if not future.cancelled():
+                    future.set_exception(e)
+            finally:
+                queue.task_done()
+
+
+class ChannelLaneMiddleware(BaseMiddleware):
+    """Outer update middleware that routes channel traffic through its chat's lane."""
+
+    def __init__(self, lanes: UpdateLanes) -> None:
+        self.lanes = lanes
+
+    async def __call__(
+        self,
+        handler: Handler,
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        chat_id = get_lane_chat_id(event) if isinstance(event, Update) else None
+        if chat_id is None:
+            return await handler(event, data)
+        return await (await self.lanes.submit(chat_id, handler, event, data))
@@ -0,0 +1,29 @@
+"""Channel partitioning across worker processes."""
+
+
+def partition_for(chat_id: int, partitions: int) -> int:
+    """Stable partition index of a chat (same result in every process)."""
+    return abs(chat_id) % partitions
+
+
+class Partition:
+    """The share of chat ids this process is responsible for."""
+
+    def __init__(self, index: int = 0, count: int = 1) -> None:
+        self.index = index
+        self.count = count
+
+    @property
+    def is_whole(self) -> bool:
+        return self.count == 1
+
+    def assign(self, index: int, count: int) -> None:
+        self.index = index
+        self.count = count
+
+    def owns(self, chat_id: int) -> bool:
+        return self.count == 1 or partition_for(chat_id, self.count) == self.index
+
+
+# Single-process mode owns every chat; worker processes narrow it at startup
+local_partition = Partition()
@@ -4,5 +4,11 @@ from bot.services.analytics import AnalyticsService
 from bot.services.notifications import NotificationService
 from bot.services.alerts import AlertService
 from bot.services.reports import ReportsService
+from bot.services.ingest import EventIngestBuffer
+from bot.services.event_window import EventWindow
+from bot.services.alert_engine import AlertEngine
+from bot.services.outbound import OutboundDispatcher, Priority
+from bot.services.outbox import OutboxWorker
+from bot.services.digest_scheduler import DigestScheduler
 
-__all__ = ["AnalyticsService", "NotificationService", "AlertService", "ReportsService"]
+__all__ = ["AnalyticsService", "NotificationService", "AlertService", "ReportsService", "EventIngestBuffer", "EventWindow", "AlertEngine", "OutboundDispatcher", "Priority", "OutboxWorker", "DigestScheduler"]
@@ -0,0 +1,136 @@
+"""Background alert evaluation, decoupled from update handling."""
+
+import asyncio
+from contextlib import suppress
+from dataclasses import dataclass
+
+from loguru import logger
+
+from aiogram import Bot
+
+from bot.config import settings
+from bot.services.alerts import AlertService, MemberEventAlert
+from database import async_session_maker
+from database.repositories import (
+    AlertSettingsRepository,
+    ChannelRepository,
+    EventRepository,
+    MemberRepository,
+    UserRepository,
+)
+
+
+@dataclass
+class AlertEngineStats:
+    """Counters describing alert evaluation."""
+
+    events: int = 0
+    evaluations: int = 0
+    failed_evaluations: int = 0
+
+    @property
+    def coalesced(self) -> int:
+        return self.events - self.evaluations
+
+
+class AlertEngine:
+    """Evaluates member event alerts off the update path.
+
+    Events are collected per channel. A channel is queued for evaluation when
+    its first event arrives; everything that piled up by the time a worker
+    picks it up is evaluated in one pass. A channel is never evaluated by two
+    workers at once, so its events are handled in order.
+    """
+
+    def __init__(self, workers: int = 4) -> None:
+        self.workers = max(1, workers)
+        self.stats = AlertEngineStats()
+        self._bot: Bot | None = None
+        self._pending: dict[int, list[MemberEventAlert]] = {}
+        self._ready: asyncio.Queue[int] = asyncio.Queue()
+        self._tasks: list[asyncio.Task] = []
+
+    @property
+    def backlog(self) -> int:
+        return sum(len(events) for events in self._pending.values())
+
+    def start(self, bot: Bot) -> None:
+        """Start the evaluation workers."""
+        self._bot = bot
+        if not self._tasks:
+            self._tasks = [
+                asyncio.create_task(self._work()) for _ in range(self.workers)
+            ]
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Let queued evaluations finish (up to ``timeout``), then stop workers."""
+        try:
+            await asyncio.wait_for(self._ready.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Alert engine stopped with {self.backlog} pending events")
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            with suppress(asyncio.CancelledError):
+                await task
+        self._tasks = []
+        logger.info(
+            f"Alert engine stopped: {self.stats.events} events, "
+            f"{self.stats.evaluations} evaluations"
+        )
+
+    def submit(self, channel_id: int, alert: MemberEventAlert) -> None:
+        """Queue an ingested event for alert evaluation."""
+        self.stats.events += 1
+        events = self._pending.get(channel_id)
+        if events is not None:
+            # Already queued or being evaluated; it will be picked up
+            events.append(alert)
+            return
+        self._pending[channel_id] = [alert]
+        self._ready.put_nowait(channel_id)
+
+    async def _work(self) -> None:
+        while True:
+            channel_id = await self._ready.get()
+            try:
+                await self._drain(channel_id)
+            finally:
+                self._ready.task_done()
+
+    async def _drain(self, channel_id: int) -> None:
+        # The channel keeps its _pending entry while evaluated, so new events
+        # are appended instead of queueing a second, concurrent evaluation.
+        while True:
+            events = self._pending[channel_id]
+            if not events:
+                del self._pending[channel_id]
+                return
+            self._pending[channel_id] = []
+            await self._evaluate(channel_id, events)
+
+    async def _evaluate(self, channel_id: int, events: list[MemberEventAlert]) -> None:
+        self.stats.evaluations += 1
+        try:
+            async with async_session_maker() as session:
+                channel = await ChannelRepository(session).get_info(channel_id)
+                if not channel or not channel.notify_chat_id:
+                    return
+                alert_repo = AlertSettingsRepository(session)
+                alert_settings = await alert_repo.get_or_create(channel_id)
+                alert_service = AlertService(
+                    self._bot,
+                    EventRepository(session),
+                    MemberRepository(session),
+                    alert_repo,
+                    UserRepository(session),
+                )
+                await alert_service.handle_member_events_alerts(
+                    channel, alert_settings, events
+                )
+        except Exception as e:
+            self.stats.failed_evaluations += 1
+            logger.error(f"Alert evaluation failed for channel {channel_id}: {e}")
+
+
+alert_engine = AlertEngine(workers=settings.alert_workers)
@@ -1,6 +1,6 @@
 """Alert and digest service."""
 
-import asyncio
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 
 from loguru import logger
@@ -8,18 +8,26 @@ from loguru import logger
 from aiogram import Bot
 
 from bot.i18n import I18n
-from bot.services.analytics import AnalyticsService
+from bot.services.event_window import event_window
 from bot.services.notifications import NotificationService
-from database.models import AlertSettings, Channel
+from database.models import AlertSettings, Channel, ChannelInfo
 from database.repositories import (
     AlertSettingsRepository,
-    ChannelRepository,
     EventRepository,
     MemberRepository,
     UserRepository,
 )
 
 
+@dataclass(frozen=True, slots=True)
+class MemberEventAlert:
+    """A member event awaiting alert evaluation."""
+
+    event_type: str
+    user_id: int
+    event_time: datetime
+
+
 class AlertService:
     """Encapsulates alert logic for events and scheduled digests."""
 
@@ -37,19 +45,21 @@ class AlertService:
         self.alert_repo = alert_repo
         self.user_repo = user_repo
 
-    async def handle_member_event_alerts(
+    async def handle_member_events_alerts(
         self,
-        channel: Channel,
+        channel: Channel | ChannelInfo,
         settings: AlertSettings,
-        event_type: str,
-        user_id: int,
-        event_time: datetime,
+        events: list[MemberEventAlert],
     ) -> None:
-        """Run alert checks after a member event."""
-        if not channel.notify_chat_id:
+        """Run one pass of alert checks for events of a channel, oldest first.
+
+        Window checks run once against the latest event; VIP checks run per event.
+        """
+        if not channel.notify_chat_id or not events:
             return
 
-        if self._is_quiet(settings, event_time):
+        loud = [event for event in events if not self._is_quiet(settings, event.event_time)]
+        if not loud:
             logger.debug("Quiet hours active; skipping alerts")
             return
 
@@ -60,23 +70,22 @@ class AlertService:
         await self._check_mass_leaves(channel, settings, notifier)
         await self._check_anomaly(channel, settings, notifier)
         await self._check_milestone(channel, settings, notifier)
-        await self._check_churn_threshold(channel, settings, notifier, event_time)
-        await self._check_vip_leave(channel, settings, notifier, event_type, user_id)
+        await self._check_churn_threshold(channel, settings, notifier, loud[-1].event_time)
+        for event in loud:
+            await self._check_vip_leave(
+                channel, settings, notifier, event.event_type, event.user_id
+            )
 
     async def _check_mass_leaves(
         self,
-        channel: Channel,
+        channel: Channel | ChannelInfo,
         settings: AlertSettings,
         notifier: NotificationService,
     ) -> None:
         window_start = datetime.now(timezone.utc) - timedelta(
             minutes=settings.mass_leave_window_minutes
         )
-        recent_leaves = await self.event_repo.count_member_events(
-            channel.id,
-            event_type="leave",
-            since=window_start,
-        )
+        recent_leaves = await self._count_events(channel.id, window_start, "leave")
         if recent_leaves >= settings.mass_leave_threshold:
             msg = notifier.i18n(
                 "alerts.mass_leave",
@@ -88,19 +97,13 @@ class AlertService:
 
     async def _check_anomaly(
         self,
-        channel: Channel,
+        channel: Channel | ChannelInfo,
         settings: AlertSettings,
         notifier: NotificationService,
     ) -> None:
         now = datetime.now(timezone.utc)
-        last_hour = await self.event_repo.count_member_events(
-            channel.id,
-            since=now - timedelta(hours=1),
-        )
-        last_day = await self.event_repo.count_member_events(
-            channel.id,
-            since=now - timedelta(hours=24),
-        )
+        last_hour = await self._count_events(channel.id, now - timedelta(hours=1))
+        last_day = await self._count_events(channel.id, now - timedelta(hours=24))
         baseline_hours = max(1, 23)
         baseline = max(1, (last_day - last_hour) / baseline_hours)
         if last_hour >= settings.anomaly_factor * baseline and last_hour >= 5:
@@ -119,7 +122,7 @@ class AlertService:
 
     async def _check_milestone(
         self,
-        channel: Channel,
+        channel: Channel | ChannelInfo,
         settings: AlertSettings,
         notifier: NotificationService,
     ) -> None:
@@ -138,7 +141,7 @@ class AlertService:
 
     async def _check_churn_threshold(
         self,
-        channel: Channel,
+        channel: Channel | ChannelInfo,
         settings: AlertSettings,
         notifier: NotificationService,
         event_time: datetime,
@@ -150,11 +153,7 @@ class AlertService:
             if (event_time - settings.last_churn_alert_at) < timedelta(hours=6):
                 return
         window_start = event_time - timedelta(days=1)
-        leaves = await self.event_repo.count_member_events(
-            channel.id,
-            event_type="leave",
-            since=window_start,
-        )
+        leaves = await self._count_events(channel.id, window_start, "leave")
         member_counts = await self.member_repo.count_by_status(channel.id)
         active = member_counts.get("member", 0)
         total = active + member_counts.get("left", 0)
@@ -173,7 +172,7 @@ class AlertService:
 
     async def _check_vip_leave(
         self,
-        channel: Channel,
+        channel: Channel | ChannelInfo,
         settings: AlertSettings,
         notifier: NotificationService,
         event_type: str,
@@ -190,6 +189,24 @@ class AlertService:
             )
             await notifier.send_text(channel.notify_chat_id, msg)
 
+    async def _count_events(
+        self,
+        channel_id: int,
+        since: datetime,
+        event_type: str | None = None,
+    ) -> int:
+        """Count member events from the in-memory window, or the DB if it is too short."""
+        count = event_window.count(
+            channel_id, since, datetime.now(timezone.utc), event_type
+        )
+        if count is None:
+            count = await self.event_repo.count_member_events(
+                channel_id,
+                event_type=event_type,
+                since=since,
+            )
+        return count
+
     def _is_quiet(self, settings: AlertSettings, event_time: datetime) -> bool:
         """Check quiet hours window."""
         start = settings.quiet_hours_start
@@ -201,64 +218,3 @@ class AlertService:
             return start <= hour < end
         return hour >= start or hour < end
 
-
-async def run_digest_worker(
-    bot: Bot,
-    interval_seconds: int = 900,
-) -> None:
-    """Periodic task to send daily/weekly digests."""
-    from database import async_session_maker
-
-    while True:
-        try:
-            async with async_session_maker() as session:
-                channel_repo = ChannelRepository(session)
-                event_repo = EventRepository(session)
-                member_repo = MemberRepository(session)
-                alert_repo = AlertSettingsRepository(session)
-                user_repo = UserRepository(session)
-
-                channels = await channel_repo.get_all_active()
-                now = datetime.now(timezone.utc)
-
-                for channel in channels:
-                    if not channel.notify_chat_id:
-                        continue
-
-                    settings = await alert_repo.get_or_create(channel.id)
-                    alert_service = AlertService(
-                        bot, event_repo, member_repo, alert_repo, user_repo
-                    )
-                    if alert_service._is_quiet(settings, now):
-                        continue
-
-                    admin_lang = await user_repo.get_language(channel.admin_user_id)
-                    i18n = I18n(admin_lang)
-                    notifier = NotificationService(bot, i18n)
-                    analytics = AnalyticsService(member_repo, event_repo)
-
-                    # Daily digest at 09:00 UTC
-                    if settings.digest_daily and now.hour == 9:
-                        if not settings.last_daily_digest or settings.last_daily_digest.date() < now.date():
-                            digest = await analytics.get_growth_dynamics_message(channel, days=1, i18n=i18n)
-                            digest += "\n\n" + await analytics.get_activity_insights_message(channel, days=7, i18n=i18n)
-                            await notifier.send_text(channel.notify_chat_id, i18n("alerts.digest_daily_prefix") + "\n\n" + digest)
-                            await alert_repo.set_last_daily_digest(channel.id, now)
-
-                    # Weekly digest Monday 09:05 UTC
-                    if settings.digest_weekly and now.weekday() == 0 and now.hour == 9 and now.minute >= 5:
-                        if not settings.last_weekly_digest or settings.last_weekly_digest.date() < now.date():
-                            digest = await analytics.get_growth_dynamics_message(channel, days=7, i18n=i18n)
-                            await notifier.send_text(channel.notify_chat_id, i18n("alerts.digest_weekly_prefix") + "\n\n" + digest)
-                            await alert_repo.set_last_weekly_digest(channel.id, now)
-
-                    # Monthly digest on 1st day 09:10 UTC
-                    if settings.digest_monthly and now.day == 1 and now.hour == 9 and now.minute >= 10:
-                        if not settings.last_monthly_digest or settings.last_monthly_digest.date() < now.date():
-                            digest = await analytics.get_growth_dynamics_message(channel, days=30, i18n=i18n)
-                            await notifier.send_text(channel.notify_chat_id, i18n("alerts.digest_monthly_prefix") + "\n\n" + digest)
-                            await alert_repo.set_last_monthly_digest(channel.id, now)
-        except Exception as e:
-            logger.error(f"Digest worker error: {e}")
-
-        await asyncio.sleep(interval_seconds)
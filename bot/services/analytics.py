@@ -8,7 +8,12 @@ from statistics import mean
 from aiogram.types import BufferedInputFile
 
 from bot.i18n import I18n
-from bot.utils.formatting import format_stats_message, format_user_link, get_event_emoji
+from bot.utils.formatting import (
+    format_sparkline,
+    format_stats_message,
+    format_user_link,
+    get_event_emoji,
+)
 from database.models import Channel
 from database.repositories import EventRepository, MemberRepository
 
@@ -23,6 +28,21 @@ class AnalyticsService:
     ) -> None:
         self.member_repo = member_repo
         self.event_repo = event_repo
+        self._last_event_at: dict[int, datetime | None] = {}
+
+    async def _is_dormant(self, channel_id: int, days: int) -> bool:
+        """True when the channel had no member events in the last ``days`` (ever if <= 0).
+
+        Lets reports skip their aggregate queries for quiet channels.
+        """
+        if channel_id not in self._last_event_at:
+            self._last_event_at[channel_id] = await self.event_repo.get_last_member_event_at(
+                channel_id
+            )
+        last_event_at = self._last_event_at[channel_id]
+        if last_event_at is None:
+            return True
+        return days > 0 and last_event_at < datetime.now(timezone.utc) - timedelta(days=days)
 
     async def get_stats_message(
         self,
@@ -31,7 +51,11 @@ class AnalyticsService:
         i18n: I18n | None = None,
     ) -> str:
         """Get formatted statistics message."""
-        stats = await self.event_repo.get_member_events_stats(channel.id, days)
+        stats = (
+            {}
+            if await self._is_dormant(channel.id, days)
+            else await self.event_repo.get_member_events_stats(channel.id, days)
+        )
         member_counts = await self.member_repo.count_by_status(channel.id)
 
         return format_stats_message(
@@ -167,10 +191,15 @@ class AnalyticsService:
         days: int = 30,
         i18n: I18n | None = None,
     ) -> str:
-        """Build growth dynamics message: daily flow, churn/net/forecast."""
-        stats = await self.event_repo.get_member_events_stats(channel.id, days)
-        flow = await self.event_repo.get_daily_member_flow(channel.id, days)
+        """Build growth dynamics message: subscriber curve, daily flow, churn/net/forecast."""
+        if await self._is_dormant(channel.id, days):
+            stats, flow = {}, []
+        else:
+            stats = await self.event_repo.get_member_events_stats(channel.id, days)
+            flow = await self.event_repo.get_daily_member_flow(channel.id, days)
         member_counts = await self.member_repo.count_by_status(channel.id)
+        since = (datetime.now(timezone.utc) - timedelta(days=days)).date() if days > 0 else None
+        history = await self.member_repo.snapshots.get_history(channel.id, since)
 
         joins = stats.get("join", 0)
         leaves = stats.get("leave", 0) + stats.get("kick", 0)
@@ -216,6 +245,28 @@ class AnalyticsService:
             lines.append(f"Churn: {churn_rate:.1f}%, Retention: {retention_rate:.1f}%")
             lines.append(f"Forecast 7d net: {forecast_7d:+d} (avg/day {avg_net:.1f})")
 
+        if history:
+            # Snapshots end yesterday; today's point is the live count
+            curve = [snapshot.member_count for snapshot in history] + [active_members]
+            start, end = curve[0], curve[-1]
+            # Keep the sparkline short for long windows
+            step = -(-len(curve) // 30)
+            curve = curve[::-1][::step][::-1]
+            if i18n:
+                lines.append(
+                    i18n(
+                        "analytics.growth.subscribers",
+                        start=start,
+                        end=end,
+                        change=f"{end - start:+d}",
+                        curve=format_sparkline(curve),
+                    )
+                )
+            else:
+                lines.append(
+                    f"Subscribers: {start} → {end} ({end - start:+d}) {format_sparkline(curve)}"
+                )
+
         if flow:
             lines.append("")
             if i18n:
@@ -238,7 +289,11 @@ class AnalyticsService:
         i18n: I18n | None = None,
     ) -> str:
         """Build time-of-day/day-of-week insights."""
-        activity = await self.event_repo.get_hourly_activity(channel.id, days)
+        activity = (
+            []
+            if await self._is_dormant(channel.id, days)
+            else await self.event_repo.get_hourly_activity(channel.id, days)
+        )
 
         if not activity:
             return i18n("analytics.activity.no_data") if i18n else "No activity data."
@@ -295,9 +350,12 @@ class AnalyticsService:
         i18n: I18n | None = None,
     ) -> str:
         """Audience-focused analytics: sources, churners, returnees, ghosts."""
-        top_sources = await self.event_repo.get_top_inviter_sources(channel.id, days)
-        top_leavers = await self.event_repo.get_top_leavers(channel.id, days)
-        returnees = await self.event_repo.get_returnees(channel.id, days)
+        if await self._is_dormant(channel.id, days):
+            top_sources, top_leavers, returnees = [], [], []
+        else:
+            top_sources = await self.event_repo.get_top_inviter_sources(channel.id, days)
+            top_leavers = await self.event_repo.get_top_leavers(channel.id, days)
+            returnees = await self.event_repo.get_returnees(channel.id, days)
         ghosts = await self.event_repo.get_inactive_members(channel.id, inactive_days=30)
 
         lines = []
@@ -0,0 +1,338 @@
+"""Due-time scheduler for daily, weekly and monthly digests."""
+
+import asyncio
+import heapq
+import time
+from contextlib import suppress
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone, tzinfo
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from loguru import logger
+
+from aiogram import Bot
+
+from bot.config import settings as app_settings
+from bot.i18n import I18n
+from bot.partitioning import local_partition
+from bot.services.alerts import AlertService
+from bot.services.analytics import AnalyticsService
+from bot.services.notifications import NotificationService
+from bot.services.outbound import Priority
+from database import async_session_maker
+from database.cache_bus import ALERT_SETTINGS, cache_bus
+from database.models import AlertSettings
+from database.repositories.event_partition import add_months
+from database.repositories import (
+    AlertSettingsRepository,
+    ChannelRepository,
+    EventRepository,
+    MemberRepository,
+    UserRepository,
+)
+
+DAILY = "daily"
+WEEKLY = "weekly"
+MONTHLY = "monthly"
+DIGEST_KINDS = (DAILY, WEEKLY, MONTHLY)
+
+# Minutes past the digest hour, so a channel's digests do not go out together
+_MINUTE = {DAILY: 0, WEEKLY: 5, MONTHLY: 10}
+_ENABLED = {DAILY: "digest_daily", WEEKLY: "digest_weekly", MONTHLY: "digest_monthly"}
+_LAST_SENT = {DAILY: "last_daily_digest", WEEKLY: "last_weekly_digest", MONTHLY: "last_monthly_digest"}
+_REPORT_DAYS = {DAILY: 1, WEEKLY: 7, MONTHLY: 30}
+# Settings that move a channel's digest plan
+SCHEDULE_FIELDS = frozenset({*_ENABLED.values(), "digest_hour", "digest_timezone"})
+
+
+def digest_zone(name: str) -> tzinfo:
+    """Zone of a channel's digest schedule; unknown names fall back to UTC."""
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return timezone.utc
+
+
+def _period_start(kind: str, day: date) -> date:
+    if kind == WEEKLY:
+        return day - timedelta(days=day.weekday())
+    if kind == MONTHLY:
+        return day.replace(day=1)
+    return day
+
+
+def _shift(kind: str, period: date, periods: int) -> date:
+    if kind == WEEKLY:
+        return period + timedelta(weeks=periods)
+    if kind == MONTHLY:
+        return add_months(period, periods)
+    return period + timedelta(days=periods)
+
+
+def _slot(kind: str, period: date, hour: int, zone: tzinfo) -> datetime:
+    local = datetime(period.year, period.month, period.day, hour, _MINUTE[kind], tzinfo=zone)
+    return local.astimezone(timezone.utc)
+
+
+def previous_slot(kind: str, hour: int, zone: tzinfo, now: datetime) -> datetime:
+    """Latest delivery time of ``kind`` at or before ``now``."""
+    period = _period_start(kind, now.astimezone(zone).date())
+    slot = _slot(kind, period, hour, zone)
+    return slot if slot <= now else _slot(kind, _shift(kind, period, -1), hour, zone)
+
+
+def next_slot(kind: str, hour: int, zone: tzinfo, now: datetime) -> datetime:
+    """First delivery time of ``kind`` after ``now``."""
+    period = _period_start(kind, now.astimezone(zone).date())
+    slot = _slot(kind, period, hour, zone)
+    return slot if slot > now else _slot(kind, _shift(kind, period, 1), hour, zone)
+
+
+@dataclass
+class DigestWave:
+    """Outcome of one batch of digests that fell due together."""
+
+    size: int = 0
+    sent: int = 0
+    skipped: int = 0
+    failed: int = 0
+    duration: float = 0.0
+    slowest: float = 0.0
+
+
+class DigestScheduler:
+    """Sends each digest at its channel's delivery time.
+
+    Keeps a min-heap of ``(due, channel_id, kind)`` and sleeps until the
+    earliest entry. Re-planning a channel pushes new entries and leaves the
+    old ones in the heap; they are recognised as stale when popped. A digest
+    missed by less than ``grace`` (e.g. during a restart) is sent late,
+    older ones are skipped. All plans are rebuilt every ``resync_interval``
+    to pick up new channels and changes made by other replicas.
+
+    Digests due together form a wave that ``workers`` tasks build in
+    parallel, each channel in its own short session. A failed channel is
+    retried after ``retry_delay`` without affecting the rest of the wave.
+    """
+
+    grace = timedelta(hours=1)
+    retry_delay = timedelta(minutes=5)
+
+    def __init__(self, resync_minutes: int = 60, workers: int = 8) -> None:
+        self.resync_interval = timedelta(minutes=resync_minutes)
+        self.workers = max(1, workers)
+        self.waves = 0
+        self.sent = 0
+        self.failed = 0
+        self.last_wave: DigestWave | None = None
+        self._bot: Bot | None = None
+        self._heap: list[tuple[datetime, int, str]] = []
+        self._planned: dict[tuple[int, str], datetime] = {}
+        self._dirty: set[int] = set()
+        self._resync_requested = False
+        self._wakeup = asyncio.Event()
+        self._subscribed = False
+
+    def __len__(self) -> int:
+        return len(self._planned)
+
+    def replan(self, channel_id: int | None) -> None:
+        """Recompute a channel's plan (all channels for ``None``) after a settings change."""
+        if channel_id is None:
+            self._resync_requested = True
+        else:
+            self._dirty.add(channel_id)
+        self._wakeup.set()
+
+    def next_due(self, kind: str, settings: AlertSettings, now: datetime) -> datetime | None:
+        """When the digest of ``kind`` should go out next; ``None`` if disabled."""
+        if not getattr(settings, _ENABLED[kind]):
+            return None
+        zone = digest_zone(settings.digest_timezone)
+        previous = previous_slot(kind, settings.digest_hour, zone, now)
+        last_sent = getattr(settings, _LAST_SENT[kind])
+        sent = last_sent is not None and _period_start(
+            kind, last_sent.astimezone(zone).date()
+        ) >= _period_start(kind, previous.astimezone(zone).date())
+        if not sent and now - previous < self.grace:
+            return previous
+        return next_slot(kind, settings.digest_hour, zone, now)
+
+    def _on_settings_changed(self, channel_id: int | None, data: dict | None) -> None:
+        if data is None or SCHEDULE_FIELDS.intersection(data["fields"]):
+            self.replan(channel_id)
+
+    async def run(self, bot: Bot) -> None:
+        """Plan and send digests until cancelled."""
+        self._bot = bot
+        if not self._subscribed:
+            cache_bus.subscribe(ALERT_SETTINGS, self._on_settings_changed)
+            self._subscribed = True
+        resync_at = datetime.min.replace(tzinfo=timezone.utc)
+        while True:
+            now = datetime.now(timezone.utc)
+            try:
+                if now >= resync_at or self._resync_requested:
+                    await self._resync(now)
+                    resync_at = now + self.resync_interval
+                elif self._dirty:
+                    await self._refresh(now)
+            except Exception as e:
+                logger.error(f"Digest scheduler planning error: {e}")
+                await asyncio.sleep(5)
+                continue
+
+            due = self._pop_due(now)
+            if due:
+                await self._run_wave(due)
+
+            self._wakeup.clear()
+            wake_at = min(self._heap[0][0], resync_at) if self._heap else resync_at
+            delay = (wake_at - datetime.now(timezone.utc)).total_seconds()
+            if delay > 0:
+                with suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+
+    async def _resync(self, now: datetime) -> None:
+        async with async_session_maker() as session:
+            all_settings = await AlertSettingsRepository(session).get_for_digests()
+        self._heap.clear()
+        self._planned.clear()
+        self._dirty.clear()
+        self._resync_requested = False
+        for settings in all_settings:
+            if local_partition.owns(settings.channel_id):
+                self._plan(settings, now)
+        logger.info(f"Digest scheduler planned {len(self._planned)} digests")
+
+    async def _refresh(self, now: datetime) -> None:
+        channel_ids, self._dirty = self._dirty, set()
+        async with async_session_maker() as session:
+            channel_repo = ChannelRepository(session)
+            alert_repo = AlertSettingsRepository(session)
+            for channel_id in channel_ids:
+                for kind in DIGEST_KINDS:
+                    self._planned.pop((channel_id, kind), None)
+                if not local_partition.owns(channel_id):
+                    continue
+                channel = await channel_repo.get_info(channel_id)
+                if channel is None or not channel.is_active or not channel.notify_chat_id:
+                    continue
+                settings = await alert_repo.get_by_channel(channel_id)
+                if settings is not None:
+                    self._plan(settings, now)
+
+    def _plan(self, settings: AlertSettings, now: datetime) -> None:
+        for kind in DIGEST_KINDS:
+            self._push(settings.channel_id, kind, self.next_due(kind, settings, now))
+
+    def _push(self, channel_id: int, kind: str, due: datetime | None) -> None:
+        key = (channel_id, kind)
+        if due is None:
+            self._planned.pop(key, None)
+            return
+        self._planned[key] = due
+        heapq.heappush(self._heap, (due, channel_id, kind))
+
+    def _pop_due(self, now: datetime) -> list[tuple[int, str]]:
+        due: list[tuple[int, str]] = []
+        while self._heap and self._heap[0][0] <= now:
+            at, channel_id, kind = heapq.heappop(self._heap)
+            if self._planned.get((channel_id, kind)) == at:
+                del self._planned[(channel_id, kind)]
+                due.append((channel_id, kind))
+        return due
+
+    async def _run_wave(self, due: list[tuple[int, str]]) -> DigestWave:
+        wave = DigestWave(size=len(due))
+        pending = list(reversed(due))
+        started = time.perf_counter()
+
+        async def worker() -> None:
+            while pending:
+                channel_id, kind = pending.pop()
+                channel_started = time.perf_counter()
+                try:
+                    if await self._send(channel_id, kind):
+                        wave.sent += 1
+                    else:
+                        wave.skipped += 1
+                except Exception as e:
+                    wave.failed += 1
+                    logger.error(f"Failed to send {kind} digest for channel {channel_id}: {e}")
+                    self._push(channel_id, kind, datetime.now(timezone.utc) + self.retry_delay)
+                wave.slowest = max(wave.slowest, time.perf_counter() - channel_started)
+
+        await asyncio.gather(*(worker() for _ in range(min(self.workers, len(due)))))
+        wave.duration = time.perf_counter() - started
+        self.waves += 1
+        self.sent += wave.sent
+        self.failed += wave.failed
+        self.last_wave = wave
+        logger.info(
+            f"Digest wave: {wave.size} due, {wave.sent} sent, {wave.skipped} skipped, "
+            f"{wave.failed} failed in {wave.duration:.1f}s (slowest {wave.slowest:.1f}s)"
+        )
+        return wave
+
+    async def _send(self, channel_id: int, kind: str) -> bool:
+        """Build and deliver one digest. Returns whether it was sent.
+
+        The digest is marked as sent only once Telegram accepted it.
+        """
+        async with async_session_maker() as session:
+            channel_repo = ChannelRepository(session)
+            event_repo = EventRepository(session)
+            member_repo = MemberRepository(session)
+            alert_repo = AlertSettingsRepository(session)
+            user_repo = UserRepository(session)
+
+            channel = await channel_repo.get_info(channel_id)
+            if channel is None or not channel.is_active or not channel.notify_chat_id:
+                return False
+            # Stored last_*_digest, not the cached copy: another replica may have sent it
+            settings = await alert_repo.get_by_channel(channel_id, cached=False)
+            if settings is None:
+                settings = await alert_repo.get_or_create(channel_id)
+            now = datetime.now(timezone.utc)
+            due = self.next_due(kind, settings, now)
+            if due is None or due > now:
+                # Disabled or already sent since it was planned
+                self._push(channel_id, kind, due)
+                return False
+
+            alert_service = AlertService(self._bot, event_repo, member_repo, alert_repo, user_repo)
+            sent = not alert_service._is_quiet(settings, now)
+            if sent:
+                i18n = I18n(await user_repo.get_language(channel.admin_user_id))
+                analytics = AnalyticsService(member_repo, event_repo)
+                digest = await analytics.get_growth_dynamics_message(
+                    channel, days=_REPORT_DAYS[kind], i18n=i18n
+                )
+                if kind == DAILY:
+                    digest += "\n\n" + await analytics.get_activity_insights_message(
+                        channel, days=7, i18n=i18n
+                    )
+
+        # Delivery may wait behind the rate limits, so no session is held meanwhile
+        if sent:
+            delivered = await NotificationService(self._bot, i18n).send_text(
+                channel.notify_chat_id,
+                i18n(f"alerts.digest_{kind}_prefix") + "\n\n" + digest,
+                priority=Priority.DIGEST,
+            )
+            if not delivered:
+                # Not marked as sent; the wave retries it
+                raise RuntimeError("message was not delivered")
+            async with async_session_maker() as session:
+                await AlertSettingsRepository(session).update(channel_id, **{_LAST_SENT[kind]: now})
+
+        zone = digest_zone(settings.digest_timezone)
+        self._push(channel_id, kind, next_slot(kind, settings.digest_hour, zone, now))
+        return sent
+
+
+digest_scheduler = DigestScheduler(
+    resync_minutes=app_settings.digest_resync_minutes,
+    workers=app_settings.digest_workers,
+)
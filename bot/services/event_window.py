@@ -0,0 +1,116 @@
+"""In-memory sliding window of per-minute member event counts."""
+
+from collections import deque
+from collections.abc import Iterable
+from datetime import datetime
+
+from bot.config import settings
+
+# Bucket layout: [minute, join, leave, kick, ban, total]
+_TRACKED = {"join": 1, "leave": 2, "kick": 3, "ban": 4}
+_TOTAL = 5
+
+
+def _minute(at: datetime) -> int:
+    return int(at.timestamp()) // 60
+
+
+class EventWindow:
+    """Per-channel ring of per-minute join/leave/kick/ban buckets.
+
+    Only minutes that saw events are stored, oldest first, and buckets older
+    than ``capacity_minutes`` are dropped as new ones arrive. Counts are
+    minute-granular: ``since`` is rounded down to the start of its minute.
+    """
+
+    def __init__(self, capacity_minutes: int = 1500) -> None:
+        self.capacity = capacity_minutes
+        self._channels: dict[int, deque[list[int]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._channels)
+
+    def covers(self, since: datetime, now: datetime) -> bool:
+        """Whether a window starting at ``since`` fits into the buffer."""
+        return _minute(now) - _minute(since) < self.capacity
+
+    def record(self, channel_id: int, event_type: str, at: datetime, count: int = 1) -> None:
+        """Add ``count`` events of ``event_type`` at ``at``."""
+        minute = _minute(at)
+        buckets = self._channels.setdefault(channel_id, deque())
+        bucket = self._bucket(buckets, minute)
+        if bucket is None:
+            return
+        index = _TRACKED.get(event_type)
+        if index is not None:
+            bucket[index] += count
+        bucket[_TOTAL] += count
+        self._prune(channel_id, buckets, minute)
+
+    def count(
+        self,
+        channel_id: int,
+        since: datetime,
+        now: datetime,
+        event_type: str | None = None,
+    ) -> int | None:
+        """Events since ``since``; None if the window or type is not tracked."""
+        if not self.covers(since, now):
+            return None
+        if event_type is None:
+            index = _TOTAL
+        elif event_type in _TRACKED:
+            index = _TRACKED[event_type]
+        else:
+            return None
+
+        buckets = self._channels.get(channel_id)
+        if not buckets:
+            return 0
+        start = _minute(since)
+        total = 0
+        for bucket in reversed(buckets):
+            if bucket[0] < start:
+                break
+            total += bucket[index]
+        return total
+
+    def load(self, rows: Iterable[tuple[int, datetime, str, int]], now: datetime) -> None:
+        """Rebuild from ``(channel_id, minute, event_type, count)`` rows."""
+        self._channels.clear()
+        horizon = _minute(now) - self.capacity
+        for channel_id, at, event_type, count in sorted(rows, key=lambda row: row[1]):
+            if _minute(at) > horizon:
+                self.record(channel_id, event_type, at, count)
+
+    def _bucket(self, buckets: deque[list[int]], minute: int) -> list[int] | None:
+        if buckets and buckets[-1][0] == minute:
+            return buckets[-1]
+        if not buckets or buckets[-1][0] < minute:
+            bucket = [minute, 0, 0, 0, 0, 0]
+            buckets.append(bucket)
+            return bucket
+
+        # Late event: find or insert its minute, unless it already aged out
+        if minute <= buckets[-1][0] - self.capacity:
+            return None
+        for position in range(len(buckets) - 1, -1, -1):
+            if buckets[position][0] == minute:
+                return buckets[position]
+            if buckets[position][0] < minute:
+                bucket = [minute, 0, 0, 0, 0, 0]
+                buckets.insert(position + 1, bucket)
+                return bucket
+        bucket = [minute, 0, 0, 0, 0, 0]
+        buckets.appendleft(bucket)
+        return bucket
+
+    def _prune(self, channel_id: int, buckets: deque[list[int]], minute: int) -> None:
+        horizon = max(minute, buckets[-1][0]) - self.capacity
+        while buckets and buckets[0][0] <= horizon:
+            buckets.popleft()
+        if not buckets:
+            del self._channels[channel_id]
+
+
+event_window = EventWindow(capacity_minutes=settings.event_window_minutes)
@@ -0,0 +1,222 @@
+"""Write-behind ingest buffer for message events."""
+
+import asyncio
+import time
+from contextlib import suppress
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any
+
+from loguru import logger
+from sqlalchemy.exc import DataError, IntegrityError
+
+from bot.config import settings
+from database import async_session_maker
+from database.repositories import EventRepository
+
+
+@dataclass
+class IngestStats:
+    """Counters describing buffer flushes."""
+
+    flushes: int = 0
+    failed_flushes: int = 0
+    rejected_rows: int = 0
+    rows_flushed: int = 0
+    duplicates_skipped: int = 0
+    last_flush_size: int = 0
+    max_flush_size: int = 0
+    last_flush_ms: float = 0.0
+    max_flush_ms: float = 0.0
+    total_flush_ms: float = 0.0
+
+    @property
+    def avg_flush_size(self) -> float:
+        return self.rows_flushed / self.flushes if self.flushes else 0.0
+
+    @property
+    def avg_flush_ms(self) -> float:
+        return self.total_flush_ms / self.flushes if self.flushes else 0.0
+
+
+def member_event_key(channel_id: int, user_id: int, date: datetime, new_status: str) -> str:
+    """Natural key of a chat_member update, stable across redeliveries."""
+    return f"m:{channel_id}:{user_id}:{int(date.timestamp())}:{new_status}"
+
+
+def message_event_key(chat_id: int, message_id: int) -> str:
+    """Natural key of a message update (message ids are unique per chat)."""
+    return f"c:{chat_id}:{message_id}"
+
+
+class EventIngestBuffer:
+    """Collects message event rows in memory and writes them as multi-row INSERTs.
+
+    Member events are not buffered: they are written in the transaction of
+    the member update, together with their outbox notification.
+
+    A batch is flushed when it reaches ``batch_size`` rows or when
+    ``flush_interval_ms`` has passed since its first row, whichever comes first.
+    Producers only wait while the queue is full, never for the flush itself,
+    so a busy chat does not hold its update lane. Failed flushes are retried
+    with exponential backoff and never dropped; meanwhile the bounded queue
+    makes producers wait. A batch rejected by the database is retried row by
+    row so one bad row is the only one lost.
+    """
+
+    retry_delay = 0.5
+    max_retry_delay = 30.0
+
+    def __init__(
+        self,
+        flush_interval_ms: int = 200,
+        batch_size: int = 500,
+        max_queue: int = 10000,
+    ) -> None:
+        self.flush_interval = flush_interval_ms / 1000
+        self.batch_size = batch_size
+        self.stats = IngestStats()
+        self._queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(maxsize=max_queue)
+        self._batch: list[dict[str, Any]] = []
+        self._inflight: asyncio.Future | None = None
+        self._task: asyncio.Task | None = None
+        self._give_up_at: float | None = None
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def start(self) -> None:
+        """Start the background flush loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Stop the flush loop and write out everything still buffered.
+
+        Retries stop after ``timeout``; rows that could not be stored by
+        then are logged as lost.
+        """
+        self._give_up_at = time.monotonic() + timeout
+        if self._task:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        if self._inflight:
+            with suppress(Exception):
+                await self._inflight
+
+        pending = self._batch
+        self._batch = []
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        for i in range(0, len(pending), self.batch_size):
+            await self._flush(pending[i:i + self.batch_size])
+
+        logger.info(
+            f"Ingest buffer stopped: {self.stats.flushes} flushes, "
+            f"{self.stats.rows_flushed} rows, avg {self.stats.avg_flush_size:.1f} rows / "
+            f"{self.stats.avg_flush_ms:.1f} ms"
+        )
+
+    async def add_message_event(
+        self,
+        channel_id: int,
+        user_id: int,
+        message_id: int,
+        event_type: str,
+        username: str | None = None,
+        first_name: str | None = None,
+        last_name: str | None = None,
+        content_preview: str | None = None,
+        created_at: datetime | None = None,
+        dedup_key: str | None = None,
+    ) -> None:
+        """Queue a message event for the next flush (waits only while the queue is full)."""
+        row = {
+            "channel_id": channel_id,
+            "user_id": user_id,
+            "username": username,
+            "first_name": first_name,
+            "last_name": last_name,
+            "message_id": message_id,
+            "event_type": event_type,
+            "content_preview": content_preview[:500] if content_preview else None,
+            "created_at": created_at or datetime.now(timezone.utc),
+            "dedup_key": dedup_key,
+        }
+        await self._queue.put(row)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            self._batch.append(await self._queue.get())
+            deadline = loop.time() + self.flush_interval
+            while len(self._batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    self._batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            batch, self._batch = self._batch, []
+            # Shielded so that shutdown never interrupts a half-written batch.
+            self._inflight = asyncio.ensure_future(self._flush(batch))
+            await asyncio.shield(self._inflight)
+            self._inflight = None
+
+    async def _flush(self, batch: list[dict[str, Any]]) -> None:
+        if not batch:
+            return
+        started = time.perf_counter()
+        delay = self.retry_delay
+        while True:
+            try:
+                inserted = await self._write(batch)
+                break
+            except (IntegrityError, DataError) as e:
+                if len(batch) == 1:
+                    self.stats.rejected_rows += 1
+                    logger.error(f"Event rejected by the database: {e}")
+                    return
+                logger.warning(f"Event batch rejected, storing {len(batch)} rows one by one: {e}")
+                for item in batch:
+                    await self._flush([item])
+                return
+            except Exception as e:
+                self.stats.failed_flushes += 1
+                if self._give_up_at is not None and time.monotonic() + delay > self._give_up_at:
+                    logger.error(f"Shutting down with {len(batch)} events not stored: {e}")
+                    return
+                logger.warning(f"Event flush failed, retrying in {delay:.1f}s: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_retry_delay)
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        stats = self.stats
+        stats.flushes += 1
+        stats.rows_flushed += inserted
+        stats.duplicates_skipped += len(batch) - inserted
+        stats.last_flush_size = len(batch)
+        stats.max_flush_size = max(stats.max_flush_size, len(batch))
+        stats.last_flush_ms = elapsed_ms
+        stats.max_flush_ms = max(stats.max_flush_ms, elapsed_ms)
+        stats.total_flush_ms += elapsed_ms
+        logger.debug(f"Flushed {len(batch)} events in {elapsed_ms:.1f} ms")
+
+    async def _write(self, batch: list[dict[str, Any]]) -> int:
+        """Insert a batch in one transaction. Returns the number of rows inserted."""
+        async with async_session_maker() as session:
+            inserted = await EventRepository(session).insert_message_events(batch)
+            await session.commit()
+        return inserted
+
+
+ingest_buffer = EventIngestBuffer(
+    flush_interval_ms=settings.ingest_flush_interval_ms,
+    batch_size=settings.ingest_batch_size,
+    max_queue=settings.ingest_queue_size,
+)
@@ -5,36 +5,47 @@ from loguru import logger
 from aiogram import Bot
 
 from bot.i18n import I18n
-from bot.utils.formatting import format_event_message
-from database.models import Channel, MemberEvent
+from bot.services.outbound import Priority, outbound
+from bot.utils.formatting import format_burst_message, format_event_message
+from database.models import Channel, ChannelInfo, MemberEvent
 
 
 class NotificationService:
-    """Service for sending notifications to channel admins."""
+    """Service for sending notifications to channel admins.
+
+    Messages are queued on the outbound dispatcher, which delivers them
+    within Telegram's rate limits and logs failures.
+    """
 
     def __init__(self, bot: Bot, i18n: I18n | None = None) -> None:
         self.bot = bot
         self.i18n = i18n
 
-    async def send_text(self, chat_id: int, text: str) -> bool:
-        """Send a plain text message."""
-        try:
-            await self.bot.send_message(
-                chat_id=chat_id,
-                text=text,
-                disable_web_page_preview=True,
-            )
-            return True
-        except Exception as e:
-            logger.error(f"Failed to send text notification: {e}")
-            return False
+    async def send_text(
+        self,
+        chat_id: int,
+        text: str,
+        priority: Priority = Priority.ALERT,
+    ) -> bool:
+        """Send a plain text message. Returns whether it was delivered."""
+        return await outbound.send_message(
+            self.bot,
+            chat_id,
+            text,
+            priority=priority,
+            disable_web_page_preview=True,
+        )
 
     async def notify_member_event(
         self,
         event: MemberEvent,
-        channel: Channel,
+        channel: Channel | ChannelInfo,
+        wait: bool = False,
     ) -> bool:
-        """Send notification about member event."""
+        """Send notification about member event.
+
+        With ``wait`` the result reflects delivery instead of queueing.
+        """
         if not channel.notify_chat_id:
             logger.warning(
                 f"No notify_chat_id for channel {channel.id}, skipping notification"
@@ -43,25 +54,47 @@ class NotificationService:
 
         message = format_event_message(event, channel.title, self.i18n)
 
-        try:
-            await self.bot.send_message(
-                chat_id=channel.notify_chat_id,
-                text=message,
-                disable_web_page_preview=True,
-            )
-            logger.info(
-                f"Sent {event.event_type} notification for user {event.user_id} "
-                f"in channel {channel.id}"
-            )
-            return True
-        except Exception as e:
-            logger.error(f"Failed to send notification: {e}")
+        sent = outbound.send_message(
+            self.bot,
+            channel.notify_chat_id,
+            message,
+            priority=Priority.MEMBER_EVENT,
+            disable_web_page_preview=True,
+        )
+        logger.info(
+            f"Queued {event.event_type} notification for user {event.user_id} "
+            f"in channel {channel.id}"
+        )
+        return await sent if wait else True
+
+    async def notify_member_events_burst(
+        self,
+        events: list[MemberEvent],
+        channel: Channel | ChannelInfo,
+        max_names: int = 10,
+        wait: bool = False,
+    ) -> bool:
+        """Send one aggregated notification about a burst of member events."""
+        if not channel.notify_chat_id or not events:
             return False
 
+        message = format_burst_message(events, channel.title, self.i18n, max_names)
+        sent = outbound.send_message(
+            self.bot,
+            channel.notify_chat_id,
+            message,
+            priority=Priority.MEMBER_EVENT,
+            disable_web_page_preview=True,
+        )
+        logger.info(
+            f"Queued burst notification for {len(events)} events in channel {channel.id}"
+        )
+        return await sent if wait else True
+
     async def send_welcome(
         self,
         chat_id: int,
-        channel: Channel,
+        channel: Channel | ChannelInfo,
     ) -> bool:
         """Send welcome message when bot is added to channel."""
         if self.i18n:
@@ -81,12 +114,5 @@ class NotificationService:
                 f"Use /recent to see recent events."
             )
 
-        try:
-            await self.bot.send_message(
-                chat_id=chat_id,
-                text=message,
-            )
-            return True
-        except Exception as e:
-            logger.error(f"Failed to send welcome message: {e}")
-            return False
+        outbound.send_message(self.bot, chat_id, message, priority=Priority.MEMBER_EVENT)
+        return True
@@ -0,0 +1,297 @@
+"""Rate-limited outbound message dispatcher."""
+
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import suppress
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any
+
+from loguru import logger
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramNetworkError, TelegramRetryAfter
+
+from bot.config import settings
+
+
+class Priority(IntEnum):
+    """Outbound message classes; lower values are sent first."""
+
+    ALERT = 0
+    MEMBER_EVENT = 1
+    DIGEST = 2
+
+
+class TokenBucket:
+    """Classic token bucket; tokens refill continuously at ``rate`` per second."""
+
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate: float, capacity: float | None = None) -> None:
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, now: float) -> float:
+        """Seconds until a token is available."""
+        self._refill(now)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self, now: float) -> None:
+        self._refill(now)
+        self.tokens -= 1
+
+
+@dataclass(order=True)
+class _Outgoing:
+    priority: int
+    seq: int
+    bot: Bot = field(compare=False)
+    chat_id: int = field(compare=False)
+    text: str = field(compare=False)
+    kwargs: dict[str, Any] = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+    attempts: int = field(default=0, compare=False)
+
+
+@dataclass
+class OutboundStats:
+    """Counters describing outbound delivery."""
+
+    sent: int = 0
+    failed: int = 0
+    retry_after: int = 0
+
+
+class OutboundDispatcher:
+    """Central queue for outgoing messages respecting Telegram flood limits.
+
+    A global token bucket caps the overall send rate and a per-chat bucket
+    caps each destination. Among chats that may send, the most urgent head
+    message goes first, so a digest wave never delays an alert.
+    ``TelegramRetryAfter`` pauses the chat and resends the message later.
+    """
+
+    max_attempts = 5
+    idle_bucket_seconds = 60.0
+
+    def __init__(self, global_rate: float = 30.0, chat_rate: float = 1.0) -> None:
+        self.chat_rate = chat_rate
+        self.stats = OutboundStats()
+        self._global = TokenBucket(global_rate)
+        self._buckets: dict[int, TokenBucket] = {}
+        self._chats: dict[int, list[_Outgoing]] = {}
+        self._paused: dict[int, float] = {}
+        # (priority, seq, chat_id) of chats whose head message may be sent
+        self._ready: list[tuple[int, int, int]] = []
+        # (not_before, chat_id) of chats waiting for their bucket or a RetryAfter
+        self._delayed: list[tuple[float, int]] = []
+        self._waiting: set[int] = set()
+        self._pruned_at = time.monotonic()
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+        # In-flight sends and the message each one carries
+        self._sending: dict[asyncio.Task, _Outgoing] = {}
+        self._task: asyncio.Task | None = None
+
+    @property
+    def pending(self) -> int:
+        return sum(len(queue) for queue in self._chats.values())
+
+    def start(self) -> None:
+        """Start the dispatch loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Send what is queued (up to ``timeout``), then stop."""
+        deadline = time.monotonic() + timeout
+        while (self._chats or self._sending) and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+        if self._task:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        sending = dict(self._sending)
+        for task in sending:
+            task.cancel()
+        if sending:
+            await asyncio.gather(*sending, return_exceptions=True)
+        dropped = 0
+        unsent = [item for queue in self._chats.values() for item in queue]
+        for item in [*sending.values(), *unsent]:
+            if not item.future.done():
+                dropped += 1
+                item.future.set_result(False)
+        self._chats.clear()
+        if dropped:
+            logger.warning(f"Outbound dispatcher stopped with {dropped} unsent messages")
+        logger.info(
+            f"Outbound dispatcher stopped: {self.stats.sent} sent, "
+            f"{self.stats.failed} failed, {self.stats.retry_after} flood waits"
+        )
+
+    def send_message(
+        self,
+        bot: Bot,
+        chat_id: int,
+        text: str,
+        priority: Priority = Priority.MEMBER_EVENT,
+        **kwargs: Any,
+    ) -> asyncio.Future:
+        """Queue a message. The future resolves to True once it is delivered."""
+        item = _Outgoing(
+            priority=priority,
+            seq=next(self._seq),
+            bot=bot,
+            chat_id=chat_id,
+            text=text,
+            kwargs=kwargs,
+            future=asyncio.get_running_loop().create_future(),
+        )
+        self._enqueue(item)
+        return item.future
+
+    def _enqueue(self, item: _Outgoing) -> None:
+        queue = self._chats.setdefault(item.chat_id, [])
+        heapq.heappush(queue, item)
+        if queue[0] is item:
+            self._schedule(item.chat_id)
+        self._wakeup.set()
+
+    def _schedule(self, chat_id: int, now: float | None = None) -> None:
+        queue = self._chats.get(chat_id)
+        if not queue:
+            return
+        if now is None:
+            now = time.monotonic()
+        not_before = max(
+            now + self._bucket(chat_id).delay(now),
+            self._paused.get(chat_id, 0.0),
+        )
+        if not_before <= now:
+            head = queue[0]
+            heapq.heappush(self._ready, (head.priority, head.seq, chat_id))
+        elif chat_id not in self._waiting:
+            self._waiting.add(chat_id)
+            heapq.heappush(self._delayed, (not_before, chat_id))
+
+    def _bucket(self, chat_id: int) -> TokenBucket:
+        bucket = self._buckets.get(chat_id)
+        if bucket is None:
+            bucket = self._buckets[chat_id] = TokenBucket(self.chat_rate, 1)
+        return bucket
+
+    def _next_ready(self) -> int | None:
+        """Pop the chat with the most urgent sendable head message."""
+        now = time.monotonic()
+        while self._delayed and self._delayed[0][0] <= now:
+            _, chat_id = heapq.heappop(self._delayed)
+            self._waiting.discard(chat_id)
+            self._schedule(chat_id, now)
+        while self._ready:
+            priority, seq, chat_id = heapq.heappop(self._ready)
+            queue = self._chats.get(chat_id)
+            # Entries are not removed when a chat is rescheduled; skip stale ones
+            if not queue or queue[0].seq != seq:
+                continue
+            if self._bucket(chat_id).delay(now) > 0 or self._paused.get(chat_id, 0.0) > now:
+                self._schedule(chat_id, now)
+                continue
+            return chat_id
+        return None
+
+    async def _run(self) -> None:
+        while True:
+            chat_id = self._next_ready()
+            if chat_id is None:
+                self._wakeup.clear()
+                timeout = None
+                if self._delayed:
+                    timeout = max(0.0, self._delayed[0][0] - time.monotonic())
+                with suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                self._prune_buckets()
+                continue
+
+            wait = self._global.delay(time.monotonic())
+            if wait > 0:
+                # Put the chat back: something more urgent may arrive meanwhile
+                self._schedule(chat_id)
+                await asyncio.sleep(wait)
+                continue
+
+            now = time.monotonic()
+            self._global.take(now)
+            self._bucket(chat_id).take(now)
+            queue = self._chats[chat_id]
+            item = heapq.heappop(queue)
+            if not queue:
+                del self._chats[chat_id]
+            else:
+                self._schedule(chat_id)
+
+            task = asyncio.create_task(self._send(item))
+            self._sending[task] = item
+            task.add_done_callback(self._sent)
+
+    async def _send(self, item: _Outgoing) -> None:
+        item.attempts += 1
+        try:
+            await item.bot.send_message(chat_id=item.chat_id, text=item.text, **item.kwargs)
+        except TelegramRetryAfter as e:
+            self.stats.retry_after += 1
+            logger.warning(f"Flood limit for chat {item.chat_id}: retry in {e.retry_after}s")
+            self._retry(item, e.retry_after)
+        except TelegramNetworkError as e:
+            logger.warning(f"Network error sending to chat {item.chat_id}: {e}")
+            self._retry(item, 2 ** item.attempts)
+        except Exception as e:
+            self.stats.failed += 1
+            logger.error(f"Failed to send message to chat {item.chat_id}: {e}")
+            item.future.set_result(False)
+        else:
+            self.stats.sent += 1
+            item.future.set_result(True)
+
+    def _sent(self, task: asyncio.Task) -> None:
+        self._sending.pop(task, None)
+
+    def _retry(self, item: _Outgoing, delay: float) -> None:
+        if item.attempts >= self.max_attempts:
+            self.stats.failed += 1
+            logger.error(f"Giving up on message to chat {item.chat_id} after {item.attempts} attempts")
+            item.future.set_result(False)
+            return
+        self._paused[item.chat_id] = time.monotonic() + delay
+        # The original seq keeps the message ahead of later ones of its class
+        self._enqueue(item)
+
+    def _prune_buckets(self) -> None:
+        now = time.monotonic()
+        if now - self._pruned_at < self.idle_bucket_seconds:
+            return
+        self._pruned_at = now
+        for chat_id in [
+            chat_id
+            for chat_id, bucket in self._buckets.items()
+            if chat_id not in self._chats
+            and now - bucket.updated > self.idle_bucket_seconds
+        ]:
+            del self._buckets[chat_id]
+            self._paused.pop(chat_id, None)
+
+
+outbound = OutboundDispatcher(
+    global_rate=settings.outbound_global_rate,
+    chat_rate=settings.outbound_chat_rate,
+)
@@ -0,0 +1,366 @@
+"""Outbox worker delivering durable member event notifications."""
+
+import asyncio
+from collections import deque
+from contextlib import suppress
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from loguru import logger
+
+from aiogram import Bot
+
+from bot.config import settings
+from bot.i18n import I18n
+from bot.partitioning import local_partition
+from bot.services.notifications import NotificationService
+from database import async_session_maker
+from database.models import ChannelInfo, MemberEvent, OutboxMessage
+from database.repositories import ChannelRepository, OutboxRepository, UserRepository
+
+MEMBER_EVENT = "member_event"
+
+
+def member_event_message(row: dict[str, Any]) -> dict[str, Any]:
+    """Outbox row for an inserted member event (see ``insert_member_events``)."""
+    return {
+        "channel_id": row["channel_id"],
+        "kind": MEMBER_EVENT,
+        "payload": {
+            "event_id": row["id"],
+            "user_id": row["user_id"],
+            "username": row["username"],
+            "first_name": row["first_name"],
+            "last_name": row["last_name"],
+            "event_type": row["event_type"],
+            "created_at": row["created_at"].isoformat(),
+        },
+    }
+
+
+def _payload_event(message: OutboxMessage) -> MemberEvent:
+    payload = message.payload
+    return MemberEvent(
+        id=payload["event_id"],
+        channel_id=message.channel_id,
+        user_id=payload["user_id"],
+        username=payload["username"],
+        first_name=payload["first_name"],
+        last_name=payload["last_name"],
+        event_type=payload["event_type"],
+        created_at=datetime.fromisoformat(payload["created_at"]),
+    )
+
+
+@dataclass
+class OutboxStats:
+    """Counters describing outbox delivery."""
+
+    claimed: int = 0
+    sent: int = 0
+    retried: int = 0
+    held: int = 0
+    bursts: int = 0
+
+
+SEND = "send"
+HOLD = "hold"
+AGGREGATE = "aggregate"
+
+
+@dataclass
+class _ChannelRate:
+    arrivals: deque[datetime] = field(default_factory=deque)
+    flush_at: datetime | None = None
+
+
+class BurstDetector:
+    """Decides per channel between single and aggregated notifications.
+
+    While a channel gets fewer than ``threshold`` notifications per
+    ``window`` seconds each one is sent on its own (``SEND``). Above that
+    rate its notifications are held until the window ends (``HOLD``) and
+    then sent as one message (``AGGREGATE``); the channel goes back to single
+    notifications once a window collects fewer than ``threshold``.
+    """
+
+    prune_interval = timedelta(minutes=1)
+    # Held rows come back by the database clock, which may run slightly ahead
+    clock_slack = timedelta(milliseconds=500)
+
+    def __init__(self, threshold: int = 5, window: float = 5.0) -> None:
+        self.threshold = max(1, threshold)
+        self.window = timedelta(seconds=window)
+        self._channels: dict[int, _ChannelRate] = {}
+        self._pruned_at = datetime.now(timezone.utc)
+
+    def admit(self, channel_id: int, count: int, now: datetime) -> tuple[str, datetime | None]:
+        """Classify ``count`` claimed notifications. Returns (decision, hold until)."""
+        if now - self._pruned_at > self.prune_interval:
+            self._prune(now)
+        state = self._channels.setdefault(channel_id, _ChannelRate())
+        if state.flush_at is None:
+            state.arrivals.extend([now] * count)
+            while state.arrivals and state.arrivals[0] <= now - self.window:
+                state.arrivals.popleft()
+            if len(state.arrivals) < self.threshold:
+                return SEND, None
+            state.flush_at = now + self.window
+            return HOLD, state.flush_at
+        if now + self.clock_slack < state.flush_at:
+            return HOLD, state.flush_at
+
+        # The window is over: send what it collected
+        if count >= self.threshold:
+            state.flush_at = now + self.window
+        else:
+            state.flush_at = None
+            state.arrivals.clear()
+        return AGGREGATE, None
+
+    def _prune(self, now: datetime) -> None:
+        """Forget quiet channels that are not holding anything."""
+        self._pruned_at = now
+        horizon = now - self.window
+        for channel_id in [
+            channel_id
+            for channel_id, state in self._channels.items()
+            if state.flush_at is None and (not state.arrivals or state.arrivals[-1] <= horizon)
+        ]:
+            del self._channels[channel_id]
+
+
+class OutboxWorker:
+    """Claims due outbox rows, sends them and records the outcome.
+
+    Rows are claimed in batches at most every ``poll_interval_ms``. A
+    ``BurstDetector`` watches each channel's notification rate; rows of a
+    busy channel stay in the outbox until its burst window ends and then go
+    out as one aggregated message. Failed sends are retried with exponential
+    backoff.
+    Sends wait on the per-chat rate limit, so the lease of a batch is
+    renewed while it is being delivered; otherwise another poller could
+    claim and send the same rows again.
+    """
+
+    base_delay = 2.0
+    max_delay = 3600.0
+    purge_interval = timedelta(minutes=10)
+
+    def __init__(
+        self,
+        poll_interval_ms: int = 500,
+        batch_size: int = 200,
+        lease_seconds: int = 60,
+        max_attempts: int = 10,
+        retention_hours: int = 24,
+        burst_threshold: int = 5,
+        burst_window: float = 5.0,
+        max_names: int = 10,
+    ) -> None:
+        self.poll_interval = poll_interval_ms / 1000
+        self.batch_size = batch_size
+        self.lease = timedelta(seconds=lease_seconds)
+        self.max_attempts = max_attempts
+        self.retention = timedelta(hours=retention_hours)
+        self.bursts = BurstDetector(burst_threshold, burst_window)
+        self.max_names = max_names
+        self.stats = OutboxStats()
+        self._bot: Bot | None = None
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._stopping = False
+        self._purged_at = datetime.min.replace(tzinfo=timezone.utc)
+
+    def start(self, bot: Bot) -> None:
+        """Start the delivery loop."""
+        self._bot = bot
+        if self._task is None:
+            self._stopping = False
+            self._task = asyncio.create_task(self._run())
+
+    def wake(self) -> None:
+        """Check for new rows now instead of waiting for the next poll."""
+        self._wakeup.set()
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Finish the batch in progress (up to ``timeout``), then stop.
+
+        Rows that are not sent stay in the outbox and go out after restart.
+        """
+        if self._task is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        try:
+            await asyncio.wait_for(asyncio.shield(self._task), timeout)
+        except asyncio.TimeoutError:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+        self._task = None
+        logger.info(
+            f"Outbox worker stopped: {self.stats.sent} sent, {self.stats.retried} retried, "
+            f"{self.stats.held} held, {self.stats.bursts} bursts"
+        )
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                claimed = await self._process_batch()
+                await self._purge()
+            except Exception as e:
+                logger.error(f"Outbox worker error: {e}")
+                claimed = 0
+
+            if claimed >= self.batch_size:
+                continue
+            self._wakeup.clear()
+            if claimed:
+                # Let more notifications of busy channels accumulate
+                await asyncio.sleep(self.poll_interval)
+            else:
+                with suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+
+    async def _process_batch(self) -> int:
+        async with async_session_maker() as session:
+            outbox_repo = OutboxRepository(session)
+            partition = (
+                None
+                if local_partition.is_whole
+                else (local_partition.index, local_partition.count)
+            )
+            messages = await outbox_repo.claim(self.batch_size, self.lease, partition)
+            if not messages:
+                return 0
+            self.stats.claimed += len(messages)
+
+            grouped: dict[int, list[OutboxMessage]] = {}
+            for message in messages:
+                grouped.setdefault(message.channel_id, []).append(message)
+
+            now = datetime.now(timezone.utc)
+            by_channel: dict[int, tuple[list[OutboxMessage], bool]] = {}
+            held: dict[datetime, list[int]] = {}
+            for channel_id, channel_messages in grouped.items():
+                decision, until = self.bursts.admit(channel_id, len(channel_messages), now)
+                if decision == HOLD:
+                    held.setdefault(until, []).extend(message.id for message in channel_messages)
+                else:
+                    by_channel[channel_id] = (channel_messages, decision == AGGREGATE)
+            for until, ids in held.items():
+                await outbox_repo.defer(ids, until)
+                self.stats.held += len(ids)
+
+            channel_repo = ChannelRepository(session)
+            user_repo = UserRepository(session)
+            targets: dict[int, tuple[ChannelInfo | None, I18n | None]] = {}
+            for channel_id in by_channel:
+                channel = await channel_repo.get_info(channel_id)
+                i18n = None
+                if channel and channel.notify_chat_id:
+                    i18n = I18n(await user_repo.get_language(channel.admin_user_id))
+                targets[channel_id] = (channel, i18n)
+            # Nothing stays open while waiting on Telegram
+            await session.commit()
+
+            renewal = asyncio.create_task(
+                self._renew_lease(
+                    [
+                        message.id
+                        for channel_messages, _ in by_channel.values()
+                        for message in channel_messages
+                    ]
+                )
+            )
+            try:
+                results = await asyncio.gather(
+                    *(
+                        self._deliver(*targets[channel_id], channel_messages, aggregate)
+                        for channel_id, (channel_messages, aggregate) in by_channel.items()
+                    )
+                )
+            finally:
+                renewal.cancel()
+                with suppress(asyncio.CancelledError):
+                    await renewal
+
+            sent: list[int] = []
+            failed: list[int] = []
+            for delivered, undelivered in results:
+                sent.extend(delivered)
+                failed.extend(undelivered)
+            await outbox_repo.mark_sent(sent)
+            await outbox_repo.reschedule(
+                failed,
+                "send failed",
+                self.base_delay,
+                self.max_delay,
+                self.max_attempts,
+            )
+            self.stats.sent += len(sent)
+            self.stats.retried += len(failed)
+            return len(messages)
+
+    async def _renew_lease(self, ids: list[int]) -> None:
+        """Extend the lease of ``ids`` every third of it until cancelled."""
+        while True:
+            await asyncio.sleep(self.lease.total_seconds() / 3)
+            try:
+                async with async_session_maker() as session:
+                    await OutboxRepository(session).extend_lease(ids, self.lease)
+            except Exception as e:
+                logger.warning(f"Outbox lease renewal failed: {e}")
+
+    async def _deliver(
+        self,
+        channel: ChannelInfo | None,
+        i18n: I18n | None,
+        messages: list[OutboxMessage],
+        aggregate: bool,
+    ) -> tuple[list[int], list[int]]:
+        """Send a channel's notifications. Returns (sent ids, failed ids)."""
+        ids = [message.id for message in messages]
+        if channel is None or not channel.notify_chat_id:
+            # Nowhere to deliver; nothing to retry
+            return ids, []
+
+        notifier = NotificationService(self._bot, i18n)
+        events = [_payload_event(message) for message in messages]
+        if aggregate and len(events) > 1:
+            self.stats.bursts += 1
+            delivered = await notifier.notify_member_events_burst(
+                events, channel, self.max_names, wait=True
+            )
+            return (ids, []) if delivered else ([], ids)
+
+        outcomes = await asyncio.gather(
+            *(notifier.notify_member_event(event, channel, wait=True) for event in events)
+        )
+        sent = [message_id for message_id, ok in zip(ids, outcomes) if ok]
+        failed = [message_id for message_id, ok in zip(ids, outcomes) if not ok]
+        return sent, failed
+
+    async def _purge(self) -> None:
+        now = datetime.now(timezone.utc)
+        if now - self._purged_at < self.purge_interval:
+            return
+        self._purged_at = now
+        async with async_session_maker() as session:
+            purged = await OutboxRepository(session).purge_finished(now - self.retention)
+        if purged:
+            logger.debug(f"Purged {purged} sent or failed outbox messages")
+
+
+outbox_worker = OutboxWorker(
+    poll_interval_ms=settings.outbox_poll_interval_ms,
+    batch_size=settings.outbox_batch_size,
+    lease_seconds=settings.outbox_lease_seconds,
+    max_attempts=settings.outbox_max_attempts,
+    retention_hours=settings.outbox_retention_hours,
+    burst_threshold=settings.notify_burst_threshold,
+    burst_window=settings.notify_burst_window_seconds,
+    max_names=settings.notify_burst_max_names,
+)
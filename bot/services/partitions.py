@@ -0,0 +1,42 @@
+"""Housekeeping for the monthly event partitions."""
+
+import asyncio
+
+from loguru import logger
+
+from bot.config import settings
+from database import async_session_maker
+from database.repositories import EventPartitionRepository
+from database.repositories.event_partition import month_start, retention_start
+
+
+async def ensure_event_partitions() -> None:
+    """Create the current and upcoming monthly partitions of the event tables."""
+    async with async_session_maker() as session:
+        created = await EventPartitionRepository(session).ensure(settings.event_partitions_ahead)
+    if created:
+        logger.info(f"Created event partitions: {', '.join(created)}")
+    moved = sum(created.values())
+    if moved:
+        logger.warning(f"Moved {moved} event rows from the default partitions into new months")
+
+
+async def run_partition_maintenance(interval_seconds: int = 3600) -> None:
+    """Keep partitions created ahead of time and drop those past the retention."""
+    while True:
+        try:
+            await ensure_event_partitions()
+            kept_since = retention_start()
+            if kept_since is not None:
+                async with async_session_maker() as session:
+                    partition_repo = EventPartitionRepository(session)
+                    dropped = await partition_repo.drop_before(month_start(kept_since))
+                    purged = await partition_repo.purge_default(month_start(kept_since))
+                if dropped:
+                    logger.info(f"Dropped expired event partitions: {', '.join(dropped)}")
+                if purged:
+                    logger.info(f"Deleted {purged} expired rows from the default event partitions")
+        except Exception as e:
+            logger.error(f"Partition maintenance error: {e}")
+
+        await asyncio.sleep(interval_seconds)
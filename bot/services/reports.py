@@ -4,7 +4,7 @@ import asyncio
 import json
 import os
 from dataclasses import asdict, dataclass
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from typing import Any
 
 import gspread
@@ -16,7 +16,7 @@ from aiogram.types import BufferedInputFile
 
 from bot.config import settings
 from bot.i18n import I18n
-from database.models import Channel, MemberEvent
+from database.models import Channel, ChannelMemberSnapshot, MemberEvent
 from database.repositories import EventRepository, MemberRepository
 
 
@@ -30,6 +30,7 @@ class ReportData:
     member_counts: dict[str, int]
     stats: dict[str, int]
     events: list[MemberEvent]
+    history: list[ChannelMemberSnapshot]
 
 
 class ReportsService:
@@ -50,6 +51,8 @@ class ReportsService:
             channel.id,
             limit=500,
         )
+        since = (datetime.now(timezone.utc) - timedelta(days=days)).date() if days > 0 else None
+        history = await self.member_repo.snapshots.get_history(channel.id, since)
         return ReportData(
             channel_id=channel.id,
             channel_title=channel.title,
@@ -57,6 +60,7 @@ class ReportsService:
             member_counts=member_counts,
             stats=stats,
             events=events,
+            history=history,
         )
 
     async def export_pdf(
@@ -80,6 +84,12 @@ class ReportsService:
         pdf.cell(0, 10, txt=f"Kicks: {data.stats.get('kick', 0)}", ln=1)
         pdf.cell(0, 10, txt=f"Bans: {data.stats.get('ban', 0)}", ln=1)
 
+        if len(data.history) > 1:
+            pdf.ln(5)
+            self._set_unicode_font(pdf, bold=True, size=12)
+            pdf.cell(0, 10, txt="Subscribers by day:", ln=1)
+            self._draw_history(pdf, data.history)
+
         pdf.ln(5)
         self._set_unicode_font(pdf, bold=True, size=12)
         pdf.cell(0, 10, txt="Recent events:", ln=1)
@@ -108,6 +118,10 @@ class ReportsService:
             "period_days": data.period_days,
             "member_counts": data.member_counts,
             "stats": data.stats,
+            "history": [
+                {"day": snapshot.day.isoformat(), **snapshot.as_dict()}
+                for snapshot in data.history
+            ],
             "events": [
                 {
                     "id": ev.id,
@@ -218,6 +232,33 @@ class ReportsService:
 
         return await asyncio.to_thread(_sync)
 
+    def _draw_history(
+        self,
+        pdf: FPDF,
+        history: list[ChannelMemberSnapshot],
+        height: float = 50,
+    ) -> None:
+        """Line chart of active members per day below the current position."""
+        self._set_unicode_font(pdf, size=8)
+        values = [snapshot.member_count for snapshot in history]
+        low, high = min(values), max(values)
+        span = (high - low) or 1
+        left, top = pdf.l_margin + 12, pdf.get_y()
+        width = pdf.epw - 12
+        step = width / (len(values) - 1)
+        points = [
+            (left + index * step, top + height - (value - low) / span * height)
+            for index, value in enumerate(values)
+        ]
+        pdf.rect(left, top, width, height)
+        pdf.polyline(points)
+        pdf.text(pdf.l_margin, top + 3, str(high))
+        pdf.text(pdf.l_margin, top + height, str(low))
+        pdf.text(left, top + height + 4, history[0].day.isoformat())
+        last_day = history[-1].day.isoformat()
+        pdf.text(left + width - pdf.get_string_width(last_day), top + height + 4, last_day)
+        pdf.set_y(top + height + 6)
+
     def _set_unicode_font(self, pdf: FPDF, bold: bool = False, size: int = 12) -> None:
         """Set a Unicode-capable font if available, fallback to Helvetica."""
         font_dir = "/usr/share/fonts/truetype/dejavu"
@@ -0,0 +1,27 @@
+"""Housekeeping for member event rollups."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from loguru import logger
+
+from bot.config import settings
+from database import async_session_maker
+from database.repositories import EventRollupRepository
+
+
+async def run_rollup_maintenance(interval_seconds: int = 3600) -> None:
+    """Periodically drop minute rollups older than the retention period."""
+    while True:
+        try:
+            before = datetime.now(timezone.utc) - timedelta(
+                hours=settings.rollup_minute_retention_hours
+            )
+            async with async_session_maker() as session:
+                purged = await EventRollupRepository(session).purge_minutes(before)
+            if purged:
+                logger.debug(f"Purged {purged} minute rollup rows")
+        except Exception as e:
+            logger.error(f"Rollup maintenance error: {e}")
+
+        await asyncio.sleep(interval_seconds)
@@ -0,0 +1,45 @@
+"""Daily member count snapshots."""
+
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+
+from loguru import logger
+
+from database import async_session_maker
+from database.repositories import MemberSnapshotRepository
+
+
+async def run_snapshot_worker(
+    interval_seconds: int = 600,
+    max_catch_up_days: int = 31,
+) -> None:
+    """Write the previous day's member snapshot of every channel once a day.
+
+    Days missed while no replica was running are written on the next run
+    (up to ``max_catch_up_days``); an empty history is backfilled from events.
+    """
+    done: date | None = None
+    while True:
+        yesterday = datetime.now(timezone.utc).date() - timedelta(days=1)
+        if done != yesterday:
+            try:
+                async with async_session_maker() as session:
+                    snapshot_repo = MemberSnapshotRepository(session)
+                    latest = await snapshot_repo.latest_day()
+                    if latest is None:
+                        written = await snapshot_repo.backfill(until=yesterday)
+                        logger.info(f"Member snapshots backfilled: {written} rows")
+                    else:
+                        day = max(
+                            latest + timedelta(days=1),
+                            yesterday - timedelta(days=max_catch_up_days),
+                        )
+                        while day <= yesterday:
+                            written = await snapshot_repo.take(day)
+                            logger.info(f"Member snapshot for {day}: {written} channels")
+                            day += timedelta(days=1)
+                done = yesterday
+            except Exception as e:
+                logger.error(f"Snapshot worker error: {e}")
+
+        await asyncio.sleep(interval_seconds)
@@ -0,0 +1,168 @@
+"""Supervisor mode: a front process routing updates to channel-partitioned workers."""
+
+import asyncio
+import multiprocessing
+from collections.abc import Awaitable, Callable
+from contextlib import suppress
+from multiprocessing.process import BaseProcess
+from multiprocessing.queues import Queue
+from typing import Any
+
+from loguru import logger
+
+from aiogram import BaseMiddleware, Dispatcher
+from aiogram.types import TelegramObject, Update
+
+from bot.app import ALLOWED_UPDATES, on_shutdown, on_startup, setup_database, setup_logging
+from bot.config import settings
+from bot.loader import bot, dp
+from bot.middlewares.lanes import get_update_chat_id
+from bot.partitioning import local_partition, partition_for
+from bot.webhook import run_webhook
+from database import engine
+
+# Updates without a chat (rare) all go to one worker
+DEFAULT_PARTITION = 0
+
+
+class PartitionRouterMiddleware(BaseMiddleware):
+    """Front-process outer middleware forwarding each update to its owning worker.
+
+    Updates are put on the queue synchronously, in arrival order, so each
+    worker sees the updates of a chat in the order Telegram sent them.
+    """
+
+    def __init__(self, queues: list[Queue]) -> None:
+        self.queues = queues
+        self.routed = [0] * len(queues)
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        if not isinstance(event, Update):
+            return await handler(event, data)
+        chat_id = get_update_chat_id(event)
+        index = (
+            partition_for(chat_id, len(self.queues))
+            if chat_id is not None
+            else DEFAULT_PARTITION
+        )
+        self.queues[index].put(
+            event.model_dump(mode="json", by_alias=True, exclude_none=True)
+        )
+        self.routed[index] += 1
+
+
+def worker_entry(index: int, count: int, queue: Queue) -> None:
+    """Process target of a worker (must be importable for the spawn start method)."""
+    with suppress(KeyboardInterrupt):
+        asyncio.run(_run_worker(index, count, queue))
+
+
+async def _run_worker(index: int, count: int, queue: Queue) -> None:
+    local_partition.assign(index, count)
+    setup_logging(f"worker-{index}")
+    logger.info(f"Worker {index}/{count} starting")
+    await on_startup(schema_ready=True)
+
+    loop = asyncio.get_running_loop()
+    tasks: set[asyncio.Task] = set()
+    try:
+        while True:
+            update = await loop.run_in_executor(None, queue.get)
+            if update is None:
+                break
+            # Tasks start in creation order, so per-chat lanes keep update order
+            task = asyncio.create_task(dp.feed_raw_update(bot, update))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+    finally:
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        await on_shutdown()
+        logger.info(f"Worker {index}/{count} stopped")
+
+
+class Supervisor:
+    """Starts ``count`` worker processes and restarts any that die."""
+
+    check_interval = 2.0
+
+    def __init__(self, count: int) -> None:
+        self.count = count
+        self._context = multiprocessing.get_context("spawn")
+        self.queues: list[Queue] = [self._context.Queue() for _ in range(count)]
+        self._processes: list[BaseProcess | None] = [None] * count
+
+    def start(self) -> None:
+        for index in range(self.count):
+            self._spawn(index)
+
+    def _spawn(self, index: int) -> None:
+        process = self._context.Process(
+            target=worker_entry,
+            args=(index, self.count, self.queues[index]),
+            name=f"worker-{index}",
+        )
+        process.start()
+        self._processes[index] = process
+        logger.info(f"Worker {index} started (pid {process.pid})")
+
+    async def watch(self) -> None:
+        """Restart crashed workers; their queued updates are kept."""
+        while True:
+            await asyncio.sleep(self.check_interval)
+            for index, process in enumerate(self._processes):
+                if process is not None and not process.is_alive():
+                    logger.error(
+                        f"Worker {index} exited with code {process.exitcode}; restarting"
+                    )
+                    self._spawn(index)
+
+    async def stop(self, timeout: float = 30.0) -> None:
+        """Ask workers to finish their queues, then wait for them."""
+        for queue in self.queues:
+            queue.put(None)
+        loop = asyncio.get_running_loop()
+        for index, process in enumerate(self._processes):
+            if process is None:
+                continue
+            await loop.run_in_executor(None, process.join, timeout)
+            if process.is_alive():
+                logger.warning(f"Worker {index} did not stop in time; terminating")
+                process.terminate()
+        logger.info("All workers stopped")
+
+
+async def run_supervisor(count: int) -> None:
+    """Run the front process (polling or webhook) in front of ``count`` workers."""
+    setup_logging("supervisor")
+    # Schema setup runs once here instead of racing in every worker
+    await setup_database()
+    await engine.dispose()
+    supervisor = Supervisor(count)
+    supervisor.start()
+    watcher = asyncio.create_task(supervisor.watch())
+
+    # The front only routes; all handlers run in the workers
+    front = Dispatcher()
+    router = PartitionRouterMiddleware(supervisor.queues)
+    front.update.outer_middleware(router)
+
+    try:
+        if settings.bot_mode == "webhook":
+            logger.info(f"Supervisor receiving updates via webhook for {count} workers")
+            await run_webhook(front, bot, ALLOWED_UPDATES)
+        else:
+            logger.info(f"Supervisor polling updates for {count} workers")
+            await front.start_polling(bot, allowed_updates=ALLOWED_UPDATES)
+    finally:
+        watcher.cancel()
+        with suppress(asyncio.CancelledError):
+            await watcher
+        logger.info(f"Updates routed per worker: {router.routed}")
+        await supervisor.stop()
+        await bot.session.close()
@@ -1,14 +1,18 @@
 """Bot utilities."""
 
 from bot.utils.formatting import (
+    format_burst_message,
     format_event_message,
+    format_sparkline,
     format_stats_message,
     format_user_link,
     get_event_emoji,
 )
 
 __all__ = [
+    "format_burst_message",
     "format_event_message",
+    "format_sparkline",
     "format_stats_message",
     "format_user_link",
     "get_event_emoji",
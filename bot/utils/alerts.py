@@ -21,6 +21,7 @@ def format_alerts_summary(
         i18n("alerts.settings.daily", state=_on_off(settings.digest_daily, i18n)),
         i18n("alerts.settings.weekly", state=_on_off(settings.digest_weekly, i18n)),
         i18n("alerts.settings.monthly", state=_on_off(settings.digest_monthly, i18n)),
+        i18n("alerts.settings.digest_time", time=f"{settings.digest_hour:02d}:00", timezone=settings.digest_timezone),
         i18n("alerts.settings.quiet", quiet=quiet),
         i18n("alerts.settings.vips", vips=", ".join(map(str, vip_list)) if vip_list else i18n("alerts.settings.vips_none")),
     ]
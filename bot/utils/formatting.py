@@ -20,6 +20,18 @@ def get_event_emoji(event_type: str) -> str:
     return emojis.get(event_type, "\U0001F4CC")  # pushpin default
 
 
+def format_sparkline(values: list[int]) -> str:
+    """Render a series as unicode block characters, scaled to its own range."""
+    if not values:
+        return ""
+    bars = "\u2581\u2582\u2583\u2584\u2585\u2586\u2587\u2588"
+    low, high = min(values), max(values)
+    if low == high:
+        return bars[len(bars) // 2] * len(values)
+    scale = (len(bars) - 1) / (high - low)
+    return "".join(bars[round((value - low) * scale)] for value in values)
+
+
 def format_user_link(
     user_id: int,
     first_name: str | None = None,
@@ -80,6 +92,57 @@ def format_event_message(
     return message
 
 
+def format_burst_message(
+    events: list[MemberEvent],
+    channel_title: str,
+    i18n: I18n | None = None,
+    max_names: int = 10,
+) -> str:
+    """Format one aggregated notification for a burst of member events."""
+    counts: dict[str, int] = {}
+    for event in events:
+        kind = event.event_type if event.event_type in ("join", "leave", "kick", "ban") else "other"
+        counts[kind] = counts.get(kind, 0) + 1
+
+    if i18n:
+        summary = ", ".join(
+            i18n(f"events.burst_{kind}", count=count) for kind, count in counts.items()
+        )
+        message = i18n("events.burst_title", title=escape(channel_title), summary=summary)
+    else:
+        fallback = {
+            "join": "+{count} joined",
+            "leave": "-{count} left",
+            "kick": "{count} removed",
+            "ban": "{count} banned",
+            "other": "{count} other changes",
+        }
+        summary = ", ".join(
+            fallback[kind].format(count=count) for kind, count in counts.items()
+        )
+        message = f"\U0001F4E3 <b>{escape(channel_title)}</b>: {summary}"
+
+    lines = [
+        f"{get_event_emoji(event.event_type)} "
+        + format_user_link(
+            event.user_id,
+            event.first_name,
+            event.last_name,
+            event.username,
+            i18n,
+        )
+        for event in events[:max_names]
+    ]
+    message += "\n\n" + "\n".join(lines)
+
+    hidden = len(events) - max_names
+    if hidden > 0:
+        more = i18n("events.burst_more", count=hidden) if i18n else f"...and {hidden} more"
+        message += f"\n<i>{more}</i>"
+
+    return message
+
+
 def format_stats_message(
     channel_title: str,
     stats: dict[str, int],
@@ -0,0 +1,105 @@
+"""Webhook ingestion on aiogram's aiohttp integration."""
+
+import asyncio
+from typing import Any
+
+from aiohttp import web
+from loguru import logger
+
+from aiogram import Bot, Dispatcher
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+
+from bot.config import settings
+
+
+class BoundedRequestHandler(SimpleRequestHandler):
+    """Webhook handler that processes at most ``max_in_flight`` updates at once.
+
+    Updates are acknowledged immediately and handled in the background.
+    When the limit is reached the request is answered with 503 and
+    Telegram redelivers the update later.
+    """
+
+    def __init__(
+        self,
+        dispatcher: Dispatcher,
+        bot: Bot,
+        secret_token: str | None = None,
+        max_in_flight: int = 200,
+    ) -> None:
+        super().__init__(
+            dispatcher=dispatcher,
+            bot=bot,
+            handle_in_background=True,
+            secret_token=secret_token,
+        )
+        self.max_in_flight = max(1, max_in_flight)
+        self.rejected = 0
+        self._in_flight = 0
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    async def _handle_request_background(self, bot: Bot, request: web.Request) -> web.Response:
+        if self._in_flight >= self.max_in_flight:
+            self.rejected += 1
+            return web.Response(status=503, text="Too many updates in flight")
+        # Taken before the update is read, so concurrent requests cannot overshoot the limit
+        self._in_flight += 1
+        try:
+            return await super()._handle_request_background(bot, request)
+        except BaseException:
+            self._in_flight -= 1
+            raise
+
+    async def _background_feed_update(self, bot: Bot, update: dict[str, Any]) -> None:
+        try:
+            await super()._background_feed_update(bot, update)
+        finally:
+            self._in_flight -= 1
+
+
+async def run_webhook(dp: Dispatcher, bot: Bot, allowed_updates: list[str]) -> None:
+    """Serve the webhook until cancelled.
+
+    ``setup_application`` ties the dispatcher's startup/shutdown hooks to the
+    aiohttp application. Without ``WEBHOOK_URL`` no webhook is registered
+    with Telegram, which allows local load tests that POST updates directly.
+    """
+    secret = settings.webhook_secret.get_secret_value() if settings.webhook_secret else None
+    app = web.Application()
+    handler = BoundedRequestHandler(
+        dp,
+        bot,
+        secret_token=secret,
+        max_in_flight=settings.webhook_max_in_flight,
+    )
+    handler.register(app, path=settings.webhook_path)
+    setup_application(app, dp, bot=bot)
+
+    if settings.webhook_url:
+        async def register_webhook(_: web.Application) -> None:
+            await bot.set_webhook(
+                url=settings.webhook_url.rstrip("/") + settings.webhook_path,
+                secret_token=secret,
+                allowed_updates=allowed_updates,
+                max_connections=settings.webhook_max_connections,
+            )
+            logger.info(f"Webhook registered at {settings.webhook_url}{settings.webhook_path}")
+
+        app.on_startup.append(register_webhook)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, settings.webhook_host, settings.webhook_port)
+    await site.start()
+    logger.info(
+        f"Webhook server listening on {settings.webhook_host}:{settings.webhook_port}"
+        f"{settings.webhook_path}"
+    )
+    try:
+        await asyncio.Event().wait()
+    finally:
+        logger.info(f"Webhook server stopping ({handler.rejected} requests rejected as busy)")
+        await runner.cleanup()
@@ -1,5 +1,5 @@
 """Database package."""
 
-from database.engine import async_session_maker, engine, init_db
+from database.engine import async_session_maker, engine, init_db, unit_of_work
 
-__all__ = ["async_session_maker", "engine", "init_db"]
+__all__ = ["async_session_maker", "engine", "init_db", "unit_of_work"]
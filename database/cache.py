@@ -0,0 +1,183 @@
+"""In-process caches kept coherent by the repositories."""
+
+import time
+from collections import OrderedDict
+
+from sqlalchemy import inspect
+
+from bot.config import settings
+from bot.partitioning import local_partition
+from database.models import AlertSettings, ChannelInfo
+
+
+class ChannelRegistry:
+    """Bounded LRU map of registered channels, bulk-loaded at startup.
+
+    While every channel fits (``complete``), a miss means the chat is not
+    registered and callers can reject it without querying the database.
+    """
+
+    def __init__(self, max_size: int = 50000) -> None:
+        self.max_size = max_size
+        self.complete = False
+        self._channels: OrderedDict[int, ChannelInfo] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._channels)
+
+    def load(self, channels: list[ChannelInfo]) -> None:
+        """Replace the registry contents with a full channel list."""
+        self._channels = OrderedDict((info.id, info) for info in channels[: self.max_size])
+        self.complete = len(channels) <= self.max_size
+
+    def get(self, channel_id: int) -> ChannelInfo | None:
+        info = self._channels.get(channel_id)
+        if info is not None:
+            self._channels.move_to_end(channel_id)
+        return info
+
+    def is_known_absent(self, channel_id: int) -> bool:
+        """True if the channel is definitely not registered."""
+        return self.complete and channel_id not in self._channels
+
+    def put(self, info: ChannelInfo) -> None:
+        self._channels[info.id] = info
+        self._channels.move_to_end(info.id)
+        if len(self._channels) > self.max_size:
+            self._channels.popitem(last=False)
+            self.complete = False
+
+    def clear(self) -> None:
+        """Forget everything; lookups go to the database until reloaded."""
+        self._channels.clear()
+        self.complete = False
+
+    def discard(self, channel_id: int) -> None:
+        """Forget a channel; the next lookup goes to the database."""
+        if self._channels.pop(channel_id, None) is not None:
+            self.complete = False
+
+
+class LanguageCache:
+    """TTL + LRU cache of user language preferences with hit/miss counters."""
+
+    def __init__(self, max_size: int = 10000, ttl_seconds: float = 600) -> None:
+        self.max_size = max_size
+        self.ttl = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[int, tuple[str, float]] = OrderedDict()
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def get(self, user_id: int) -> str | None:
+        entry = self._entries.get(user_id)
+        if entry is None or entry[1] < time.monotonic():
+            if entry is not None:
+                del self._entries[user_id]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(user_id)
+        self.hits += 1
+        return entry[0]
+
+    def set(self, user_id: int, language: str) -> None:
+        self._entries[user_id] = (language, time.monotonic() + self.ttl)
+        self._entries.move_to_end(user_id)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class AlertSettingsCache:
+    """Write-through TTL + LRU cache of per-channel alert settings.
+
+    Stores detached copies so a cached object is never shared with (or
+    mutated by) a live session. The TTL bounds staleness when an
+    invalidation from another process is missed.
+    """
+
+    def __init__(self, max_size: int = 50000, ttl_seconds: float = 300) -> None:
+        self.max_size = max_size
+        self.ttl = ttl_seconds
+        self._entries: OrderedDict[int, tuple[AlertSettings, float]] = OrderedDict()
+
+    def get(self, channel_id: int) -> AlertSettings | None:
+        entry = self._entries.get(channel_id)
+        if entry is None:
+            return None
+        if entry[1] < time.monotonic():
+            del self._entries[channel_id]
+            return None
+        self._entries.move_to_end(channel_id)
+        return entry[0]
+
+    def put(self, alert_settings: AlertSettings) -> None:
+        values = {
+            attr.key: getattr(alert_settings, attr.key)
+            for attr in inspect(AlertSettings).column_attrs
+        }
+        self._entries[alert_settings.channel_id] = (
+            AlertSettings(**values),
+            time.monotonic() + self.ttl,
+        )
+        self._entries.move_to_end(alert_settings.channel_id)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, channel_id: int) -> None:
+        self._entries.pop(channel_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class MemberCountersCache:
+    """In-memory mirror of ``channel_member_counters`` rows.
+
+    Only channels owned by this process are mirrored; other worker processes
+    read the table instead. Changes made by other replicas arrive over the
+    cache bus.
+    """
+
+    def __init__(self, max_size: int = 50000) -> None:
+        self.max_size = max_size
+        self._entries: OrderedDict[int, dict[str, int]] = OrderedDict()
+
+    def get(self, channel_id: int) -> dict[str, int] | None:
+        entry = self._entries.get(channel_id)
+        if entry is None:
+            return None
+        self._entries.move_to_end(channel_id)
+        return dict(entry)
+
+    def put(self, channel_id: int, counts: dict[str, int]) -> None:
+        if not local_partition.owns(channel_id):
+            return
+        self._entries[channel_id] = dict(counts)
+        self._entries.move_to_end(channel_id)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, channel_id: int | None = None) -> None:
+        """Drop one channel, or everything when ``channel_id`` is None."""
+        if channel_id is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(channel_id, None)
+
+
+channel_registry = ChannelRegistry(settings.channel_registry_size)
+language_cache = LanguageCache(settings.language_cache_size, settings.language_cache_ttl_seconds)
+alert_settings_cache = AlertSettingsCache(
+    settings.channel_registry_size, settings.alert_settings_cache_ttl_seconds
+)
+member_counters_cache = MemberCountersCache(settings.channel_registry_size)
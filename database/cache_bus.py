@@ -0,0 +1,182 @@
+"""Cross-process cache invalidation over Postgres LISTEN/NOTIFY."""
+
+import asyncio
+import json
+from collections.abc import Awaitable, Callable
+from contextlib import suppress
+from typing import Any
+from uuid import uuid4
+
+import asyncpg
+from loguru import logger
+from sqlalchemy import ColumnElement, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.cache import (
+    alert_settings_cache,
+    channel_registry,
+    language_cache,
+    member_counters_cache,
+)
+from database.models import ChannelInfo
+
+NOTIFY_CHANNEL = "cache_invalidation"
+
+CHANNEL = "channel"
+ALERT_SETTINGS = "alert_settings"
+LANGUAGE = "language"
+MEMBER_COUNTERS = "member_counters"
+
+
+class CacheBus:
+    """Tells the other processes sharing the database which cached entries changed.
+
+    Those are the supervisor's worker processes and any other replica of the
+    bot. Messages are sent with ``pg_notify`` inside the writing transaction,
+    so they are delivered only if it commits. A no-op until started, which
+    the bot only does when it runs several workers or replicas.
+    """
+
+    reconnect_delay = 1.0
+
+    def __init__(self) -> None:
+        self.enabled = False
+        # Identifies our own messages; pids repeat across hosts and containers
+        self.instance_id = uuid4().hex
+        self._dsn: str | None = None
+        self._reload: Callable[[], Awaitable[None]] | None = None
+        self._held: list[str] | None = None
+        self._task: asyncio.Task | None = None
+        self._listeners: dict[str, list[Callable[[int | None, dict | None], None]]] = {}
+
+    async def start(self, dsn: str, reload: Callable[[], Awaitable[None]] | None = None) -> None:
+        """Start listening; ``dsn`` is a plain ``postgresql://`` URL.
+
+        ``reload`` refills the channel registry after a reconnect, because the
+        notifications missed while disconnected are unknown.
+        """
+        self._dsn = dsn
+        self._reload = reload
+        self.enabled = True
+        if self._task is None:
+            connected = asyncio.get_running_loop().create_future()
+            self._task = asyncio.create_task(self._listen(connected))
+            await connected
+
+    async def stop(self) -> None:
+        self.enabled = False
+        if self._task:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    def subscribe(self, kind: str, callback: Callable[[int | None, dict | None], None]) -> None:
+        """Call ``callback(key, data)`` when another process changes an entry of ``kind``."""
+        self._listeners.setdefault(kind, []).append(callback)
+
+    async def publish(
+        self,
+        session: AsyncSession,
+        kind: str,
+        key: int | None,
+        data: dict[str, Any] | None = None,
+    ) -> None:
+        """Queue an invalidation; Postgres delivers it when the transaction commits."""
+        notification = self.notification(kind, key, data)
+        if notification is not None:
+            await session.execute(select(notification))
+
+    def notification(
+        self,
+        kind: str,
+        key: int | None,
+        data: dict[str, Any] | None = None,
+    ) -> ColumnElement | None:
+        """``pg_notify`` call to embed in another statement (``None`` while not started).
+
+        Postgres sends identical notifications of one transaction only once.
+        """
+        if not self.enabled:
+            return None
+        payload = json.dumps({"sender": self.instance_id, "kind": kind, "key": key, "data": data})
+        return func.pg_notify(NOTIFY_CHANNEL, payload)
+
+    async def _listen(self, connected: asyncio.Future) -> None:
+        reconnecting = False
+        while True:
+            lost = asyncio.Event()
+            connection = None
+            try:
+                connection = await asyncpg.connect(self._dsn)
+                connection.add_termination_listener(lambda _, lost=lost: lost.set())
+                await connection.add_listener(NOTIFY_CHANNEL, self._on_notify)
+                if reconnecting:
+                    await self._refill()
+                if not connected.done():
+                    connected.set_result(None)
+                await lost.wait()
+                logger.warning("Cache bus connection lost; reconnecting")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Cache bus connection failed: {e}")
+                if not connected.done():
+                    connected.set_result(None)
+            finally:
+                if connection is not None and not connection.is_closed():
+                    with suppress(Exception):
+                        await connection.close()
+            # Notifications may have been missed while disconnected
+            self._invalidate_all()
+            reconnecting = True
+            await asyncio.sleep(self.reconnect_delay)
+
+    async def _refill(self) -> None:
+        if self._reload is None:
+            return
+        # Notifications arriving meanwhile are applied on top of the reloaded snapshot
+        self._held = []
+        try:
+            await self._reload()
+        except Exception as e:
+            logger.error(f"Cache bus: channel registry reload failed: {e}")
+        finally:
+            held, self._held = self._held, None
+            for payload in held:
+                self._apply(payload)
+
+    def _on_notify(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        if self._held is not None:
+            self._held.append(payload)
+        else:
+            self._apply(payload)
+
+    def _apply(self, payload: str) -> None:
+        message = json.loads(payload)
+        if message["sender"] == self.instance_id:
+            return
+        kind, key, data = message["kind"], message["key"], message["data"]
+        if kind == CHANNEL:
+            if data is not None:
+                channel_registry.put(ChannelInfo(**data))
+            else:
+                channel_registry.discard(key)
+        elif kind == ALERT_SETTINGS:
+            alert_settings_cache.invalidate(key)
+        elif kind == LANGUAGE:
+            language_cache.invalidate(key)
+        elif kind == MEMBER_COUNTERS:
+            member_counters_cache.invalidate(key)
+        for callback in self._listeners.get(kind, ()):
+            callback(key, data)
+
+    @staticmethod
+    def _invalidate_all() -> None:
+        channel_registry.clear()
+        alert_settings_cache.clear()
+        language_cache.clear()
+        member_counters_cache.invalidate()
+
+
+cache_bus = CacheBus()
@@ -1,6 +1,12 @@
 """Async database engine and session configuration."""
 
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
 
 from bot.config import settings
 
@@ -12,6 +18,11 @@ engine = create_async_engine(
     max_overflow=20,
 )
 
+# Session.info flag checked by repositories to defer their commits
+UNIT_OF_WORK_KEY = "unit_of_work"
+# Session.info list of callbacks to run once the current transaction commits
+AFTER_COMMIT_KEY = "after_commit"
+
 async_session_maker = async_sessionmaker(
     engine,
     class_=AsyncSession,
@@ -20,9 +31,66 @@ async_session_maker = async_sessionmaker(
 )
 
 
+class LazySession:
+    """Proxy that creates the real AsyncSession on first attribute access.
+
+    Lets middlewares hand a session to every handler while updates that never
+    touch the database do not create one (and never check out a connection).
+    """
+
+    def __init__(self, factory: async_sessionmaker[AsyncSession] = async_session_maker) -> None:
+        self._factory = factory
+        self._session: AsyncSession | None = None
+
+    @property
+    def opened(self) -> bool:
+        return self._session is not None
+
+    def __getattr__(self, name: str) -> Any:
+        if self._session is None:
+            self._session = self._factory()
+        return getattr(self._session, name)
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self) -> "LazySession":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.close()
+
+
+@event.listens_for(Session, "after_commit")
+def _run_after_commit_hooks(session: Session) -> None:
+    for callback in session.info.pop(AFTER_COMMIT_KEY, []):
+        callback()
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _drop_after_commit_hooks(session: Session, previous_transaction) -> None:
+    session.info.pop(AFTER_COMMIT_KEY, None)
+
+
 async def init_db() -> None:
     """Initialize database tables."""
     from database.models import Base
 
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+
+
+@asynccontextmanager
+async def unit_of_work(session: AsyncSession) -> AsyncIterator[AsyncSession]:
+    """Stage repository writes and commit them once on exit (rollback on error)."""
+    session.info[UNIT_OF_WORK_KEY] = True
+    try:
+        yield session
+        await session.commit()
+    except BaseException:
+        await session.rollback()
+        raise
+    finally:
+        session.info.pop(UNIT_OF_WORK_KEY, None)
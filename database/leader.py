@@ -0,0 +1,151 @@
+"""Leader election over Postgres advisory locks for singleton background jobs."""
+
+import asyncio
+import hashlib
+from collections.abc import Awaitable, Callable
+from contextlib import suppress
+
+import asyncpg
+from loguru import logger
+
+_HOLDS_LOCK = """
+SELECT EXISTS (
+    SELECT 1 FROM pg_locks
+    WHERE locktype = 'advisory'
+      AND pid = pg_backend_pid()
+      AND classid = $1::bigint::oid
+      AND objid = $2::bigint::oid
+      AND objsubid = 1
+      AND granted
+)
+"""
+
+
+def lock_key(name: str) -> int:
+    """Stable positive 63-bit advisory lock key for a job name."""
+    digest = hashlib.blake2b(name.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") & 0x7FFF_FFFF_FFFF_FFFF
+
+
+class LeaderElection:
+    """Runs a job only in the one process that holds the job's advisory lock.
+
+    Each replica keeps a dedicated connection and retries
+    ``pg_try_advisory_lock`` every ``retry_interval`` seconds. The leader
+    renews its lease every ``renew_interval`` seconds by checking that the
+    connection still holds the lock; if the check fails or times out the job
+    is cancelled. The server ends the session after ``lease_seconds`` without
+    a renewal (``idle_session_timeout``), which releases the lock even when
+    the leader is cut off, so a standby takes over within
+    ``lease_seconds + retry_interval``. Keep ``2 * renew_interval`` below
+    ``lease_seconds`` so a stale leader stops before that happens.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        renew_interval: float = 5.0,
+        retry_interval: float = 2.0,
+        lease_seconds: float = 15.0,
+    ) -> None:
+        self.name = name
+        self.key = lock_key(name)
+        self.renew_interval = renew_interval
+        self.retry_interval = retry_interval
+        self.lease_seconds = lease_seconds
+        self.is_leader = False
+        self.terms = 0
+        self._dsn: str | None = None
+        self._job_factory: Callable[[], Awaitable[None]] | None = None
+        self._task: asyncio.Task | None = None
+
+    def start(self, dsn: str, job_factory: Callable[[], Awaitable[None]]) -> None:
+        """Campaign for leadership; ``job_factory()`` runs while it is held.
+
+        ``dsn`` is a plain ``postgresql://`` URL.
+        """
+        self._dsn = dsn
+        self._job_factory = job_factory
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Cancel the job (if leading) and release the lock."""
+        if self._task:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(
+                    self._dsn,
+                    server_settings={
+                        "idle_session_timeout": str(int(self.lease_seconds * 1000)),
+                        "application_name": f"leader:{self.name}",
+                    },
+                )
+                lost = asyncio.Event()
+                connection.add_termination_listener(lambda _, lost=lost: lost.set())
+                while not await connection.fetchval(
+                    "SELECT pg_try_advisory_lock($1)", self.key
+                ):
+                    await asyncio.sleep(self.retry_interval)
+                await self._lead(connection, lost)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Leader election '{self.name}' error: {e}")
+            finally:
+                # Closing the session releases the lock
+                if connection is not None and not connection.is_closed():
+                    with suppress(Exception):
+                        await connection.close()
+            await asyncio.sleep(self.retry_interval)
+
+    async def _lead(self, connection: asyncpg.Connection, lost: asyncio.Event) -> None:
+        self.is_leader = True
+        self.terms += 1
+        logger.info(f"Acquired leadership of '{self.name}'")
+        job = asyncio.create_task(self._job_factory())
+        lost_wait = asyncio.create_task(lost.wait())
+        try:
+            while True:
+                done, _ = await asyncio.wait(
+                    {job, lost_wait},
+                    timeout=self.renew_interval,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if job in done:
+                    if not job.cancelled() and job.exception():
+                        logger.error(f"Leader job '{self.name}' failed: {job.exception()}")
+                    return
+                if lost_wait in done:
+                    logger.warning(f"Lost leadership of '{self.name}': connection closed")
+                    return
+                if not await self._renew(connection):
+                    logger.warning(f"Lost leadership of '{self.name}': lease not renewed")
+                    return
+        finally:
+            self.is_leader = False
+            for task in (job, lost_wait):
+                task.cancel()
+            with suppress(asyncio.CancelledError, Exception):
+                await job
+            with suppress(asyncio.CancelledError):
+                await lost_wait
+
+    async def _renew(self, connection: asyncpg.Connection) -> bool:
+        try:
+            return await asyncio.wait_for(
+                connection.fetchval(_HOLDS_LOCK, self.key >> 32, self.key & 0xFFFF_FFFF),
+                self.renew_interval,
+            )
+        except asyncio.TimeoutError:
+            return False
+        except asyncpg.PostgresError as e:
+            logger.error(f"Leader lease renewal for '{self.name}' failed: {e}")
+            return False
@@ -1,12 +1,16 @@
 """Database models."""
 
 from database.models.base import Base
-from database.models.channel import Channel
+from database.models.channel import Channel, ChannelInfo
 from database.models.event import MemberEvent
 from database.models.member import Member
 from database.models.message_event import MessageEvent
 from database.models.user import User
 from database.models.alert_settings import AlertSettings
 from database.models.google_settings import GoogleSettings
+from database.models.member_counters import ChannelMemberCounters
+from database.models.outbox import OutboxMessage
+from database.models.event_rollup import MemberEventsDay, MemberEventsHour, MemberEventsMinute
+from database.models.member_snapshot import ChannelMemberSnapshot
 
-__all__ = ["Base", "Channel", "Member", "MemberEvent", "MessageEvent", "User", "AlertSettings", "GoogleSettings"]
+__all__ = ["Base", "Channel", "ChannelInfo", "Member", "MemberEvent", "MessageEvent", "User", "AlertSettings", "GoogleSettings", "ChannelMemberCounters", "OutboxMessage", "MemberEventsMinute", "MemberEventsHour", "MemberEventsDay", "ChannelMemberSnapshot"]
@@ -2,7 +2,7 @@
 
 from datetime import datetime
 
-from sqlalchemy import BigInteger, Boolean, DateTime, Float, ForeignKey, Integer, Text
+from sqlalchemy import BigInteger, Boolean, DateTime, Float, ForeignKey, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from database.models.base import Base, TimestampMixin
@@ -26,6 +26,8 @@ class AlertSettings(Base, TimestampMixin):
     digest_daily: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
     digest_weekly: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
     digest_monthly: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
+    digest_hour: Mapped[int] = mapped_column(Integer, default=9, nullable=False)  # 0-23, local time
+    digest_timezone: Mapped[str] = mapped_column(String(64), default="UTC", nullable=False)
     quiet_hours_start: Mapped[int] = mapped_column(Integer, default=0, nullable=False)  # 0-23
     quiet_hours_end: Mapped[int] = mapped_column(Integer, default=0, nullable=False)  # 0-23
     churn_percent_threshold: Mapped[float] = mapped_column(Float, default=5.0, nullable=False)
@@ -1,6 +1,9 @@
 """Channel model for tracking monitored channels."""
 
-from sqlalchemy import BigInteger, Boolean, String
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Boolean, DateTime, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from database.models.base import Base, TimestampMixin
@@ -17,29 +20,45 @@ class Channel(Base, TimestampMixin):
     admin_user_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
     notify_chat_id: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
+    # Time of the newest member event; maintained on insert so that analytics
+    # can skip channels without recent activity
+    last_event_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
-    # Relationships
+    # Relationships. Never loaded implicitly: a channel's member list and event
+    # history can be huge, so callers must request them with loader options.
     members: Mapped[list["Member"]] = relationship(  # noqa: F821
         "Member",
         back_populates="channel",
-        lazy="selectin",
+        lazy="raise",
     )
     member_events: Mapped[list["MemberEvent"]] = relationship(  # noqa: F821
         "MemberEvent",
         back_populates="channel",
-        lazy="selectin",
+        lazy="raise",
     )
     message_events: Mapped[list["MessageEvent"]] = relationship(  # noqa: F821
         "MessageEvent",
         back_populates="channel",
-        lazy="selectin",
+        lazy="raise",
     )
     alert_settings: Mapped["AlertSettings"] = relationship(  # noqa: F821
         "AlertSettings",
         back_populates="channel",
         uselist=False,
-        lazy="selectin",
+        lazy="raise",
     )
 
     def __repr__(self) -> str:
         return f"<Channel(id={self.id}, title='{self.title}')>"
+
+
+@dataclass(frozen=True, slots=True)
+class ChannelInfo:
+    """Lean read-only projection of a channel used on the update hot path."""
+
+    id: int
+    title: str
+    username: str | None
+    admin_user_id: int
+    notify_chat_id: int | None
+    is_active: bool
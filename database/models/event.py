@@ -1,6 +1,8 @@
 """Member event model for tracking join/leave events."""
 
-from sqlalchemy import BigInteger, ForeignKey, Index, String
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Index, String, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from database.models.base import Base, TimestampMixin
@@ -12,6 +14,12 @@ class MemberEvent(Base, TimestampMixin):
     __tablename__ = "member_events"
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    # Partition key; part of every unique key of the table
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        primary_key=True,
+    )
     channel_id: Mapped[int] = mapped_column(
         BigInteger,
         ForeignKey("channels.id", ondelete="CASCADE"),
@@ -24,16 +32,25 @@ class MemberEvent(Base, TimestampMixin):
     event_type: Mapped[str] = mapped_column(String(50), nullable=False)
     old_status: Mapped[str | None] = mapped_column(String(50), nullable=True)
     new_status: Mapped[str] = mapped_column(String(50), nullable=False)
+    # Stored member status the event replaced (NULL for a first-seen member);
+    # member counters moved from this status, not from old_status
+    previous_status: Mapped[str | None] = mapped_column(String(50), nullable=True)
     inviter_id: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    # Natural key of the source update; replays collide on it and are skipped
+    dedup_key: Mapped[str | None] = mapped_column(String(255), nullable=True)
 
     # Relationships
     channel: Mapped["Channel"] = relationship("Channel", back_populates="member_events")  # noqa: F821
 
     __table_args__ = (
-        Index("ix_member_events_channel", "channel_id"),
+        Index("ix_member_events_channel_created", "channel_id", "created_at"),
         Index("ix_member_events_user", "user_id"),
         Index("ix_member_events_type", "event_type"),
         Index("ix_member_events_created", "created_at"),
+        # Replays carry the original update date, so they still collide
+        Index("ix_member_events_dedup", "dedup_key", "created_at", unique=True),
+        # Monthly partitions are managed by EventPartitionRepository
+        {"postgresql_partition_by": "RANGE (created_at)"},
     )
 
     @property
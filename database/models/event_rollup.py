@@ -0,0 +1,56 @@
+"""Per-channel member event counts rolled up by minute, hour and day."""
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from database.models.base import Base
+
+# Event type -> counter column; other types are counted in ``others``
+ROLLUP_COLUMNS = {
+    "join": "joins",
+    "leave": "leaves",
+    "kick": "kicks",
+    "ban": "bans",
+    "unban": "unbans",
+}
+OTHER_COLUMN = "others"
+OTHER_EVENT_TYPE = "status_change"
+COUNT_COLUMNS = (*ROLLUP_COLUMNS.values(), OTHER_COLUMN)
+
+
+class EventRollupMixin:
+    """Counts of one channel's member events within one bucket."""
+
+    channel_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey("channels.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    # Start of the bucket (UTC)
+    bucket: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    joins: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    leaves: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    kicks: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    bans: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    unbans: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    others: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+
+class MemberEventsMinute(EventRollupMixin, Base):
+    """Member event counts per minute (kept for a limited time)."""
+
+    __tablename__ = "member_events_minute"
+
+
+class MemberEventsHour(EventRollupMixin, Base):
+    """Member event counts per hour."""
+
+    __tablename__ = "member_events_hour"
+
+
+class MemberEventsDay(EventRollupMixin, Base):
+    """Member event counts per day."""
+
+    __tablename__ = "member_events_day"
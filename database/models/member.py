@@ -24,6 +24,8 @@ class Member(Base, TimestampMixin):
     first_name: Mapped[str | None] = mapped_column(String(255), nullable=True)
     last_name: Mapped[str | None] = mapped_column(String(255), nullable=True)
     status: Mapped[str] = mapped_column(String(50), default="member", nullable=False)
+    # Status before the last transition (NULL until the member changes status)
+    previous_status: Mapped[str | None] = mapped_column(String(50), nullable=True)
     joined_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     left_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
@@ -0,0 +1,37 @@
+"""Per-channel member counters maintained on every status transition."""
+
+from sqlalchemy import BigInteger, ForeignKey, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from database.models.base import Base, TimestampMixin
+
+# Member status -> counter column
+COUNTER_COLUMNS = {
+    "member": "member_count",
+    "left": "left_count",
+    "kicked": "kicked_count",
+    "banned": "banned_count",
+}
+
+
+class ChannelMemberCounters(Base, TimestampMixin):
+    """Number of members per status, adjusted with each member upsert."""
+
+    __tablename__ = "channel_member_counters"
+
+    channel_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey("channels.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    member_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    left_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    kicked_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    banned_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+    def as_dict(self) -> dict[str, int]:
+        """Counts keyed by member status, same shape as a GROUP BY status."""
+        return {status: getattr(self, column) for status, column in COUNTER_COLUMNS.items()}
+
+    def __repr__(self) -> str:
+        return f"<ChannelMemberCounters(channel_id={self.channel_id}, member={self.member_count})>"
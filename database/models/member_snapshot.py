@@ -0,0 +1,36 @@
+"""Daily per-channel member counts kept as history."""
+
+from datetime import date
+
+from sqlalchemy import BigInteger, Date, ForeignKey, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from database.models.base import Base
+from database.models.member_counters import COUNTER_COLUMNS
+
+
+class ChannelMemberSnapshot(Base):
+    """Member counts per status at the end of one day (UTC)."""
+
+    __tablename__ = "channel_member_snapshots"
+
+    channel_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey("channels.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    member_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    left_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    kicked_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    banned_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+    def as_dict(self) -> dict[str, int]:
+        """Counts keyed by member status, same shape as ``count_by_status``."""
+        return {status: getattr(self, column) for status, column in COUNTER_COLUMNS.items()}
+
+    def __repr__(self) -> str:
+        return (
+            f"<ChannelMemberSnapshot(channel_id={self.channel_id}, day={self.day}, "
+            f"member={self.member_count})>"
+        )
@@ -1,6 +1,8 @@
 """Message event model for tracking comments, reactions, etc."""
 
-from sqlalchemy import BigInteger, ForeignKey, Index, String, Text
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Index, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from database.models.base import Base, TimestampMixin
@@ -12,6 +14,12 @@ class MessageEvent(Base, TimestampMixin):
     __tablename__ = "message_events"
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    # Partition key; part of every unique key of the table
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        primary_key=True,
+    )
     channel_id: Mapped[int] = mapped_column(
         BigInteger,
         ForeignKey("channels.id", ondelete="CASCADE"),
@@ -24,15 +32,21 @@ class MessageEvent(Base, TimestampMixin):
     message_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
     event_type: Mapped[str] = mapped_column(String(50), nullable=False)
     content_preview: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Natural key of the source update; replays collide on it and are skipped
+    dedup_key: Mapped[str | None] = mapped_column(String(255), nullable=True)
 
     # Relationships
     channel: Mapped["Channel"] = relationship("Channel", back_populates="message_events")  # noqa: F821
 
     __table_args__ = (
-        Index("ix_message_events_channel", "channel_id"),
+        Index("ix_message_events_channel_created", "channel_id", "created_at"),
         Index("ix_message_events_user", "user_id"),
         Index("ix_message_events_type", "event_type"),
         Index("ix_message_events_created", "created_at"),
+        # Replays carry the original update date, so they still collide
+        Index("ix_message_events_dedup", "dedup_key", "created_at", unique=True),
+        # Monthly partitions are managed by EventPartitionRepository
+        {"postgresql_partition_by": "RANGE (created_at)"},
     )
 
     @property
@@ -1,10 +1,15 @@
 """Database repositories."""
 
+from database.repositories.base import BaseRepository
 from database.repositories.channel import ChannelRepository
 from database.repositories.event import EventRepository
+from database.repositories.event_partition import EventPartitionRepository
+from database.repositories.event_rollup import EventRollupRepository
 from database.repositories.member import MemberRepository
+from database.repositories.member_snapshot import MemberSnapshotRepository
 from database.repositories.alert_settings import AlertSettingsRepository
 from database.repositories.google_settings import GoogleSettingsRepository
 from database.repositories.user import UserRepository
+from database.repositories.outbox import OutboxRepository
 
-__all__ = ["ChannelRepository", "MemberRepository", "EventRepository", "UserRepository", "AlertSettingsRepository", "GoogleSettingsRepository"]
+__all__ = ["BaseRepository", "ChannelRepository", "MemberRepository", "MemberSnapshotRepository", "EventRepository", "EventPartitionRepository", "EventRollupRepository", "UserRepository", "AlertSettingsRepository", "GoogleSettingsRepository", "OutboxRepository"]
@@ -1,41 +1,95 @@
 """Alert settings repository."""
 
-from sqlalchemy import select, update
-from sqlalchemy.ext.asyncio import AsyncSession
+from collections.abc import Iterable
 
-from database.models import AlertSettings
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
+from database.cache import alert_settings_cache
+from database.cache_bus import ALERT_SETTINGS
+from database.models import AlertSettings, Channel
+from database.repositories.base import BaseRepository
 
-class AlertSettingsRepository:
-    """Repository for alert settings per channel."""
+# Session.info set of channel ids with uncommitted settings writes
+_PENDING_KEY = "alert_settings_pending"
 
-    def __init__(self, session: AsyncSession) -> None:
-        self.session = session
 
-    async def get_by_channel(self, channel_id: int) -> AlertSettings | None:
+class AlertSettingsRepository(BaseRepository):
+    """Repository for alert settings per channel.
+
+    Reads are served from a write-through cache; writes refresh it once they
+    commit. Until then, reads in the writing session go to the database.
+    """
+
+    async def get_by_channel(self, channel_id: int, cached: bool = True) -> AlertSettings | None:
+        """Settings of a channel; ``cached=False`` reads the database (and refreshes the cache)."""
+        pending = channel_id in self.session.info.get(_PENDING_KEY, ())
+        if cached and not pending:
+            hit = alert_settings_cache.get(channel_id)
+            if hit is not None:
+                return hit
         result = await self.session.execute(
             select(AlertSettings).where(AlertSettings.channel_id == channel_id)
         )
-        return result.scalar_one_or_none()
+        settings = result.scalar_one_or_none()
+        if settings is not None and not pending:
+            alert_settings_cache.put(settings)
+        return settings
 
     async def get_or_create(self, channel_id: int) -> AlertSettings:
         settings = await self.get_by_channel(channel_id)
         if settings:
             return settings
-        settings = AlertSettings(channel_id=channel_id)
-        self.session.add(settings)
-        await self.session.commit()
-        await self.session.refresh(settings)
+        result = await self.session.execute(
+            pg_insert(AlertSettings)
+            .values(channel_id=channel_id)
+            .on_conflict_do_nothing(index_elements=[AlertSettings.channel_id])
+            .returning(AlertSettings)
+        )
+        settings = result.scalar_one_or_none()
+        if settings is not None:
+            await self._write_through(settings, None)
+        await self._commit()
+        if settings is None:
+            # Created concurrently by another session
+            settings = await self.get_by_channel(channel_id)
         return settings
 
-    async def update(self, channel_id: int, **kwargs) -> AlertSettings:
+    async def get_for_digests(self) -> list[AlertSettings]:
+        """Settings of active channels with a notification chat.
+
+        Missing rows are created with defaults first, in one statement.
+        """
+        targets = select(Channel.id).where(
+            Channel.is_active == True,  # noqa: E712
+            Channel.notify_chat_id.is_not(None),
+        )
         await self.session.execute(
-            update(AlertSettings)
-            .where(AlertSettings.channel_id == channel_id)
-            .values(**kwargs)
+            pg_insert(AlertSettings)
+            .from_select(["channel_id"], targets)
+            .on_conflict_do_nothing(index_elements=[AlertSettings.channel_id])
         )
-        await self.session.commit()
-        return await self.get_or_create(channel_id)
+        result = await self.session.execute(
+            select(AlertSettings).where(AlertSettings.channel_id.in_(targets))
+        )
+        settings = list(result.scalars().all())
+        await self._commit()
+        return settings
+
+    async def update(self, channel_id: int, **kwargs) -> AlertSettings:
+        """Upsert settings in one statement, creating the row with defaults if missing."""
+        stmt = pg_insert(AlertSettings).values(channel_id=channel_id, **kwargs)
+        result = await self.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[AlertSettings.channel_id],
+                set_={**kwargs, "updated_at": func.now()},
+            ).returning(AlertSettings),
+            execution_options={"populate_existing": True},
+        )
+        settings = result.scalar_one()
+        await self._write_through(settings, kwargs)
+        await self._commit()
+        return settings
 
     async def set_last_milestone(self, channel_id: int, milestone: int) -> AlertSettings:
         return await self.update(channel_id, last_milestone=milestone)
@@ -55,3 +109,21 @@ class AlertSettingsRepository:
 
     async def set_last_monthly_digest(self, channel_id: int, dt) -> AlertSettings:
         return await self.update(channel_id, last_monthly_digest=dt)
+
+    async def _write_through(self, settings: AlertSettings, fields: Iterable[str] | None) -> None:
+        """Mark the channel dirty for this session and refresh the cache on commit.
+
+        Other processes are told which ``fields`` changed (``None``: a new row).
+        """
+        channel_id = settings.channel_id
+        pending = self.session.info.setdefault(_PENDING_KEY, set())
+        pending.add(channel_id)
+
+        def _apply() -> None:
+            pending.discard(channel_id)
+            alert_settings_cache.put(settings)
+
+        self._after_commit(_apply)
+        await self._publish(
+            ALERT_SETTINGS, channel_id, None if fields is None else {"fields": sorted(fields)}
+        )
@@ -0,0 +1,46 @@
+"""Base repository with unit-of-work aware commits."""
+
+from collections.abc import Callable
+from typing import Any
+
+from sqlalchemy import ColumnElement
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.cache_bus import cache_bus
+from database.engine import AFTER_COMMIT_KEY, UNIT_OF_WORK_KEY
+
+
+class BaseRepository:
+    """Common repository plumbing.
+
+    Outside a unit of work every write commits immediately. Inside
+    ``database.unit_of_work`` writes are only staged and the context manager
+    commits them all at once. In-process caches are updated through
+    ``_after_commit`` so they never observe rolled-back writes; ``_publish``
+    tells the caches of other worker processes about the same change.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    @property
+    def in_unit_of_work(self) -> bool:
+        return bool(self.session.info.get(UNIT_OF_WORK_KEY))
+
+    async def _commit(self) -> None:
+        if not self.in_unit_of_work:
+            await self.session.commit()
+
+    def _after_commit(self, callback: Callable[[], None]) -> None:
+        """Run ``callback`` after the current transaction commits (dropped on rollback)."""
+        self.session.info.setdefault(AFTER_COMMIT_KEY, []).append(callback)
+
+    async def _publish(self, kind: str, key: int | None, data: dict[str, Any] | None = None) -> None:
+        """Invalidate ``kind``/``key`` in other worker processes once the transaction commits."""
+        await cache_bus.publish(self.session, kind, key, data)
+
+    def _notification(
+        self, kind: str, key: int | None, data: dict[str, Any] | None = None
+    ) -> ColumnElement | None:
+        """Same as ``_publish``, as an expression to embed in a write (``None``: nothing to send)."""
+        return cache_bus.notification(kind, key, data)
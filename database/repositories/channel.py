@@ -1,16 +1,45 @@
 """Channel repository for database operations."""
 
-from sqlalchemy import select, update
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import insert, select, update
 
-from database.models import Channel
+from database.cache import channel_registry
+from database.cache_bus import CHANNEL
+from database.models import Channel, ChannelInfo
+from database.repositories.base import BaseRepository
 
 
-class ChannelRepository:
+_INFO_COLUMNS = (
+    Channel.id,
+    Channel.title,
+    Channel.username,
+    Channel.admin_user_id,
+    Channel.notify_chat_id,
+    Channel.is_active,
+)
+
+
+class ChannelRepository(BaseRepository):
     """Repository for Channel model operations."""
 
-    def __init__(self, session: AsyncSession) -> None:
-        self.session = session
+    async def get_info(self, channel_id: int) -> ChannelInfo | None:
+        """Get lean channel projection by ID, served from the channel registry when possible."""
+        info = channel_registry.get(channel_id)
+        if info is not None or channel_registry.is_known_absent(channel_id):
+            return info
+        result = await self.session.execute(
+            select(*_INFO_COLUMNS).where(Channel.id == channel_id)
+        )
+        row = result.one_or_none()
+        if row is None:
+            return None
+        info = ChannelInfo(*row)
+        channel_registry.put(info)
+        return info
+
+    async def get_all_info(self) -> list[ChannelInfo]:
+        """Get lean projections of all channels (used to load the registry)."""
+        result = await self.session.execute(select(*_INFO_COLUMNS))
+        return [ChannelInfo(*row) for row in result.all()]
 
     async def get_by_id(self, channel_id: int) -> Channel | None:
         """Get channel by ID."""
@@ -42,26 +71,37 @@ class ChannelRepository:
         notify_chat_id: int | None = None,
     ) -> Channel:
         """Create a new channel."""
-        channel = Channel(
-            id=channel_id,
-            title=title,
-            username=username,
-            admin_user_id=admin_user_id,
-            notify_chat_id=notify_chat_id,
-            is_active=True,
+        result = await self.session.execute(
+            insert(Channel)
+            .values(
+                id=channel_id,
+                title=title,
+                username=username,
+                admin_user_id=admin_user_id,
+                notify_chat_id=notify_chat_id,
+                is_active=True,
+            )
+            .returning(Channel)
         )
-        self.session.add(channel)
-        await self.session.commit()
-        await self.session.refresh(channel)
+        channel = result.scalar_one()
+        await self._register(channel)
+        await self._commit()
         return channel
 
     async def update(self, channel_id: int, **kwargs) -> Channel | None:
         """Update channel by ID."""
-        await self.session.execute(
-            update(Channel).where(Channel.id == channel_id).values(**kwargs)
+        result = await self.session.execute(
+            update(Channel)
+            .where(Channel.id == channel_id)
+            .values(**kwargs)
+            .returning(Channel),
+            execution_options={"populate_existing": True},
         )
-        await self.session.commit()
-        return await self.get_by_id(channel_id)
+        channel = result.scalar_one_or_none()
+        if channel is not None:
+            await self._register(channel)
+        await self._commit()
+        return channel
 
     async def set_notify_chat(self, channel_id: int, notify_chat_id: int) -> Channel | None:
         """Set notification chat ID for channel."""
@@ -82,8 +122,7 @@ class ChannelRepository:
         channel = await self.get_by_id(channel_id)
         if channel:
             if not channel.is_active:
-                await self.update(channel_id, is_active=True, title=title, username=username)
-                channel = await self.get_by_id(channel_id)
+                channel = await self.update(channel_id, is_active=True, title=title, username=username)
             return channel, False
 
         channel = await self.create(
@@ -93,3 +132,13 @@ class ChannelRepository:
             username=username,
         )
         return channel, True
+
+    async def _register(self, channel: Channel) -> None:
+        """Mirror a written channel into the registry once the write commits."""
+        info = ChannelInfo(*(getattr(channel, column.key) for column in _INFO_COLUMNS))
+        self._after_commit(lambda: channel_registry.put(info))
+        await self._publish(
+            CHANNEL,
+            info.id,
+            {column.key: getattr(info, column.key) for column in _INFO_COLUMNS},
+        )
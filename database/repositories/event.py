@@ -1,48 +1,135 @@
 """Event repository for database operations."""
 
 from datetime import datetime, timedelta, timezone
+from typing import Any
 
-from sqlalchemy import case, func, select
+from sqlalchemy import BigInteger, DateTime, case, column, func, or_, select, update, values
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from database.models import Member, MemberEvent, MessageEvent
+from database.models import Channel, Member, MemberEvent, MessageEvent
+from database.models.event_rollup import OTHER_COLUMN, OTHER_EVENT_TYPE, ROLLUP_COLUMNS
+from database.repositories.base import BaseRepository
+from database.repositories.event_rollup import EventRollupRepository
 
+# Rollup column -> event type
+_EVENT_TYPES = {column: event_type for event_type, column in ROLLUP_COLUMNS.items()}
+_EVENT_TYPES[OTHER_COLUMN] = OTHER_EVENT_TYPE
 
-class EventRepository:
-    """Repository for event model operations."""
+
+def _since(days: int) -> datetime | None:
+    return datetime.now(timezone.utc) - timedelta(days=days) if days > 0 else None
+
+
+class EventRepository(BaseRepository):
+    """Repository for event model operations.
+
+    Per-period aggregates are answered from the rollup tables, which are
+    kept up to date by the insert methods.
+    """
 
     def __init__(self, session: AsyncSession) -> None:
-        self.session = session
+        super().__init__(session)
+        self.rollups = EventRollupRepository(session)
 
     # Member Events
-    async def create_member_event(
+    async def add_member_event(
         self,
         channel_id: int,
         user_id: int,
         event_type: str,
         new_status: str,
         old_status: str | None = None,
+        previous_status: str | None = None,
         username: str | None = None,
         first_name: str | None = None,
         last_name: str | None = None,
         inviter_id: int | None = None,
-    ) -> MemberEvent:
-        """Create a new member event."""
-        event = MemberEvent(
-            channel_id=channel_id,
-            user_id=user_id,
-            username=username,
-            first_name=first_name,
-            last_name=last_name,
-            event_type=event_type,
-            old_status=old_status,
-            new_status=new_status,
-            inviter_id=inviter_id,
+        created_at: datetime | None = None,
+        dedup_key: str | None = None,
+    ) -> dict[str, Any] | None:
+        """Insert one member event (caller commits).
+
+        Returns the stored row, or ``None`` when ``dedup_key`` shows a replay.
+        """
+        inserted = await self.insert_member_events(
+            [
+                {
+                    "channel_id": channel_id,
+                    "user_id": user_id,
+                    "username": username,
+                    "first_name": first_name,
+                    "last_name": last_name,
+                    "event_type": event_type,
+                    "old_status": old_status,
+                    "new_status": new_status,
+                    "previous_status": previous_status,
+                    "inviter_id": inviter_id,
+                    "created_at": created_at or datetime.now(timezone.utc),
+                    "dedup_key": dedup_key,
+                }
+            ]
+        )
+        return inserted[0] if inserted else None
+
+    async def insert_member_events(self, rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Insert many member events in one multi-row INSERT (caller commits).
+
+        Rows whose ``dedup_key`` is already stored are skipped. Returns the
+        rows actually inserted, with their ids.
+        """
+        if not rows:
+            return []
+        result = await self.session.execute(
+            pg_insert(MemberEvent)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=[MemberEvent.dedup_key, MemberEvent.created_at])
+            .returning(
+                MemberEvent.id,
+                MemberEvent.channel_id,
+                MemberEvent.user_id,
+                MemberEvent.username,
+                MemberEvent.first_name,
+                MemberEvent.last_name,
+                MemberEvent.event_type,
+                MemberEvent.created_at,
+            )
+        )
+        inserted = [dict(row) for row in result.mappings().all()]
+        latest: dict[int, datetime] = {}
+        for row in inserted:
+            channel_id = row["channel_id"]
+            if channel_id not in latest or row["created_at"] > latest[channel_id]:
+                latest[channel_id] = row["created_at"]
+        await self.rollups.add_events(inserted)
+        await self._touch_channels(latest)
+        return inserted
+
+    async def _touch_channels(self, latest: dict[int, datetime]) -> None:
+        """Advance ``channels.last_event_at`` to the given times (caller commits)."""
+        if not latest:
+            return
+        marks = values(
+            column("id", BigInteger),
+            column("at", DateTime(timezone=True)),
+            name="marks",
+        ).data(sorted(latest.items()))
+        await self.session.execute(
+            update(Channel)
+            .where(
+                Channel.id == marks.c.id,
+                or_(Channel.last_event_at.is_(None), Channel.last_event_at < marks.c.at),
+            )
+            # Event traffic is not a channel edit
+            .values(last_event_at=marks.c.at, updated_at=Channel.updated_at)
+        )
+
+    async def get_last_member_event_at(self, channel_id: int) -> datetime | None:
+        """Time of the channel's newest member event, without scanning events."""
+        result = await self.session.execute(
+            select(Channel.last_event_at).where(Channel.id == channel_id)
         )
-        self.session.add(event)
-        await self.session.commit()
-        await self.session.refresh(event)
-        return event
+        return result.scalar_one_or_none()
 
     async def get_recent_member_events(
         self,
@@ -79,24 +166,34 @@ class EventRepository:
         result = await self.session.execute(query)
         return result.scalar() or 0
 
+    async def count_member_events_by_minute(
+        self,
+        since: datetime,
+    ) -> list[tuple[int, datetime, str, int]]:
+        """Member event counts per channel, minute and type since ``since``."""
+        minute = func.date_trunc("minute", MemberEvent.created_at).label("minute")
+        result = await self.session.execute(
+            select(
+                MemberEvent.channel_id,
+                minute,
+                MemberEvent.event_type,
+                func.count(MemberEvent.id),
+            )
+            .where(MemberEvent.created_at >= since)
+            .group_by(MemberEvent.channel_id, minute, MemberEvent.event_type)
+        )
+        return [tuple(row) for row in result.all()]
+
     async def get_member_events_stats(
         self,
         channel_id: int,
         days: int = 7,
     ) -> dict[str, int]:
         """Get member events statistics; all time if days <= 0."""
-        since = None
-        if days > 0:
-            since = datetime.now(timezone.utc) - timedelta(days=days)
-
-        query = select(MemberEvent.event_type, func.count(MemberEvent.id)).where(
-            MemberEvent.channel_id == channel_id,
-        )
-        if since:
-            query = query.where(MemberEvent.created_at >= since)
-
-        result = await self.session.execute(query.group_by(MemberEvent.event_type))
-        return dict(result.all())
+        counts = await self.rollups.count_by_type(channel_id, _since(days))
+        return {
+            _EVENT_TYPES[column]: count for column, count in counts.items() if count
+        }
 
     async def get_daily_member_flow(
         self,
@@ -104,41 +201,16 @@ class EventRepository:
         days: int = 30,
     ) -> list[dict[str, object]]:
         """Aggregate joins/leaves per day for the given window. Returns ordered list of dicts."""
-        since = None
-        if days > 0:
-            since = datetime.now(timezone.utc) - timedelta(days=days)
-
-        day_col = func.date_trunc("day", MemberEvent.created_at).label("day")
-        query = (
-            select(day_col, MemberEvent.event_type, func.count(MemberEvent.id))
-            .where(MemberEvent.channel_id == channel_id)
-            .group_by(day_col, MemberEvent.event_type)
-            .order_by(day_col)
-        )
-        if since:
-            query = query.where(MemberEvent.created_at >= since)
-
-        result = await self.session.execute(query)
-        rows = result.all()
-
-        by_day: dict[datetime, dict[str, int]] = {}
-        for day, event_type, count in rows:
-            by_day.setdefault(day, {"join": 0, "leave": 0, "kick": 0, "ban": 0})[
-                event_type
-            ] = count
-
         flow = []
-        for day in sorted(by_day.keys()):
-            counts = by_day[day]
-            net = counts.get("join", 0) - counts.get("leave", 0) - counts.get("kick", 0)
+        for day, counts in await self.rollups.count_by_day(channel_id, _since(days)):
             flow.append(
                 {
                     "day": day,
-                    "join": counts.get("join", 0),
-                    "leave": counts.get("leave", 0),
-                    "kick": counts.get("kick", 0),
-                    "ban": counts.get("ban", 0),
-                    "net": net,
+                    "join": counts["joins"],
+                    "leave": counts["leaves"],
+                    "kick": counts["kicks"],
+                    "ban": counts["bans"],
+                    "net": counts["joins"] - counts["leaves"] - counts["kicks"],
                 }
             )
         return flow
@@ -149,51 +221,20 @@ class EventRepository:
         days: int = 30,
     ) -> list[dict[str, int | float]]:
         """Aggregate activity by day-of-week and hour."""
-        since = None
-        if days > 0:
-            since = datetime.now(timezone.utc) - timedelta(days=days)
-
-        dow_col = func.extract("dow", MemberEvent.created_at).label("dow")
-        hour_col = func.extract("hour", MemberEvent.created_at).label("hour")
-        query = (
-            select(
-                dow_col,
-                hour_col,
-                func.count(MemberEvent.id).label("events"),
-                func.sum(
-                    case(
-                        (MemberEvent.event_type == "join", 1),
-                        else_=0,
-                    )
-                ).label("joins"),
-                func.sum(
-                    case(
-                        (MemberEvent.event_type.in_(["leave", "kick", "ban"]), 1),
-                        else_=0,
-                    )
-                ).label("leaves"),
-            )
-            .where(MemberEvent.channel_id == channel_id)
-            .group_by(dow_col, hour_col)
-            .order_by(dow_col, hour_col)
-        )
-        if since:
-            query = query.where(MemberEvent.created_at >= since)
-
-        result = await self.session.execute(query)
-        rows = result.all()
-
         activity = []
-        for dow, hour, events, joins, leaves in rows:
-            net = (joins or 0) - (leaves or 0)
+        for dow, hour, counts in await self.rollups.count_by_weekday_hour(
+            channel_id, _since(days)
+        ):
+            joins = counts["joins"]
+            leaves = counts["leaves"] + counts["kicks"] + counts["bans"]
             activity.append(
                 {
-                    "dow": int(dow),
-                    "hour": int(hour),
-                    "events": int(events),
-                    "joins": int(joins or 0),
-                    "leaves": int(leaves or 0),
-                    "net": int(net),
+                    "dow": dow,
+                    "hour": hour,
+                    "events": sum(counts.values()),
+                    "joins": joins,
+                    "leaves": leaves,
+                    "net": joins - leaves,
                 }
             )
         return activity
@@ -368,32 +409,21 @@ class EventRepository:
         return ghosts
 
     # Message Events
-    async def create_message_event(
-        self,
-        channel_id: int,
-        user_id: int,
-        message_id: int,
-        event_type: str,
-        username: str | None = None,
-        first_name: str | None = None,
-        last_name: str | None = None,
-        content_preview: str | None = None,
-    ) -> MessageEvent:
-        """Create a new message event."""
-        event = MessageEvent(
-            channel_id=channel_id,
-            user_id=user_id,
-            username=username,
-            first_name=first_name,
-            last_name=last_name,
-            message_id=message_id,
-            event_type=event_type,
-            content_preview=content_preview[:500] if content_preview else None,
+    async def insert_message_events(self, rows: list[dict[str, Any]]) -> int:
+        """Insert many message events in one multi-row INSERT (caller commits).
+
+        Rows whose ``dedup_key`` is already stored are skipped. Returns the
+        number of rows actually inserted.
+        """
+        if not rows:
+            return 0
+        result = await self.session.execute(
+            pg_insert(MessageEvent)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=[MessageEvent.dedup_key, MessageEvent.created_at])
+            .returning(MessageEvent.id)
         )
-        self.session.add(event)
-        await self.session.commit()
-        await self.session.refresh(event)
-        return event
+        return len(result.all())
 
     async def get_recent_message_events(
         self,
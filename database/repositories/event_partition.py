@@ -0,0 +1,165 @@
+"""Event table partition repository."""
+
+import re
+from datetime import date, datetime, timezone
+
+from sqlalchemy import text
+
+from bot.config import settings
+from database.leader import lock_key
+from database.repositories.base import BaseRepository
+
+PARTITIONED_TABLES = ("member_events", "message_events")
+
+_PARTITIONS = text(
+    """
+    SELECT child.relname
+    FROM pg_inherits
+    JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+    WHERE pg_inherits.inhparent = CAST(:table AS regclass)
+    """
+)
+_IS_PARTITIONED = text(
+    "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = CAST(:table AS regclass))"
+)
+
+
+def month_start(at: datetime | date) -> date:
+    return date(at.year, at.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.month - 1 + months
+    return date(month.year + index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month:%Y_%m}"
+
+
+def retention_start(now: datetime | None = None) -> datetime | None:
+    """Oldest ``created_at`` kept under ``EVENT_RETENTION_MONTHS`` (``None``: keep all)."""
+    if settings.event_retention_months <= 0:
+        return None
+    now = now or datetime.now(timezone.utc)
+    month = add_months(month_start(now.astimezone(timezone.utc)), -settings.event_retention_months)
+    return datetime(month.year, month.month, 1, tzinfo=timezone.utc)
+
+
+def _bound(month: date) -> str:
+    return f"{month.isoformat()} 00:00:00+00"
+
+
+class EventPartitionRepository(BaseRepository):
+    """Monthly range partitions of the event tables.
+
+    Partition ``<table>_pYYYY_MM`` holds the rows created in that UTC month
+    and ``<table>_default`` anything outside the created ranges. Creating a
+    month moves its rows out of the default partition first. Retention drops
+    whole partitions and deletes the expired rows of the default one. Tables
+    that are not partitioned yet (migration pending) are left alone.
+    """
+
+    async def _lock(self) -> None:
+        # Serializes DDL of replicas that start at the same time
+        await self.session.execute(
+            text("SELECT pg_advisory_xact_lock(:key)"), {"key": lock_key("event-partitions")}
+        )
+
+    async def _is_partitioned(self, table: str) -> bool:
+        result = await self.session.execute(_IS_PARTITIONED, {"table": table})
+        return bool(result.scalar())
+
+    async def months(self, table: str) -> list[date]:
+        """Months of ``table`` that have a partition, oldest first."""
+        pattern = re.compile(rf"{table}_p(\d{{4}})_(\d{{2}})")
+        result = await self.session.execute(_PARTITIONS, {"table": table})
+        months = []
+        for name in result.scalars():
+            match = pattern.fullmatch(name)
+            if match:
+                months.append(date(int(match[1]), int(match[2]), 1))
+        return sorted(months)
+
+    async def ensure(self, months_ahead: int, now: datetime | None = None) -> dict[str, int]:
+        """Create the partitions of the current month and ``months_ahead`` after it.
+
+        Returns the created partitions with the number of rows moved into
+        each from the default partition.
+        """
+        current = month_start((now or datetime.now(timezone.utc)).astimezone(timezone.utc))
+        await self._lock()
+        created = {}
+        for table in PARTITIONED_TABLES:
+            if not await self._is_partitioned(table):
+                continue
+            await self.session.execute(
+                text(f"CREATE TABLE IF NOT EXISTS {table}_default PARTITION OF {table} DEFAULT")
+            )
+            existing = set(await self.months(table))
+            for offset in range(max(0, months_ahead) + 1):
+                month = add_months(current, offset)
+                if month in existing:
+                    continue
+                created[partition_name(table, month)] = await self._create(table, month)
+        await self._commit()
+        return created
+
+    async def _create(self, table: str, month: date) -> int:
+        """Create the partition of ``month``. Returns the rows moved from the default one."""
+        name = partition_name(table, month)
+        default = f"{table}_default"
+        in_month = (
+            f"created_at >= '{_bound(month)}' AND created_at < '{_bound(add_months(month, 1))}'"
+        )
+        # Postgres refuses the new partition while the default one holds rows of its range.
+        # Writers lock the parent before a partition, so take the parent first (this
+        # also locks the default partition) and keep the same order for the DDL below.
+        await self.session.execute(text(f"LOCK TABLE {table} IN SHARE ROW EXCLUSIVE MODE"))
+        result = await self.session.execute(
+            text(
+                f"CREATE TEMP TABLE moved_events ON COMMIT DROP AS "
+                f"WITH moved AS (DELETE FROM {default} WHERE {in_month} RETURNING *) "
+                f"SELECT * FROM moved"
+            )
+        )
+        moved = result.rowcount
+        await self.session.execute(
+            text(
+                f"CREATE TABLE {name} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{_bound(month)}') TO ('{_bound(add_months(month, 1))}')"
+            )
+        )
+        if moved:
+            await self.session.execute(text(f"INSERT INTO {table} SELECT * FROM moved_events"))
+        await self.session.execute(text("DROP TABLE moved_events"))
+        return moved
+
+    async def drop_before(self, month: date) -> list[str]:
+        """Drop the partitions of months before ``month``. Returns their names."""
+        await self._lock()
+        dropped = []
+        for table in PARTITIONED_TABLES:
+            if not await self._is_partitioned(table):
+                continue
+            for old in await self.months(table):
+                if old >= month:
+                    break
+                name = partition_name(table, old)
+                await self.session.execute(text(f"DROP TABLE {name}"))
+                dropped.append(name)
+        await self._commit()
+        return dropped
+
+    async def purge_default(self, month: date) -> int:
+        """Delete rows created before ``month`` from the default partitions. Returns the count."""
+        purged = 0
+        for table in PARTITIONED_TABLES:
+            if not await self._is_partitioned(table):
+                continue
+            result = await self.session.execute(
+                text(f"DELETE FROM {table}_default WHERE created_at < '{_bound(month)}'")
+            )
+            purged += result.rowcount
+        await self._commit()
+        return purged
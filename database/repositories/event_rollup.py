@@ -0,0 +1,279 @@
+"""Member event rollup repository."""
+
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import delete, func, insert, select, text, union_all
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from bot.config import settings
+from database.leader import lock_key
+from database.models import (
+    Channel,
+    MemberEvent,
+    MemberEventsDay,
+    MemberEventsHour,
+    MemberEventsMinute,
+)
+from database.models.event_rollup import COUNT_COLUMNS, OTHER_COLUMN, ROLLUP_COLUMNS
+from database.repositories.base import BaseRepository
+from database.repositories.event_partition import add_months, month_start, retention_start
+
+# Finest to coarsest, with the width of their buckets
+_LEVELS = (
+    (MemberEventsMinute, "minute", timedelta(minutes=1)),
+    (MemberEventsHour, "hour", timedelta(hours=1)),
+    (MemberEventsDay, "day", timedelta(days=1)),
+)
+
+
+_LOCK_SHARED = text(
+    "SELECT pg_advisory_xact_lock_shared(key) FROM unnest(CAST(:keys AS bigint[])) AS key"
+)
+
+
+def rebuild_lock_key(channel_id: int) -> int:
+    """Advisory lock serializing a channel's rollup rebuild with its event inserts."""
+    return lock_key(f"member-event-rollups:{channel_id}")
+
+
+def _utc(month: date) -> datetime:
+    return datetime(month.year, month.month, 1, tzinfo=timezone.utc)
+
+
+def _floor(at: datetime, unit: str) -> datetime:
+    at = at.astimezone(timezone.utc).replace(second=0, microsecond=0)
+    if unit in ("hour", "day"):
+        at = at.replace(minute=0)
+    if unit == "day":
+        at = at.replace(hour=0)
+    return at
+
+
+def _ceil(at: datetime, unit: str, width: timedelta) -> datetime:
+    floor = _floor(at, unit)
+    return floor if floor == at else floor + width
+
+
+class EventRollupRepository(BaseRepository):
+    """Minute, hour and day counts of member events per channel.
+
+    Rows are added with every event insert. Reads cover a window with the
+    coarsest buckets that fit it: finer buckets only fill the gap between
+    the window start and the next coarser boundary, so a query reads at
+    most ~60 minute and ~24 hour rows plus one row per day. Minute rows
+    are kept for ``ROLLUP_MINUTE_RETENTION_HOURS``; older windows start at
+    the hour.
+    """
+
+    @property
+    def minute_retention(self) -> timedelta:
+        return timedelta(hours=settings.rollup_minute_retention_hours)
+
+    async def add_events(self, rows: list[dict[str, Any]]) -> None:
+        """Count inserted events (``channel_id``, ``event_type``, ``created_at``) into all levels.
+
+        Runs in the inserting transaction (caller commits).
+        """
+        if not rows:
+            return
+        # A rebuild of these channels (exclusive lock) waits for this transaction, or it for the rebuild
+        keys = sorted({rebuild_lock_key(row["channel_id"]) for row in rows})
+        await self.session.execute(_LOCK_SHARED, {"keys": keys})
+        for model, unit, _ in _LEVELS:
+            counts: dict[tuple[int, datetime], Counter] = {}
+            for row in rows:
+                key = (row["channel_id"], _floor(row["created_at"], unit))
+                column = ROLLUP_COLUMNS.get(row["event_type"], OTHER_COLUMN)
+                counts.setdefault(key, Counter())[column] += 1
+            values = [
+                {
+                    "channel_id": channel_id,
+                    "bucket": bucket,
+                    **{column: counter[column] for column in COUNT_COLUMNS},
+                }
+                # Sorted so concurrent writers lock rows in the same order
+                for (channel_id, bucket), counter in sorted(counts.items())
+            ]
+            stmt = pg_insert(model).values(values)
+            await self.session.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[model.channel_id, model.bucket],
+                    set_={
+                        column: getattr(model, column) + stmt.excluded[column]
+                        for column in COUNT_COLUMNS
+                    },
+                )
+            )
+
+    def _window(self, channel_id: int, since: datetime | None, grain: str):
+        """Rollup rows covering ``since``..now, no coarser than ``grain``."""
+        top = next(index for index, (_, unit, _) in enumerate(_LEVELS) if unit == grain)
+        pieces: list[tuple[Any, datetime | None, datetime | None]] = []
+        if since is None:
+            pieces.append((_LEVELS[top][0], None, None))
+        else:
+            now = datetime.now(timezone.utc)
+            if since >= now - self.minute_retention:
+                start = _ceil(since, "minute", _LEVELS[0][2])
+            else:
+                start = _floor(since, "hour")
+            for index in range(top + 1):
+                model = _LEVELS[index][0]
+                if index == top:
+                    pieces.append((model, start, None))
+                    break
+                _, unit, width = _LEVELS[index + 1]
+                end = _ceil(start, unit, width)
+                if end > start:
+                    pieces.append((model, start, end))
+                start = end
+
+        selects = []
+        for model, start, end in pieces:
+            query = select(
+                model.bucket.label("bucket"),
+                *(getattr(model, column).label(column) for column in COUNT_COLUMNS),
+            ).where(model.channel_id == channel_id)
+            if start is not None:
+                query = query.where(model.bucket >= start)
+            if end is not None:
+                query = query.where(model.bucket < end)
+            selects.append(query)
+        return (union_all(*selects) if len(selects) > 1 else selects[0]).subquery("rollup")
+
+    async def count_by_type(self, channel_id: int, since: datetime | None) -> dict[str, int]:
+        """Member events per column name since ``since`` (all time if ``None``)."""
+        window = self._window(channel_id, since, "day")
+        result = await self.session.execute(
+            select(*(func.coalesce(func.sum(window.c[column]), 0) for column in COUNT_COLUMNS))
+        )
+        return dict(zip(COUNT_COLUMNS, (int(value) for value in result.one())))
+
+    async def count_by_day(
+        self, channel_id: int, since: datetime | None
+    ) -> list[tuple[datetime, dict[str, int]]]:
+        """Per-day column counts, oldest first."""
+        window = self._window(channel_id, since, "day")
+        day = func.date_trunc("day", window.c.bucket, "UTC").label("day")
+        result = await self.session.execute(
+            select(day, *(func.sum(window.c[column]) for column in COUNT_COLUMNS))
+            .group_by(day)
+            .order_by(day)
+        )
+        return [
+            (row[0], dict(zip(COUNT_COLUMNS, (int(value) for value in row[1:]))))
+            for row in result.all()
+        ]
+
+    async def count_by_weekday_hour(
+        self, channel_id: int, since: datetime | None
+    ) -> list[tuple[int, int, dict[str, int]]]:
+        """Column counts per (day of week, hour), ordered."""
+        window = self._window(channel_id, since, "hour")
+        dow = func.extract("dow", func.timezone("UTC", window.c.bucket)).label("dow")
+        hour = func.extract("hour", func.timezone("UTC", window.c.bucket)).label("hour")
+        result = await self.session.execute(
+            select(dow, hour, *(func.sum(window.c[column]) for column in COUNT_COLUMNS))
+            .group_by(dow, hour)
+            .order_by(dow, hour)
+        )
+        return [
+            (int(row[0]), int(row[1]), dict(zip(COUNT_COLUMNS, (int(value) for value in row[2:]))))
+            for row in result.all()
+        ]
+
+    async def rebuild(self, channel_id: int | None = None) -> int:
+        """Recompute the rollups of one channel (all if ``None``) from ``member_events``.
+
+        Works one channel and month at a time, each slice in its own
+        transaction under the channel's rebuild lock: only event inserts of
+        that channel wait, and only for the slice in progress. Buckets before
+        the event retention start are kept, as their events may be gone.
+        Returns the number of rollup rows written.
+        """
+        if channel_id is None:
+            result = await self.session.execute(select(Channel.id).order_by(Channel.id))
+            channel_ids = list(result.scalars())
+        else:
+            channel_ids = [channel_id]
+        kept_since = retention_start()
+        written = 0
+        for rebuilt_id in channel_ids:
+            for start, end in await self._slices(rebuilt_id, kept_since):
+                written += await self._rebuild_slice(rebuilt_id, start, end)
+                await self._commit()
+        return written
+
+    async def _slices(
+        self, channel_id: int, kept_since: datetime | None
+    ) -> list[tuple[datetime, datetime | None]]:
+        """Month ranges covering the channel's events and rollups; the last one is open."""
+        first_event = (
+            select(func.min(MemberEvent.created_at))
+            .where(MemberEvent.channel_id == channel_id)
+            .scalar_subquery()
+        )
+        first_bucket = (
+            select(func.min(MemberEventsDay.bucket))
+            .where(MemberEventsDay.channel_id == channel_id)
+            .scalar_subquery()
+        )
+        first = (await self.session.execute(select(func.least(first_event, first_bucket)))).scalar()
+        if first is None:
+            return []
+        if kept_since is not None:
+            first = max(first, kept_since)
+        month = month_start(first.astimezone(timezone.utc))
+        last = month_start(datetime.now(timezone.utc))
+        slices: list[tuple[datetime, datetime | None]] = []
+        while month <= last:
+            following = add_months(month, 1)
+            slices.append((_utc(month), _utc(following) if following <= last else None))
+            month = following
+        return slices
+
+    async def _rebuild_slice(self, channel_id: int, start: datetime, end: datetime | None) -> int:
+        await self.session.execute(
+            text("SELECT pg_advisory_xact_lock(:key)"), {"key": rebuild_lock_key(channel_id)}
+        )
+        minute_since = datetime.now(timezone.utc) - self.minute_retention
+        written = 0
+        for model, unit, _ in _LEVELS:
+            cleared = delete(model).where(model.channel_id == channel_id, model.bucket >= start)
+            if end is not None:
+                cleared = cleared.where(model.bucket < end)
+            await self.session.execute(cleared)
+
+            bucket = func.date_trunc(unit, MemberEvent.created_at, "UTC")
+            source = (
+                select(
+                    MemberEvent.channel_id,
+                    bucket,
+                    *(
+                        func.count().filter(MemberEvent.event_type == event_type)
+                        for event_type in ROLLUP_COLUMNS
+                    ),
+                    func.count().filter(MemberEvent.event_type.not_in(list(ROLLUP_COLUMNS))),
+                )
+                .where(MemberEvent.channel_id == channel_id, MemberEvent.created_at >= start)
+                .group_by(MemberEvent.channel_id, bucket)
+            )
+            if end is not None:
+                source = source.where(MemberEvent.created_at < end)
+            if model is MemberEventsMinute:
+                source = source.where(MemberEvent.created_at >= minute_since)
+            result = await self.session.execute(
+                insert(model).from_select(["channel_id", "bucket", *COUNT_COLUMNS], source)
+            )
+            written += result.rowcount
+        return written
+
+    async def purge_minutes(self, before: datetime) -> int:
+        """Delete minute rows older than ``before``."""
+        result = await self.session.execute(
+            delete(MemberEventsMinute).where(MemberEventsMinute.bucket < before)
+        )
+        await self._commit()
+        return result.rowcount
@@ -1,17 +1,15 @@
 """Repository for per-user Google Sheets settings."""
 
-from sqlalchemy import select, update
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from database.models import GoogleSettings
+from database.repositories.base import BaseRepository
 
 
-class GoogleSettingsRepository:
+class GoogleSettingsRepository(BaseRepository):
     """CRUD operations for GoogleSettings."""
 
-    def __init__(self, session: AsyncSession) -> None:
-        self.session = session
-
     async def get(self, user_id: int) -> GoogleSettings | None:
         result = await self.session.execute(
             select(GoogleSettings).where(GoogleSettings.user_id == user_id)
@@ -19,30 +17,10 @@ class GoogleSettingsRepository:
         return result.scalar_one_or_none()
 
     async def upsert_creds(self, user_id: int, creds_json: str) -> GoogleSettings:
-        settings = await self.get(user_id)
-        if settings:
-            await self.session.execute(
-                update(GoogleSettings)
-                .where(GoogleSettings.user_id == user_id)
-                .values(creds_json=creds_json)
-            )
-        else:
-            self.session.add(GoogleSettings(user_id=user_id, creds_json=creds_json))
-        await self.session.commit()
-        return await self.get(user_id)  # type: ignore[return-value]
+        return await self._upsert(user_id, creds_json=creds_json)
 
     async def set_spreadsheet(self, user_id: int, spreadsheet_id: str) -> GoogleSettings:
-        settings = await self.get(user_id)
-        if settings:
-            await self.session.execute(
-                update(GoogleSettings)
-                .where(GoogleSettings.user_id == user_id)
-                .values(spreadsheet_id=spreadsheet_id)
-            )
-        else:
-            self.session.add(GoogleSettings(user_id=user_id, spreadsheet_id=spreadsheet_id))
-        await self.session.commit()
-        return await self.get(user_id)  # type: ignore[return-value]
+        return await self._upsert(user_id, spreadsheet_id=spreadsheet_id)
 
     async def clear(self, user_id: int) -> None:
         await self.session.execute(
@@ -50,4 +28,17 @@ class GoogleSettingsRepository:
             .where(GoogleSettings.user_id == user_id)
             .values(creds_json=None, spreadsheet_id=None)
         )
-        await self.session.commit()
+        await self._commit()
+
+    async def _upsert(self, user_id: int, **values) -> GoogleSettings:
+        stmt = pg_insert(GoogleSettings).values(user_id=user_id, **values)
+        result = await self.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[GoogleSettings.user_id],
+                set_={**values, "updated_at": func.now()},
+            ).returning(GoogleSettings),
+            execution_options={"populate_existing": True},
+        )
+        settings = result.scalar_one()
+        await self._commit()
+        return settings
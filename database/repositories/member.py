@@ -2,17 +2,32 @@
 
 from datetime import datetime
 
-from sqlalchemy import func, select, update
+from sqlalchemy import Integer, case, cast, func, insert, literal_column, select, true, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
-from database.models import Member
+from database.cache import member_counters_cache
+from database.cache_bus import MEMBER_COUNTERS
+from database.models import ChannelMemberCounters, Member
+from database.models.member_counters import COUNTER_COLUMNS
+from database.repositories.base import BaseRepository
+from database.repositories.member_snapshot import MemberSnapshotRepository
 
+_PENDING_KEY = "member_counters_pending"
 
-class MemberRepository:
-    """Repository for Member model operations."""
+LEFT_STATUSES = ("left", "kicked", "banned")
+
+
+class MemberRepository(BaseRepository):
+    """Repository for Member model operations.
+
+    Daily history of the member counters is available through ``snapshots``.
+    """
 
     def __init__(self, session: AsyncSession) -> None:
-        self.session = session
+        super().__init__(session)
+        self.snapshots = MemberSnapshotRepository(session)
 
     async def get_by_id(self, member_id: int) -> Member | None:
         """Get member by ID."""
@@ -44,7 +59,27 @@ class MemberRepository:
         return list(result.scalars().all())
 
     async def count_by_status(self, channel_id: int) -> dict[str, int]:
-        """Count members by status for a channel."""
+        """Count members by status for a channel.
+
+        O(1): served from the in-memory counter mirror or the
+        ``channel_member_counters`` row, both maintained by ``upsert``.
+        """
+        pending = channel_id in self.session.info.get(_PENDING_KEY, ())
+        if not pending:
+            counts = member_counters_cache.get(channel_id)
+            if counts is not None:
+                return counts
+        counters = await self.session.get(ChannelMemberCounters, channel_id)
+        if counters is None:
+            # No transition recorded since counters were seeded
+            return {}
+        counts = counters.as_dict()
+        if not pending:
+            member_counters_cache.put(channel_id, counts)
+        return counts
+
+    async def count_by_status_exact(self, channel_id: int) -> dict[str, int]:
+        """Count members by status by scanning ``members`` (reconciliation/debugging)."""
         result = await self.session.execute(
             select(Member.status, func.count(Member.id))
             .where(Member.channel_id == channel_id)
@@ -52,6 +87,40 @@ class MemberRepository:
         )
         return dict(result.all())
 
+    async def reconcile_counters(self, channel_id: int | None = None) -> int:
+        """Recompute counters from ``members``. Returns the number of channels written."""
+        columns = {
+            column: func.count().filter(Member.status == status)
+            for status, column in COUNTER_COLUMNS.items()
+        }
+        source = select(Member.channel_id, *columns.values()).group_by(Member.channel_id)
+        stale = update(ChannelMemberCounters).values(
+            {column: 0 for column in COUNTER_COLUMNS.values()}
+        )
+        if channel_id is not None:
+            source = source.where(Member.channel_id == channel_id)
+            stale = stale.where(ChannelMemberCounters.channel_id == channel_id)
+
+        # Zero everything in scope first, so channels without members end at 0
+        await self.session.execute(stale)
+        stmt = pg_insert(ChannelMemberCounters).from_select(
+            ["channel_id", *columns.keys()], source
+        )
+        result = await self.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[ChannelMemberCounters.channel_id],
+                set_={
+                    **{column: stmt.excluded[column] for column in columns},
+                    "updated_at": func.now(),
+                },
+            ).returning(ChannelMemberCounters.channel_id)
+        )
+        written = len(result.all())
+        self._after_commit(lambda: member_counters_cache.invalidate(channel_id))
+        await self._publish(MEMBER_COUNTERS, channel_id)
+        await self._commit()
+        return written
+
     async def create(
         self,
         channel_id: int,
@@ -63,18 +132,22 @@ class MemberRepository:
         joined_at: datetime | None = None,
     ) -> Member:
         """Create a new member."""
-        member = Member(
-            channel_id=channel_id,
-            user_id=user_id,
-            username=username,
-            first_name=first_name,
-            last_name=last_name,
-            status=status,
-            joined_at=joined_at or datetime.now(),
+        result = await self.session.execute(
+            insert(Member)
+            .values(
+                channel_id=channel_id,
+                user_id=user_id,
+                username=username,
+                first_name=first_name,
+                last_name=last_name,
+                status=status,
+                joined_at=joined_at or datetime.now(),
+            )
+            .returning(Member)
         )
-        self.session.add(member)
-        await self.session.commit()
-        await self.session.refresh(member)
+        member = result.scalar_one()
+        await self._adjust_counters(channel_id, None, status)
+        await self._commit()
         return member
 
     async def update_status(
@@ -90,13 +163,20 @@ class MemberRepository:
         if left_at:
             update_data["left_at"] = left_at
 
-        await self.session.execute(
+        # The row is locked by the update, so previous_status is the committed status
+        result = await self.session.execute(
             update(Member)
             .where(Member.channel_id == channel_id, Member.user_id == user_id)
-            .values(**update_data)
+            .values(previous_status=Member.status, **update_data)
+            .returning(Member),
+            execution_options={"populate_existing": True},
         )
-        await self.session.commit()
-        return await self.get_by_channel_and_user(channel_id, user_id)
+        member = result.scalar_one_or_none()
+        if member is None:
+            return None
+        await self._adjust_counters(channel_id, member.previous_status, status)
+        await self._commit()
+        return member
 
     async def upsert(
         self,
@@ -107,40 +187,147 @@ class MemberRepository:
         last_name: str | None = None,
         status: str = "member",
     ) -> tuple[Member, bool]:
-        """Create or update member. Returns (member, created)."""
-        member = await self.get_by_channel_and_user(channel_id, user_id)
-
-        if member:
-            # Update existing member
-            now = datetime.now()
-            update_data = {
-                "username": username,
-                "first_name": first_name,
-                "last_name": last_name,
-                "status": status,
-            }
-
-            if status in ("left", "kicked", "banned"):
-                update_data["left_at"] = now
-            elif status == "member" and member.status in ("left", "kicked", "banned"):
-                update_data["joined_at"] = now
-
-            await self.session.execute(
-                update(Member)
-                .where(Member.id == member.id)
-                .values(**update_data)
-            )
-            await self.session.commit()
-            await self.session.refresh(member)
-            return member, False
+        """Create or update member in one statement. Returns (member, created).
 
-        # Create new member
-        member = await self.create(
+        ``INSERT ... ON CONFLICT DO UPDATE`` locks the existing row and sees
+        its latest committed version, so concurrent updates for the same user
+        serialize. The status it replaces is kept in ``previous_status``;
+        ``joined_at``/``left_at`` follow from it, and a CTE moves the channel's
+        member counters from it to the new status in the same statement, which
+        also notifies other processes when the cache bus runs.
+        """
+        now = func.now()
+        stmt = pg_insert(Member).values(
             channel_id=channel_id,
             user_id=user_id,
             username=username,
             first_name=first_name,
             last_name=last_name,
             status=status,
+            joined_at=now,
+        )
+        was_left = Member.status.in_(LEFT_STATUSES)
+        member_cte = (
+            stmt.on_conflict_do_update(
+                index_elements=[Member.channel_id, Member.user_id],
+                set_={
+                    "username": stmt.excluded.username,
+                    "first_name": stmt.excluded.first_name,
+                    "last_name": stmt.excluded.last_name,
+                    "previous_status": Member.status,
+                    "status": stmt.excluded.status,
+                    "updated_at": now,
+                    "left_at": now if status in LEFT_STATUSES else Member.left_at,
+                    "joined_at": (
+                        case((was_left, now), else_=Member.joined_at)
+                        if status == "member"
+                        else Member.joined_at
+                    ),
+                },
+            )
+            # xmax is 0 only for a freshly inserted row version
+            .returning(*Member.__table__.c, literal_column("xmax = 0").label("created"))
+            .cte("member")
+        )
+
+        columns = list(COUNTER_COLUMNS.values())
+        deltas = select(
+            member_cte.c.channel_id,
+            *(
+                (
+                    cast(member_cte.c.status == state, Integer)
+                    - cast(func.coalesce(member_cte.c.previous_status == state, False), Integer)
+                ).label(column)
+                for state, column in COUNTER_COLUMNS.items()
+            ),
+        ).where(member_cte.c.previous_status.is_distinct_from(member_cte.c.status))
+        counters = pg_insert(ChannelMemberCounters).from_select(
+            ["channel_id", *columns], deltas
+        )
+        counters_cte = (
+            counters.on_conflict_do_update(
+                index_elements=[ChannelMemberCounters.channel_id],
+                set_={
+                    **{
+                        column: getattr(ChannelMemberCounters, column) + counters.excluded[column]
+                        for column in columns
+                    },
+                    "updated_at": now,
+                },
+            )
+            .returning(
+                ChannelMemberCounters.channel_id,
+                *(getattr(ChannelMemberCounters, column) for column in columns),
+            )
+            .cte("counters")
+        )
+
+        outputs = [
+            aliased(Member, member_cte),
+            member_cte.c.created,
+            counters_cte.c.channel_id.label("counted"),
+            *(counters_cte.c[column] for column in columns),
+        ]
+        notification = self._notification(MEMBER_COUNTERS, channel_id)
+        if notification is not None:
+            outputs.append(case((counters_cte.c.channel_id.is_not(None), notification)))
+        row = (
+            await self.session.execute(
+                select(*outputs).select_from(member_cte.outerjoin(counters_cte, true())),
+                execution_options={"populate_existing": True},
+            )
+        ).one()
+        member = row[0]
+        if row.counted is not None:
+            self._mirror_counters(
+                channel_id,
+                {state: row._mapping[column] for state, column in COUNTER_COLUMNS.items()},
+            )
+        await self._commit()
+        return member, row.created
+
+    async def _adjust_counters(
+        self,
+        channel_id: int,
+        old_status: str | None,
+        new_status: str,
+    ) -> None:
+        """Move one member between status counters and mirror the result on commit."""
+        if old_status == new_status:
+            return
+        deltas = {column: 0 for column in COUNTER_COLUMNS.values()}
+        if old_status in COUNTER_COLUMNS:
+            deltas[COUNTER_COLUMNS[old_status]] -= 1
+        if new_status in COUNTER_COLUMNS:
+            deltas[COUNTER_COLUMNS[new_status]] += 1
+        changed = {column: delta for column, delta in deltas.items() if delta}
+        if not changed:
+            return
+
+        stmt = pg_insert(ChannelMemberCounters).values(channel_id=channel_id, **changed)
+        result = await self.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[ChannelMemberCounters.channel_id],
+                set_={
+                    **{
+                        column: getattr(ChannelMemberCounters, column) + delta
+                        for column, delta in changed.items()
+                    },
+                    "updated_at": func.now(),
+                },
+            ).returning(ChannelMemberCounters),
+            execution_options={"populate_existing": True},
         )
-        return member, True
+        self._mirror_counters(channel_id, result.scalar_one().as_dict())
+        await self._publish(MEMBER_COUNTERS, channel_id)
+
+    def _mirror_counters(self, channel_id: int, counts: dict[str, int]) -> None:
+        """Serve ``counts`` from the in-memory mirror once the transaction commits."""
+        pending = self.session.info.setdefault(_PENDING_KEY, set())
+        pending.add(channel_id)
+
+        def _apply() -> None:
+            pending.discard(channel_id)
+            member_counters_cache.put(channel_id, counts)
+
+        self._after_commit(_apply)
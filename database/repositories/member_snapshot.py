@@ -0,0 +1,151 @@
+"""Daily member snapshot repository."""
+
+from datetime import date, datetime, time, timedelta, timezone
+
+from sqlalchemy import Date, DateTime, case, cast, func, literal, select, true
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from database.models import ChannelMemberCounters, ChannelMemberSnapshot, MemberEvent
+from database.models.member_counters import COUNTER_COLUMNS
+from database.repositories.base import BaseRepository
+
+
+def _status_delta(status: str):
+    """Change of a status count caused by one event, as applied to the counters."""
+    return case((MemberEvent.new_status == status, 1), else_=0) - case(
+        (MemberEvent.previous_status == status, 1), else_=0
+    )
+
+
+def _day_start(day: date) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=timezone.utc)
+
+
+class MemberSnapshotRepository(BaseRepository):
+    """End-of-day member counts per channel.
+
+    Snapshots are derived backwards from the live counters: the count at the
+    end of day D is the current count minus the status changes of the
+    events after D. Each event replays the transition the counters applied
+    (``previous_status`` -> ``new_status``), so a first-seen member only adds
+    to its new status, and the result stays exact for members that joined
+    before the bot started recording events.
+    """
+
+    async def take(self, day: date, channel_id: int | None = None) -> int:
+        """Write the end-of-``day`` snapshot of every channel. Returns rows written."""
+        later = select(
+            MemberEvent.channel_id,
+            *(
+                func.sum(_status_delta(status)).label(column)
+                for status, column in COUNTER_COLUMNS.items()
+            ),
+        ).where(MemberEvent.created_at >= _day_start(day + timedelta(days=1)))
+        if channel_id is not None:
+            later = later.where(MemberEvent.channel_id == channel_id)
+        later = later.group_by(MemberEvent.channel_id).subquery("later")
+
+        counters = ChannelMemberCounters.__table__
+        source = select(
+            counters.c.channel_id,
+            literal(day, Date),
+            *(
+                counters.c[column] - func.coalesce(later.c[column], 0)
+                for column in COUNTER_COLUMNS.values()
+            ),
+        ).outerjoin(later, later.c.channel_id == counters.c.channel_id)
+        if channel_id is not None:
+            source = source.where(counters.c.channel_id == channel_id)
+        return await self._upsert(source)
+
+    async def backfill(self, channel_id: int | None = None, until: date | None = None) -> int:
+        """Reconstruct all past snapshots (up to ``until``, default yesterday) in one pass.
+
+        Events are summed per day and accumulated with a window ordered by
+        day; days without events repeat the previous day's counts. History
+        starts at a channel's first recorded event. Returns rows written.
+        """
+        until = until or datetime.now(timezone.utc).date() - timedelta(days=1)
+        day = cast(func.timezone("UTC", MemberEvent.created_at), Date).label("day")
+        deltas = select(
+            MemberEvent.channel_id,
+            day,
+            *(
+                func.sum(_status_delta(status)).label(column)
+                for status, column in COUNTER_COLUMNS.items()
+            ),
+        )
+        if channel_id is not None:
+            deltas = deltas.where(MemberEvent.channel_id == channel_id)
+        deltas = deltas.group_by(MemberEvent.channel_id, day).subquery("deltas")
+
+        by_channel = {"partition_by": deltas.c.channel_id}
+        running = select(
+            deltas.c.channel_id,
+            deltas.c.day,
+            func.lead(deltas.c.day).over(order_by=deltas.c.day, **by_channel).label("next_day"),
+            *(
+                # Changes after this day: everything minus the running total
+                (
+                    func.sum(deltas.c[column]).over(**by_channel)
+                    - func.sum(deltas.c[column]).over(order_by=deltas.c.day, **by_channel)
+                ).label(column)
+                for column in COUNTER_COLUMNS.values()
+            ),
+        ).subquery("running")
+        counters = ChannelMemberCounters.__table__
+
+        # Each event day stands for itself and the event-less days after it
+        last_day = func.coalesce(running.c.next_day - 1, until)
+        days = (
+            func.generate_series(
+                cast(running.c.day, DateTime), cast(last_day, DateTime), timedelta(days=1)
+            )
+            .table_valued("d")
+            .render_derived(name="days")
+            .lateral()
+        )
+        source = (
+            select(
+                running.c.channel_id,
+                cast(days.c.d, Date),
+                *(
+                    counters.c[column] - running.c[column]
+                    for column in COUNTER_COLUMNS.values()
+                ),
+            )
+            .select_from(running)
+            .join(counters, counters.c.channel_id == running.c.channel_id)
+            .join(days, true())
+            .where(running.c.day <= until, cast(days.c.d, Date) <= until)
+        )
+        return await self._upsert(source)
+
+    async def _upsert(self, source) -> int:
+        columns = list(COUNTER_COLUMNS.values())
+        stmt = pg_insert(ChannelMemberSnapshot).from_select(["channel_id", "day", *columns], source)
+        result = await self.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[ChannelMemberSnapshot.channel_id, ChannelMemberSnapshot.day],
+                set_={column: stmt.excluded[column] for column in columns},
+            )
+        )
+        await self._commit()
+        return result.rowcount
+
+    async def latest_day(self) -> date | None:
+        """Most recent day that has any snapshot."""
+        result = await self.session.execute(select(func.max(ChannelMemberSnapshot.day)))
+        return result.scalar_one_or_none()
+
+    async def get_history(
+        self,
+        channel_id: int,
+        since: date | None = None,
+    ) -> list[ChannelMemberSnapshot]:
+        """Snapshots of a channel, oldest first (all of them if ``since`` is ``None``)."""
+        query = select(ChannelMemberSnapshot).where(ChannelMemberSnapshot.channel_id == channel_id)
+        if since is not None:
+            query = query.where(ChannelMemberSnapshot.day >= since)
+        result = await self.session.execute(query.order_by(ChannelMemberSnapshot.day))
+        return list(result.scalars().all())
@@ -0,0 +1,132 @@
+"""Outbox repository for durable notification delivery."""
+
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import case, delete, func, insert, select, update
+
+from database.models import OutboxMessage
+from database.models.outbox import OUTBOX_FAILED, OUTBOX_PENDING, OUTBOX_SENT
+from database.repositories.base import BaseRepository
+
+
+class OutboxRepository(BaseRepository):
+    """Repository for the notification outbox."""
+
+    async def enqueue(self, messages: list[dict[str, Any]]) -> None:
+        """Add ``{"channel_id", "kind", "payload"}`` rows (caller commits)."""
+        if messages:
+            await self.session.execute(insert(OutboxMessage), messages)
+
+    async def claim(
+        self,
+        limit: int,
+        lease: timedelta,
+        partition: tuple[int, int] | None = None,
+    ) -> list[OutboxMessage]:
+        """Lease up to ``limit`` due messages, skipping rows other workers hold.
+
+        A claimed message is invisible until ``lease`` expires, so a worker
+        that dies mid-send only delays it (at-least-once delivery). With
+        ``partition=(index, count)`` only channels of that partition are claimed.
+        """
+        due = (
+            select(OutboxMessage.id)
+            .where(
+                OutboxMessage.status == OUTBOX_PENDING,
+                OutboxMessage.next_attempt_at <= func.now(),
+            )
+            .order_by(OutboxMessage.next_attempt_at, OutboxMessage.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        if partition is not None:
+            index, count = partition
+            due = due.where(func.mod(func.abs(OutboxMessage.channel_id), count) == index)
+        result = await self.session.execute(
+            update(OutboxMessage)
+            .where(OutboxMessage.id.in_(due.scalar_subquery()))
+            .values(
+                attempts=OutboxMessage.attempts + 1,
+                next_attempt_at=func.now() + lease,
+            )
+            .returning(OutboxMessage),
+            execution_options={"populate_existing": True},
+        )
+        messages = list(result.scalars().all())
+        await self._commit()
+        return sorted(messages, key=lambda message: message.id)
+
+    async def extend_lease(self, ids: list[int], lease: timedelta) -> None:
+        """Keep messages that are still being delivered invisible for another ``lease``."""
+        if not ids:
+            return
+        await self.session.execute(
+            update(OutboxMessage)
+            .where(OutboxMessage.id.in_(ids), OutboxMessage.status == OUTBOX_PENDING)
+            .values(next_attempt_at=func.now() + lease)
+        )
+        await self._commit()
+
+    async def defer(self, ids: list[int], until: datetime) -> None:
+        """Hold messages back until ``until`` without counting it as an attempt."""
+        if not ids:
+            return
+        await self.session.execute(
+            update(OutboxMessage)
+            .where(OutboxMessage.id.in_(ids), OutboxMessage.status == OUTBOX_PENDING)
+            .values(attempts=OutboxMessage.attempts - 1, next_attempt_at=until)
+        )
+        await self._commit()
+
+    async def mark_sent(self, ids: list[int]) -> None:
+        if not ids:
+            return
+        await self.session.execute(
+            update(OutboxMessage)
+            .where(OutboxMessage.id.in_(ids))
+            .values(status=OUTBOX_SENT, last_error=None)
+        )
+        await self._commit()
+
+    async def reschedule(
+        self,
+        ids: list[int],
+        error: str,
+        base_delay: float,
+        max_delay: float,
+        max_attempts: int,
+    ) -> None:
+        """Retry with exponential backoff; give up after ``max_attempts``."""
+        if not ids:
+            return
+        delay = func.least(
+            max_delay,
+            base_delay * func.power(2, OutboxMessage.attempts - 1),
+        )
+        await self.session.execute(
+            update(OutboxMessage)
+            .where(OutboxMessage.id.in_(ids))
+            .values(
+                status=case(
+                    (OutboxMessage.attempts >= max_attempts, OUTBOX_FAILED),
+                    else_=OUTBOX_PENDING,
+                ),
+                next_attempt_at=func.now() + func.make_interval(0, 0, 0, 0, 0, 0, delay),
+                last_error=error[:1000],
+            )
+        )
+        await self._commit()
+
+    async def purge_finished(self, before: datetime) -> int:
+        """Delete sent and failed messages last updated before ``before``."""
+        result = await self.session.execute(
+            delete(OutboxMessage)
+            .where(
+                OutboxMessage.status.in_([OUTBOX_SENT, OUTBOX_FAILED]),
+                OutboxMessage.updated_at < before,
+            )
+            .returning(OutboxMessage.id)
+        )
+        await self._commit()
+        return len(result.all())
@@ -1,17 +1,16 @@
 """User repository for database operations."""
 
-from sqlalchemy import select, update
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import insert, select, update
 
+from database.cache import language_cache
+from database.cache_bus import LANGUAGE
 from database.models import User
+from database.repositories.base import BaseRepository
 
 
-class UserRepository:
+class UserRepository(BaseRepository):
     """Repository for User model operations."""
 
-    def __init__(self, session: AsyncSession) -> None:
-        self.session = session
-
     async def get_by_id(self, user_id: int) -> User | None:
         """Get user by ID."""
         result = await self.session.execute(
@@ -28,16 +27,21 @@ class UserRepository:
         language: str = "en",
     ) -> User:
         """Create a new user."""
-        user = User(
-            id=user_id,
-            username=username,
-            first_name=first_name,
-            last_name=last_name,
-            language=language,
+        result = await self.session.execute(
+            insert(User)
+            .values(
+                id=user_id,
+                username=username,
+                first_name=first_name,
+                last_name=last_name,
+                language=language,
+            )
+            .returning(User)
         )
-        self.session.add(user)
-        await self.session.commit()
-        await self.session.refresh(user)
+        user = result.scalar_one()
+        self._after_commit(lambda: language_cache.set(user_id, language))
+        await self._publish(LANGUAGE, user_id)
+        await self._commit()
         return user
 
     async def get_or_create(
@@ -64,13 +68,27 @@ class UserRepository:
 
     async def set_language(self, user_id: int, language: str) -> User | None:
         """Update user language preference."""
-        await self.session.execute(
-            update(User).where(User.id == user_id).values(language=language)
+        result = await self.session.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(language=language)
+            .returning(User),
+            execution_options={"populate_existing": True},
         )
-        await self.session.commit()
-        return await self.get_by_id(user_id)
+        user = result.scalar_one_or_none()
+        self._after_commit(lambda: language_cache.set(user_id, language))
+        await self._publish(LANGUAGE, user_id)
+        await self._commit()
+        return user
 
     async def get_language(self, user_id: int) -> str:
-        """Get user language, defaults to 'en' if not found."""
-        user = await self.get_by_id(user_id)
-        return user.language if user else "en"
+        """Get user language, defaults to 'en' if not found. Cached per user."""
+        language = language_cache.get(user_id)
+        if language is not None:
+            return language
+        result = await self.session.execute(
+            select(User.language).where(User.id == user_id)
+        )
+        language = result.scalar_one_or_none() or "en"
+        language_cache.set(user_id, language)
+        return language
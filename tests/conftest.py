@@ -0,0 +1,93 @@
+"""Fixtures for tests that run against a disposable PostgreSQL database.
+
+Set ``TEST_DATABASE_URL`` (``postgresql+asyncpg://...``) to enable them; its
+tables are dropped and recreated. Without it the database tests are skipped.
+Services that open their own sessions use the same database.
+"""
+
+import asyncio
+import os
+from collections.abc import Awaitable, Callable, Iterator
+from typing import Any
+
+import pytest
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+os.environ.setdefault("BOT_TOKEN", "123:test")
+if TEST_DATABASE_URL:
+    os.environ["DATABASE_URL"] = TEST_DATABASE_URL
+
+from sqlalchemy import event, text  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine  # noqa: E402
+from sqlalchemy.pool import NullPool  # noqa: E402
+
+from database.cache import (  # noqa: E402
+    alert_settings_cache,
+    channel_registry,
+    language_cache,
+    member_counters_cache,
+)
+from database.models import Base  # noqa: E402
+from database.repositories import EventPartitionRepository  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def loop() -> Iterator[asyncio.AbstractEventLoop]:
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(scope="session")
+def run(loop: asyncio.AbstractEventLoop) -> Callable[[Awaitable[Any]], Any]:
+    """Run a coroutine on the shared test loop."""
+    return loop.run_until_complete
+
+
+@pytest.fixture(scope="session")
+def engine(run) -> Iterator[AsyncEngine]:
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    engine = create_async_engine(TEST_DATABASE_URL, poolclass=NullPool)
+
+    async def create_schema() -> None:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+        async with async_sessionmaker(engine)() as session:
+            await EventPartitionRepository(session).ensure(1)
+
+    run(create_schema())
+    yield engine
+    run(engine.dispose())
+
+
+@pytest.fixture
+def session_maker(engine: AsyncEngine, run) -> async_sessionmaker:
+    """Session factory over empty tables and cold in-process caches."""
+
+    async def truncate() -> None:
+        tables = ", ".join(table.name for table in Base.metadata.sorted_tables)
+        async with engine.begin() as conn:
+            await conn.execute(text(f"TRUNCATE {tables} RESTART IDENTITY CASCADE"))
+
+    run(truncate())
+    channel_registry.clear()
+    alert_settings_cache.clear()
+    language_cache.clear()
+    member_counters_cache.invalidate()
+    return async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
+
+
+@pytest.fixture
+def statements(engine: AsyncEngine) -> Iterator[list[str]]:
+    """SQL statements sent to the database while the test runs."""
+    sent: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:
+        sent.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    yield sent
+    event.remove(engine.sync_engine, "before_cursor_execute", record)
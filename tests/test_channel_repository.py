@@ -0,0 +1,40 @@
+"""Channel lookups stay at one statement."""
+
+from database.cache import channel_registry
+from database.repositories import ChannelRepository
+
+CHANNEL_ID = -1001
+
+
+def test_get_info_runs_one_query(session_maker, statements, run) -> None:
+    async def scenario() -> None:
+        async with session_maker() as session:
+            await ChannelRepository(session).create(CHANNEL_ID, "Test", admin_user_id=1)
+        channel_registry.clear()
+        statements.clear()
+
+        async with session_maker() as session:
+            info = await ChannelRepository(session).get_info(CHANNEL_ID)
+        assert info is not None and info.title == "Test"
+        assert len(statements) == 1
+
+        # Served from the registry afterwards
+        async with session_maker() as session:
+            assert await ChannelRepository(session).get_info(CHANNEL_ID) == info
+        assert len(statements) == 1
+
+    run(scenario())
+
+
+def test_get_by_id_runs_one_query(session_maker, statements, run) -> None:
+    async def scenario() -> None:
+        async with session_maker() as session:
+            await ChannelRepository(session).create(CHANNEL_ID, "Test", admin_user_id=1)
+        statements.clear()
+
+        async with session_maker() as session:
+            channel = await ChannelRepository(session).get_by_id(CHANNEL_ID)
+        assert channel is not None and channel.title == "Test"
+        assert len(statements) == 1
+
+    run(scenario())
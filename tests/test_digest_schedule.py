@@ -0,0 +1,67 @@
+"""Digest due times follow the channel's local clock across DST changes."""
+
+from datetime import datetime, timezone
+
+from bot.services.digest_scheduler import DAILY, MONTHLY, WEEKLY, DigestScheduler
+from database.models import AlertSettings
+
+BERLIN = "Europe/Berlin"
+
+
+def utc(*args: int) -> datetime:
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+def _settings(hour: int = 9, **last_sent: datetime) -> AlertSettings:
+    return AlertSettings(
+        channel_id=-1001,
+        digest_daily=True,
+        digest_weekly=True,
+        digest_monthly=True,
+        digest_hour=hour,
+        digest_timezone=BERLIN,
+        **last_sent,
+    )
+
+
+def test_daily_digest_keeps_local_hour_across_dst() -> None:
+    scheduler = DigestScheduler()
+    # 09:00 CET is 08:00 UTC; from 29 March 09:00 CEST is 07:00 UTC
+    settings = _settings(last_daily_digest=utc(2026, 3, 28, 8))
+    assert scheduler.next_due(DAILY, settings, utc(2026, 3, 28, 12)) == utc(2026, 3, 29, 7)
+    # And back on 25 October
+    settings = _settings(last_daily_digest=utc(2026, 10, 24, 7))
+    assert scheduler.next_due(DAILY, settings, utc(2026, 10, 24, 12)) == utc(2026, 10, 25, 8)
+
+
+def test_hour_skipped_by_spring_forward_still_gets_a_digest() -> None:
+    scheduler = DigestScheduler()
+    # 02:00 does not exist on 29 March in Berlin; it resolves to 01:00 UTC
+    settings = _settings(hour=2, last_daily_digest=utc(2026, 3, 28, 1))
+    due = scheduler.next_due(DAILY, settings, utc(2026, 3, 28, 12))
+    assert due == utc(2026, 3, 29, 1)
+    settings.last_daily_digest = due
+    assert scheduler.next_due(DAILY, settings, due) == utc(2026, 3, 30, 0)
+
+
+def test_weekly_and_monthly_digests_across_dst() -> None:
+    scheduler = DigestScheduler()
+    settings = _settings(
+        last_weekly_digest=utc(2026, 3, 23, 8, 5),
+        last_monthly_digest=utc(2026, 3, 1, 8, 10),
+    )
+    now = utc(2026, 3, 25, 12)
+    # Mondays at 09:05 and the 1st at 09:10 local time
+    assert scheduler.next_due(WEEKLY, settings, now) == utc(2026, 3, 30, 7, 5)
+    assert scheduler.next_due(MONTHLY, settings, now) == utc(2026, 4, 1, 7, 10)
+
+
+def test_missed_digest_is_due_within_grace() -> None:
+    scheduler = DigestScheduler()
+    settings = _settings(last_daily_digest=utc(2026, 3, 28, 8))
+    # Slot at 07:00 UTC passed 30 minutes ago and was not sent
+    assert scheduler.next_due(DAILY, settings, utc(2026, 3, 29, 7, 30)) == utc(2026, 3, 29, 7)
+    # Beyond the grace period the next day's slot is used
+    assert scheduler.next_due(DAILY, settings, utc(2026, 3, 29, 9)) == utc(2026, 3, 30, 7)
+    settings.digest_daily = False
+    assert scheduler.next_due(DAILY, settings, utc(2026, 3, 29, 9)) is None
@@ -0,0 +1,59 @@
+"""Month partitions take over rows from the default partition."""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import func, select, text
+
+from database.models import MemberEvent
+from database.repositories import ChannelRepository, EventPartitionRepository, EventRepository
+from database.repositories.event_partition import add_months, month_start, partition_name
+
+CHANNEL_ID = -1001
+
+
+async def _insert_event(session_maker, user_id: int, created_at: datetime) -> None:
+    async with session_maker() as session:
+        await EventRepository(session).add_member_event(
+            CHANNEL_ID, user_id, "join", "member", created_at=created_at
+        )
+        await session.commit()
+
+
+async def _count(session_maker, table: str) -> int:
+    async with session_maker() as session:
+        return (await session.execute(text(f"SELECT count(*) FROM {table}"))).scalar()
+
+
+def test_new_partition_moves_rows_out_of_default(session_maker, run) -> None:
+    async def scenario() -> None:
+        async with session_maker() as session:
+            await ChannelRepository(session).create(CHANNEL_ID, "Test", admin_user_id=1)
+        current = month_start(datetime.now(timezone.utc))
+        later = add_months(current, 4)
+        await _insert_event(session_maker, 1, datetime(later.year, later.month, 3, tzinfo=timezone.utc))
+        assert await _count(session_maker, "member_events_default") == 1
+
+        async with session_maker() as session:
+            created = await EventPartitionRepository(session).ensure(4)
+        assert created[partition_name("member_events", later)] == 1
+        assert await _count(session_maker, "member_events_default") == 0
+        assert await _count(session_maker, partition_name("member_events", later)) == 1
+
+    run(scenario())
+
+
+def test_retention_purges_default_partition(session_maker, run) -> None:
+    async def scenario() -> None:
+        async with session_maker() as session:
+            await ChannelRepository(session).create(CHANNEL_ID, "Test", admin_user_id=1)
+        current = month_start(datetime.now(timezone.utc))
+        old = add_months(current, -5)
+        await _insert_event(session_maker, 1, datetime(old.year, old.month, 3, tzinfo=timezone.utc))
+        await _insert_event(session_maker, 2, datetime.now(timezone.utc))
+
+        async with session_maker() as session:
+            assert await EventPartitionRepository(session).purge_default(add_months(current, -1)) == 1
+            remaining = await session.execute(select(func.count()).select_from(MemberEvent))
+        assert remaining.scalar() == 1
+
+    run(scenario())
@@ -0,0 +1,102 @@
+"""Rollup rebuilds restore the counts without blocking other channels."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, func, select, update
+
+from database.models import MemberEventsDay, MemberEventsHour, MemberEventsMinute
+from database.repositories import ChannelRepository, EventRepository, EventRollupRepository
+
+CHANNEL_A = -1001
+CHANNEL_B = -1002
+
+
+def _event(channel_id: int, user_id: int, event_type: str, created_at: datetime) -> dict:
+    return {
+        "channel_id": channel_id,
+        "user_id": user_id,
+        "event_type": event_type,
+        "new_status": "member" if event_type == "join" else "left",
+        "created_at": created_at,
+    }
+
+
+async def _setup(session_maker) -> None:
+    now = datetime.now(timezone.utc)
+    async with session_maker() as session:
+        for channel_id in (CHANNEL_A, CHANNEL_B):
+            await ChannelRepository(session).create(channel_id, "Test", admin_user_id=1)
+    async with session_maker() as session:
+        await EventRepository(session).insert_member_events(
+            [
+                _event(CHANNEL_A, 1, "join", now - timedelta(days=45)),
+                _event(CHANNEL_A, 2, "join", now - timedelta(minutes=5)),
+                _event(CHANNEL_A, 1, "leave", now - timedelta(minutes=4)),
+                _event(CHANNEL_B, 3, "join", now - timedelta(minutes=3)),
+            ]
+        )
+        await session.commit()
+
+
+async def _rows(session_maker) -> dict[str, int]:
+    async with session_maker() as session:
+        return {
+            model.__tablename__: (await session.execute(select(func.count()).select_from(model))).scalar()
+            for model in (MemberEventsMinute, MemberEventsHour, MemberEventsDay)
+        }
+
+
+def test_rebuild_restores_counts(session_maker, run) -> None:
+    async def scenario() -> None:
+        await _setup(session_maker)
+        async with session_maker() as session:
+            expected = await EventRollupRepository(session).count_by_type(CHANNEL_A, None)
+        assert expected["joins"] == 2 and expected["leaves"] == 1
+        rows_before = await _rows(session_maker)
+
+        async with session_maker() as session:
+            await session.execute(delete(MemberEventsHour))
+            await session.execute(update(MemberEventsDay).values(joins=MemberEventsDay.joins + 10))
+            await session.commit()
+
+        async with session_maker() as session:
+            written = await EventRollupRepository(session).rebuild()
+            assert await EventRollupRepository(session).count_by_type(CHANNEL_A, None) == expected
+        rows_after = await _rows(session_maker)
+        # Minute rows come back only inside the minute retention
+        assert rows_after == {**rows_before, "member_events_minute": 3}
+        # Every level is counted
+        assert written == sum(rows_after.values())
+
+    run(scenario())
+
+
+def test_rebuild_blocks_only_its_channel(session_maker, run) -> None:
+    async def scenario() -> None:
+        await _setup(session_maker)
+        now = datetime.now(timezone.utc)
+
+        async def insert(channel_id: int, user_id: int) -> None:
+            async with session_maker() as session:
+                await EventRepository(session).insert_member_events(
+                    [_event(channel_id, user_id, "join", now)]
+                )
+                await session.commit()
+
+        async with session_maker() as rebuilding:
+            repo = EventRollupRepository(rebuilding)
+            await repo._rebuild_slice(CHANNEL_A, now.replace(day=1, hour=0, minute=0), None)
+
+            await asyncio.wait_for(insert(CHANNEL_B, 4), 5)
+            waiting = asyncio.create_task(insert(CHANNEL_A, 5))
+            await asyncio.sleep(0.3)
+            assert not waiting.done()
+            await rebuilding.commit()
+        await asyncio.wait_for(waiting, 5)
+
+        async with session_maker() as session:
+            counts = await EventRollupRepository(session).count_by_type(CHANNEL_A, None)
+        assert counts["joins"] == 3
+
+    run(scenario())
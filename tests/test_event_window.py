@@ -0,0 +1,50 @@
+"""Per-minute event buckets expire with the window."""
+
+from datetime import datetime, timedelta, timezone
+
+from bot.services.event_window import EventWindow
+
+CHANNEL_ID = -1001
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def at(minutes: float) -> datetime:
+    return START + timedelta(minutes=minutes)
+
+
+def test_counts_events_since_the_start_of_a_minute() -> None:
+    window = EventWindow(capacity_minutes=10)
+    window.record(CHANNEL_ID, "join", at(0))
+    window.record(CHANNEL_ID, "join", at(1.5), count=2)
+    window.record(CHANNEL_ID, "leave", at(2))
+
+    assert window.count(CHANNEL_ID, at(0), at(3)) == 4
+    assert window.count(CHANNEL_ID, at(1.9), at(3), "join") == 2
+    assert window.count(CHANNEL_ID, at(0), at(3), "leave") == 1
+    assert window.count(CHANNEL_ID, at(0), at(3), "unknown") is None
+    assert window.count(-1, at(0), at(3)) == 0
+
+
+def test_buckets_older_than_the_capacity_expire() -> None:
+    window = EventWindow(capacity_minutes=10)
+    window.record(CHANNEL_ID, "join", at(0))
+    window.record(CHANNEL_ID, "join", at(9))
+    assert window.count(CHANNEL_ID, at(0), at(9)) == 2
+
+    # Minute 0 falls out once minute 10 arrives
+    window.record(CHANNEL_ID, "leave", at(10))
+    assert window.count(CHANNEL_ID, at(1), at(10)) == 2
+    assert window.count(CHANNEL_ID, at(0), at(10)) is None
+
+    # Late events older than the window are ignored, newer ones are slotted in
+    window.record(CHANNEL_ID, "join", at(0))
+    window.record(CHANNEL_ID, "join", at(5))
+    assert window.count(CHANNEL_ID, at(1), at(10), "join") == 2
+
+
+def test_load_keeps_only_rows_inside_the_window() -> None:
+    window = EventWindow(capacity_minutes=10)
+    window.record(-3, "join", at(29))
+    window.load([(CHANNEL_ID, at(0), "join", 3), (-2, at(25), "kick", 1)], now=at(30))
+    assert len(window) == 1
+    assert window.count(-2, at(21), at(30), "kick") == 1
@@ -0,0 +1,70 @@
+"""Leadership moves to a standby when the leader loses its lock, and back."""
+
+import asyncio
+
+import asyncpg
+
+from database.leader import LeaderElection
+
+JOB = "test-job"
+
+
+async def _until(condition, timeout: float = 10.0) -> None:
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not condition():
+        assert loop.time() < deadline, "leadership did not change in time"
+        await asyncio.sleep(0.05)
+
+
+def _election() -> LeaderElection:
+    return LeaderElection(JOB, renew_interval=0.2, retry_interval=0.1, lease_seconds=5.0)
+
+
+def test_standby_takes_over_after_lock_loss_and_leader_reacquires(engine, run) -> None:
+    dsn = engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+    running: list[str] = []
+
+    def job(name: str):
+        async def work() -> None:
+            running.append(name)
+            try:
+                await asyncio.Event().wait()
+            finally:
+                running.remove(name)
+
+        return work
+
+    async def scenario() -> None:
+        first, second = _election(), _election()
+        first.start(dsn, job("first"))
+        await _until(lambda: first.is_leader)
+        second.start(dsn, job("second"))
+        try:
+            await asyncio.sleep(0.5)
+            assert not second.is_leader and running == ["first"]
+
+            # The leader's session dies: its job stops and the standby takes over
+            admin = await asyncpg.connect(dsn)
+            try:
+                await admin.execute(
+                    "SELECT pg_terminate_backend(pid) FROM pg_stat_activity "
+                    "WHERE application_name = $1 AND pid IN "
+                    "(SELECT pid FROM pg_locks WHERE locktype = 'advisory' AND granted)",
+                    f"leader:{JOB}",
+                )
+            finally:
+                await admin.close()
+            await _until(lambda: second.is_leader and running == ["second"])
+            assert not first.is_leader
+
+            # The old leader campaigns again and wins once the lock is free
+            await second.stop()
+            await _until(lambda: first.is_leader and running == ["first"])
+            assert first.terms == 2 and second.terms == 1
+        finally:
+            await first.stop()
+            await second.stop()
+        assert running == []
+
+    run(scenario())
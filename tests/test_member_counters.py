@@ -0,0 +1,112 @@
+"""Member counters stay equal to a full count under concurrent transitions."""
+
+import asyncio
+
+from database import unit_of_work
+from database.cache import member_counters_cache
+from database.models import ChannelMemberCounters
+from database.repositories import ChannelRepository, MemberRepository
+
+CHANNEL_ID = -1001
+
+
+async def _setup_channel(session_maker) -> None:
+    async with session_maker() as session:
+        await ChannelRepository(session).create(CHANNEL_ID, "Test", admin_user_id=1)
+
+
+async def _stored_counters(session_maker) -> dict[str, int]:
+    async with session_maker() as session:
+        counters = await session.get(ChannelMemberCounters, CHANNEL_ID)
+        return {status: count for status, count in counters.as_dict().items() if count}
+
+
+async def _exact_counts(session_maker) -> dict[str, int]:
+    async with session_maker() as session:
+        return await MemberRepository(session).count_by_status_exact(CHANNEL_ID)
+
+
+async def _concurrent_upserts(session_maker, first: str, second: str) -> None:
+    """Start ``second`` while the transaction applying ``first`` is still open."""
+    async with session_maker() as session_a, session_maker() as session_b:
+        async with unit_of_work(session_a):
+            await MemberRepository(session_a).upsert(CHANNEL_ID, 42, status=first)
+
+            async def apply_second() -> None:
+                async with unit_of_work(session_b):
+                    await MemberRepository(session_b).upsert(CHANNEL_ID, 42, status=second)
+
+            later = asyncio.create_task(apply_second())
+            # Let the second transaction reach the member row and wait on its lock
+            await asyncio.sleep(0.3)
+            assert not later.done()
+        await later
+
+
+def test_sequential_transitions(session_maker, run) -> None:
+    async def scenario() -> None:
+        await _setup_channel(session_maker)
+        for user_id in (1, 2, 3):
+            async with session_maker() as session:
+                await MemberRepository(session).upsert(CHANNEL_ID, user_id, status="member")
+        for status in ("left", "member", "kicked"):
+            async with session_maker() as session:
+                await MemberRepository(session).upsert(CHANNEL_ID, 1, status=status)
+        async with session_maker() as session:
+            await MemberRepository(session).upsert(CHANNEL_ID, 2, status="left")
+
+        assert await _stored_counters(session_maker) == {"member": 1, "left": 1, "kicked": 1}
+        assert await _exact_counts(session_maker) == {"member": 1, "left": 1, "kicked": 1}
+        assert member_counters_cache.get(CHANNEL_ID) == {
+            "member": 1, "left": 1, "kicked": 1, "banned": 0,
+        }
+
+    run(scenario())
+
+
+def test_concurrent_transitions_of_existing_member(session_maker, run) -> None:
+    async def scenario() -> None:
+        await _setup_channel(session_maker)
+        async with session_maker() as session:
+            await MemberRepository(session).upsert(CHANNEL_ID, 42, status="member")
+
+        await _concurrent_upserts(session_maker, "left", "kicked")
+
+        assert await _exact_counts(session_maker) == {"kicked": 1}
+        assert await _stored_counters(session_maker) == {"kicked": 1}
+
+    run(scenario())
+
+
+def test_concurrent_first_transitions_of_new_member(session_maker, run) -> None:
+    async def scenario() -> None:
+        await _setup_channel(session_maker)
+
+        await _concurrent_upserts(session_maker, "member", "left")
+
+        assert await _exact_counts(session_maker) == {"left": 1}
+        assert await _stored_counters(session_maker) == {"left": 1}
+
+    run(scenario())
+
+
+def test_upsert_is_one_statement(session_maker, statements, run) -> None:
+    async def scenario() -> None:
+        await _setup_channel(session_maker)
+        for status, created in (("member", True), ("left", False), ("member", False)):
+            async with session_maker() as session:
+                async with unit_of_work(session):
+                    statements.clear()
+                    member, was_created = await MemberRepository(session).upsert(
+                        CHANNEL_ID, 42, status=status
+                    )
+                    assert len(statements) == 1
+            assert was_created is created
+
+        assert member.status == "member"
+        assert member.previous_status == "left"
+        assert member.left_at is not None
+        assert member.joined_at > member.left_at
+        assert await _stored_counters(session_maker) == {"member": 1}
+
+    run(scenario())
@@ -0,0 +1,57 @@
+"""Backfilled snapshots agree with the member counters."""
+
+from datetime import datetime, timedelta, timezone
+
+from database import unit_of_work
+from database.repositories import ChannelRepository, EventRepository, MemberRepository
+
+CHANNEL_ID = -1001
+
+
+async def _transition(
+    session_maker, user_id: int, old_status: str, new_status: str, created_at: datetime
+) -> None:
+    """Apply a member update the way the chat_member handler does."""
+    async with session_maker() as session:
+        async with unit_of_work(session):
+            member, _ = await MemberRepository(session).upsert(
+                CHANNEL_ID, user_id, status=new_status
+            )
+            await EventRepository(session).add_member_event(
+                CHANNEL_ID,
+                user_id,
+                "status_change",
+                new_status,
+                old_status=old_status,
+                previous_status=member.previous_status,
+                created_at=created_at,
+            )
+
+
+def test_backfill_replays_the_transitions_the_counters_applied(session_maker, run) -> None:
+    async def scenario() -> None:
+        async with session_maker() as session:
+            await ChannelRepository(session).create(CHANNEL_ID, "Test", admin_user_id=1)
+        today = datetime.now(timezone.utc).replace(hour=12, minute=0, second=0, microsecond=0)
+        two_days_ago = today - timedelta(days=2)
+        yesterday = today - timedelta(days=1)
+
+        # First-seen members: Telegram says "left", the counters start from nothing
+        await _transition(session_maker, 1, "left", "member", two_days_ago)
+        await _transition(session_maker, 2, "left", "member", yesterday)
+        await _transition(session_maker, 1, "member", "left", yesterday)
+
+        async with session_maker() as session:
+            repo = MemberRepository(session)
+            assert await repo.count_by_status(CHANNEL_ID) == {
+                "member": 1, "left": 1, "kicked": 0, "banned": 0,
+            }
+            await repo.snapshots.backfill(CHANNEL_ID, until=yesterday.date())
+            history = {
+                snapshot.day: (snapshot.member_count, snapshot.left_count)
+                for snapshot in await repo.snapshots.get_history(CHANNEL_ID)
+            }
+
+        assert history == {two_days_ago.date(): (1, 0), yesterday.date(): (1, 1)}
+
+    run(scenario())
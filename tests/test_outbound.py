@@ -0,0 +1,64 @@
+"""Token buckets, send priorities and shutdown of the outbound dispatcher."""
+
+import asyncio
+
+from bot.services.outbound import OutboundDispatcher, Priority, TokenBucket
+
+
+class FakeBot:
+    def __init__(self, hang: bool = False) -> None:
+        self.sent: list[int] = []
+        self.hang = hang
+
+    async def send_message(self, chat_id: int, text: str, **kwargs) -> None:
+        self.sent.append(chat_id)
+        if self.hang:
+            await asyncio.Event().wait()
+
+
+def test_token_bucket_refills_at_its_rate() -> None:
+    bucket = TokenBucket(rate=2.0, capacity=2)
+    now = bucket.updated
+    bucket.take(now)
+    bucket.take(now)
+    assert bucket.delay(now) == 0.5
+    assert bucket.delay(now + 0.25) == 0.25
+    assert bucket.delay(now + 0.5) == 0.0
+    # Idle time never stores more than the capacity
+    assert bucket.delay(now + 60) == 0.0
+    assert bucket.tokens == 2
+
+
+def test_most_urgent_message_is_sent_first(run) -> None:
+    async def scenario() -> None:
+        bot = FakeBot()
+        dispatcher = OutboundDispatcher(global_rate=30.0, chat_rate=100.0)
+        futures = [
+            dispatcher.send_message(bot, 1, "digest", Priority.DIGEST),
+            dispatcher.send_message(bot, 2, "member event", Priority.MEMBER_EVENT),
+            dispatcher.send_message(bot, 3, "alert", Priority.ALERT),
+            dispatcher.send_message(bot, 4, "second alert", Priority.ALERT),
+        ]
+        dispatcher.start()
+        assert await asyncio.wait_for(asyncio.gather(*futures), 10) == [True] * 4
+        await dispatcher.stop()
+        assert bot.sent == [3, 4, 2, 1]
+
+    run(scenario())
+
+
+def test_stop_resolves_in_flight_and_queued_messages(run) -> None:
+    async def scenario() -> None:
+        bot = FakeBot(hang=True)
+        dispatcher = OutboundDispatcher(global_rate=100.0, chat_rate=0.01)
+        dispatcher.start()
+        in_flight = dispatcher.send_message(bot, 1, "first")
+        queued = dispatcher.send_message(bot, 1, "second")
+        await asyncio.sleep(0.05)
+        assert bot.sent == [1]
+
+        await dispatcher.stop(timeout=0.1)
+        assert in_flight.result() is False
+        assert queued.result() is False
+
+    run(scenario())
@@ -0,0 +1,125 @@
+"""Outbox delivery switches to aggregated notifications while a channel is busy."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from bot.services.outbound import outbound
+from bot.services.outbox import AGGREGATE, HOLD, SEND, BurstDetector, OutboxWorker
+from database.repositories import ChannelRepository, OutboxRepository
+
+CHANNEL_ID = -1001
+NOTIFY_CHAT_ID = 500
+
+
+class FakeBot:
+    def __init__(self) -> None:
+        self.sent: list[str] = []
+
+    async def send_message(self, chat_id: int, text: str, **kwargs) -> None:
+        self.sent.append(text)
+
+
+def _message(user_id: int) -> dict:
+    return {
+        "channel_id": CHANNEL_ID,
+        "kind": "member_event",
+        "payload": {
+            "event_id": user_id,
+            "user_id": user_id,
+            "username": f"user{user_id}",
+            "first_name": None,
+            "last_name": None,
+            "event_type": "join",
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        },
+    }
+
+
+def test_burst_detector_thresholds() -> None:
+    detector = BurstDetector(threshold=3, window=5.0)
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+    def at(seconds: float) -> datetime:
+        return start + timedelta(seconds=seconds)
+
+    assert detector.admit(1, 2, at(0)) == (SEND, None)
+    # Other channels are counted separately
+    assert detector.admit(2, 2, at(0)) == (SEND, None)
+    # The third notification within the window starts holding
+    assert detector.admit(1, 1, at(1)) == (HOLD, at(6))
+    assert detector.admit(1, 4, at(2)) == (HOLD, at(6))
+    assert detector.admit(2, 0, at(2)) == (SEND, None)
+    # A full window is sent as one message and keeps the channel aggregated
+    assert detector.admit(1, 5, at(6)) == (AGGREGATE, None)
+    assert detector.admit(1, 1, at(7)) == (HOLD, at(11))
+    # A window below the threshold ends the burst
+    assert detector.admit(1, 1, at(11)) == (AGGREGATE, None)
+    assert detector.admit(1, 1, at(12)) == (SEND, None)
+
+
+def test_burst_detector_forgets_arrivals_outside_the_window() -> None:
+    detector = BurstDetector(threshold=3, window=5.0)
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    assert detector.admit(1, 2, start) == (SEND, None)
+    assert detector.admit(1, 2, start + timedelta(seconds=5)) == (SEND, None)
+    assert detector.admit(1, 1, start + timedelta(seconds=6)) == (HOLD, start + timedelta(seconds=11))
+
+
+async def _until(condition, timeout: float = 5.0) -> None:
+    """Wait for the worker to reach ``condition``."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not condition():
+        assert loop.time() < deadline, "outbox worker did not get there in time"
+        await asyncio.sleep(0.02)
+
+
+def test_busy_channel_is_aggregated_per_window(session_maker, monkeypatch, run) -> None:
+    monkeypatch.setattr(outbound, "chat_rate", 100.0)
+    bot = FakeBot()
+    worker = OutboxWorker(poll_interval_ms=50, burst_threshold=3, burst_window=1.0)
+    stats = worker.stats
+
+    async def enqueue(*user_ids: int) -> None:
+        async with session_maker() as session:
+            await OutboxRepository(session).enqueue([_message(user_id) for user_id in user_ids])
+            await session.commit()
+        worker.wake()
+
+    async def scenario() -> None:
+        async with session_maker() as session:
+            await ChannelRepository(session).create(
+                CHANNEL_ID, "Test", admin_user_id=1, notify_chat_id=NOTIFY_CHAT_ID
+            )
+        outbound.start()
+        worker.start(bot)
+        try:
+            # Quiet channel: sent on its own right away
+            await enqueue(1)
+            await _until(lambda: stats.sent == 1)
+            assert len(bot.sent) == 1
+
+            # Crossing the threshold holds the rows until the window ends
+            await enqueue(2, 3, 4, 5, 6)
+            await _until(lambda: stats.held == 5)
+            assert len(bot.sent) == 1
+
+            await _until(lambda: stats.sent == 6)
+            assert len(bot.sent) == 2 and stats.bursts == 1
+            assert "user2" in bot.sent[1] and "user6" in bot.sent[1]
+
+            # Still busy: the next window collects one event, then the channel calms down
+            await enqueue(7)
+            await _until(lambda: stats.held == 6)
+            assert len(bot.sent) == 2
+            await _until(lambda: stats.sent == 7)
+            assert len(bot.sent) == 3 and stats.bursts == 1
+
+            await enqueue(8)
+            await _until(lambda: stats.sent == 8)
+            assert len(bot.sent) == 4 and stats.retried == 0
+        finally:
+            await worker.stop()
+            await outbound.stop()
+
+    run(scenario())